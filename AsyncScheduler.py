@@ -0,0 +1,212 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, List, Optional
+from Clock import Clock
+from FiniteStateMachine import FiniteStateMachine
+
+class AsyncScheduler:
+    """
+    Fait fonctionner plusieurs machines à états finis et tâches périodiques sur une même boucle asyncio.
+
+    Chaque machine ajoutée fonctionne dans sa propre tâche (voir FiniteStateMachine.run), à sa propre cadence.
+    Les tâches périodiques (suivi d'un SideBlinker, échantillonnage d'un DistanceSampler...) sont des fonctions
+    appelées à intervalle régulier ; celles qui bloquent sur le matériel sont déléguées à un exécuteur pour ne
+    pas retenir la boucle d'événements.
+
+    Le temps est celui de l'horloge du planificateur : avec une VirtualClock, les tâches s'exécutent dans l'ordre
+    de leurs échéances virtuelles (voir VirtualClock.sleep_async).
+
+    Attributs:
+        __clock (Clock): L'horloge du planificateur.
+        __executor (Optional[Executor]): L'exécuteur des appels bloquants, celui de la boucle si None.
+        __machines (List[Callable[[], Awaitable[None]]]): Les coroutines des machines à états finis.
+        __tasks (List[Callable[[], Awaitable[None]]]): Les coroutines des tâches périodiques.
+
+    Méthodes:
+        add_fsm(fsm: FiniteStateMachine, poll_period: float = None, reset: bool = True) -> None:
+            Ajoute une machine à états finis.
+
+        add_task(callback: Callable[[], Any], period: float, blocking: bool = False) -> None:
+            Ajoute une fonction appelée périodiquement.
+
+        run_blocking(function: Callable[..., Any], *args) -> Any:
+            Exécute un appel bloquant dans l'exécuteur.
+
+        run(time_budget: float = None) -> None:
+            Coroutine qui fait fonctionner les machines et les tâches.
+
+        start(time_budget: float = None) -> None:
+            Fait fonctionner les machines et les tâches sur une nouvelle boucle d'événements.
+
+    Utilisation:
+        >>> c64 = C64()
+        >>> scheduler = AsyncScheduler(clock=c64.clock)
+        >>> scheduler.add_fsm(c64, poll_period=0.02)
+        >>> scheduler.add_task(c64.robot.led_blinker.track, period=0.01)
+        >>> scheduler.start()
+    """
+
+    def __init__(self, clock: Optional[Clock] = None, executor: Optional[Executor] = None) -> None:
+        """
+        Initialise un planificateur vide.
+
+        Args:
+            clock (Clock, optionnel): L'horloge du planificateur. Par défaut, Clock.system().
+            executor (Executor, optionnel): L'exécuteur des appels bloquants. Par défaut, celui de la boucle.
+
+        Utilisation:
+            >>> scheduler = AsyncScheduler()
+        """
+        self.__clock: Clock = Clock.system() if clock is None else clock
+        self.__executor: Optional[Executor] = executor
+        self.__machines: List[Callable[[], Awaitable[None]]] = []
+        self.__tasks: List[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Obtient l'horloge du planificateur.
+
+        Returns:
+            Clock: L'horloge du planificateur.
+
+        Utilisation:
+            >>> clock = scheduler.clock
+        """
+        return self.__clock
+
+    @clock.setter
+    def clock(self, value) -> None:
+        """
+        Empêche la modification de l'horloge.
+
+        Raises:
+            ValueError: clock est une propriété en lecture seule.
+
+        Utilisation:
+            >>> scheduler.clock = clock
+        """
+        raise ValueError("clock is a read-only property")
+
+    def add_fsm(self, fsm: FiniteStateMachine, poll_period: float = None, reset: bool = True) -> None:
+        """
+        Ajoute une machine à états finis, qui fonctionnera jusqu'à atteindre un état terminal ou être arrêtée.
+
+        Args:
+            fsm (FiniteStateMachine): La machine à états finis, qui doit utiliser l'horloge du planificateur.
+            poll_period (float): Le délai maximal entre deux ticks. Par défaut à None (un tick à chaque passage).
+            reset (bool): Indique si la machine à états finis doit être réinitialisée au démarrage.
+
+        Raises:
+            ValueError: La machine n'utilise pas l'horloge du planificateur.
+            ValueError: poll_period doit être positif.
+
+        Utilisation:
+            >>> scheduler.add_fsm(c64, poll_period=0.02)
+        """
+        if fsm.clock is not self.__clock:
+            raise ValueError("fsm must use the scheduler clock")
+        if poll_period is not None and poll_period <= 0:
+            raise ValueError("poll_period must be positive")
+        self.__machines.append(lambda: fsm.run(reset=reset, poll_period=poll_period))
+
+    def add_task(self, callback: Callable[[], Any], period: float, blocking: bool = False) -> None:
+        """
+        Ajoute une fonction appelée périodiquement, tant que le planificateur fonctionne.
+
+        Args:
+            callback (Callable[[], Any]): La fonction à appeler.
+            period (float): La période d'appel, en secondes.
+            blocking (bool): Indique si la fonction bloque (lecture d'un capteur...) et doit être exécutée dans
+                l'exécuteur. Par défaut à False.
+
+        Raises:
+            ValueError: period doit être positive.
+
+        Utilisation:
+            >>> scheduler.add_task(robot.eye_blinker.track, period=0.01)
+            >>> scheduler.add_task(sampler.sample, period=0.05, blocking=True)
+        """
+        if period <= 0:
+            raise ValueError("period must be positive")
+
+        async def task() -> None:
+            clock = self.__clock
+            next_time = clock.now()
+            while True:
+                if blocking:
+                    await self.run_blocking(callback)
+                else:
+                    callback()
+                next_time += period
+                await clock.sleep_async(next_time - clock.now())
+
+        self.__tasks.append(task)
+
+    async def run_blocking(self, function: Callable[..., Any], *args) -> Any:
+        """
+        Exécute un appel bloquant dans l'exécuteur, sans retenir la boucle d'événements. Le temps d'une
+        VirtualClock n'avance pas pendant l'appel (voir Clock.hold).
+
+        Args:
+            function (Callable[..., Any]): La fonction à appeler.
+            *args: Les arguments de la fonction.
+
+        Returns:
+            Any: La valeur renvoyée par la fonction.
+
+        Utilisation:
+            >>> await scheduler.run_blocking(robot.turn_degree, 90)
+        """
+        with self.__clock.hold():
+            return await asyncio.get_running_loop().run_in_executor(self.__executor, function, *args)
+
+    async def run(self, time_budget: float = None) -> None:
+        """
+        Fait fonctionner les machines et les tâches jusqu'à la fin du budget de temps ou, sans budget, jusqu'à
+        ce que toutes les machines soient arrêtées. Les tâches restantes sont alors annulées.
+
+        Args:
+            time_budget (float): Le budget de temps, dans le temps de l'horloge. Par défaut à None.
+
+        Raises:
+            Exception: La première exception levée par une machine ou une tâche.
+
+        Utilisation:
+            >>> await scheduler.run(time_budget=60.)
+        """
+        loop = asyncio.get_running_loop()
+        machines = [loop.create_task(machine()) for machine in self.__machines]
+        tasks = machines + [loop.create_task(task()) for task in self.__tasks]
+        waiters: List[asyncio.Future] = list(tasks)
+        if time_budget is not None:
+            waiters.append(loop.create_task(self.__clock.sleep_async(time_budget)))
+        try:
+            pending = set(waiters)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(waiter.exception() is not None for waiter in done if not waiter.cancelled()):
+                    break
+                if time_budget is not None and waiters[-1] in done:
+                    break
+                if machines and all(machine.done() for machine in machines):
+                    break
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    def start(self, time_budget: float = None) -> None:
+        """
+        Fait fonctionner les machines et les tâches sur une nouvelle boucle d'événements (voir run()).
+
+        Args:
+            time_budget (float): Le budget de temps, dans le temps de l'horloge. Par défaut à None.
+
+        Utilisation:
+            >>> scheduler.start(time_budget=60.)
+        """
+        asyncio.run(self.run(time_budget))
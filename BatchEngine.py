@@ -0,0 +1,366 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from typing import Any, Callable, List, Optional, Tuple
+from Clock import Clock
+from Condition import Condition
+from FiniteStateMachine import FiniteStateMachine
+from LayoutRuntime import LayoutRuntime
+from Tick import Tick
+from Transition import ConditionalTransition, Transition
+
+class BatchEngine:
+    """
+    Fait avancer de nombreuses instances d'un même layout compilé, dont l'état est rangé dans des tableaux NumPy.
+
+    Chaque pas évalue les transitions de chaque état sous forme de masques sur toutes les instances qui s'y
+    trouvent (voir Condition._vectorize) puis déplace en bloc les instances dont une transition est franchie.
+    Les conditions sur la durée, le nombre d'entrées et la valeur personnalisée d'un état sont vectorisées ;
+    les autres conditions, qui ne dépendent pas de l'instance (télécommande, capteur, TimedCondition...), sont
+    évaluées une fois par pas et valent pour toutes les instances. Comme dans FiniteStateMachine, la première
+    transition vraie de l'état l'emporte.
+
+    Les actions ne sont exécutées, instance par instance, que lorsqu'une transition est franchie : l'action de
+    sortie, l'action de transition et l'action d'entrée s'exécutent alors avec l'enregistrement de l'instance
+    activé dans le layout (voir LayoutRuntime.view), ce qui met aussi à jour ses compteurs. Les actions de
+    présence dans l'état ne sont exécutées que sur demande, car elles coûtent un appel par instance et par pas.
+
+    Les instances qui atteignent un état terminal n'évoluent plus. Une StateEntryDurationCondition construite
+    avec une TimerWheel enregistre toujours son échéance à chaque entrée : il vaut mieux s'en passer pour un
+    layout destiné au moteur.
+
+    Attributs:
+        __layout (FiniteStateMachine.Layout): Le layout compilé partagé par les instances.
+        __clock (Clock): L'horloge du moteur, liée aux états du layout.
+        __now (float): L'instant du pas courant.
+        __current_indices (np.ndarray): L'indice de l'état courant de chaque instance.
+        __entry_counts (np.ndarray): Le nombre d'entrées de chaque instance dans chaque état.
+        __last_entry_times (np.ndarray): L'instant de la dernière entrée de chaque instance dans chaque état.
+        __last_exit_times (np.ndarray): L'instant de la dernière sortie de chaque instance de chaque état.
+        __custom_values (np.ndarray): La valeur personnalisée de chaque état pour chaque instance.
+
+    Méthodes:
+        reset() -> None:
+            Place toutes les instances sur l'état initial et exécute leur action d'entrée.
+
+        step() -> int:
+            Évalue les transitions de toutes les instances et franchit celles qui sont vraies.
+
+        occupancy() -> np.ndarray:
+            Obtient le nombre d'instances dans chaque état.
+
+        runtime(instance: int) -> LayoutRuntime:
+            Obtient l'enregistrement d'exécution d'une instance.
+
+    Utilisation:
+        >>> engine = BatchEngine(layout, size=10000)
+        >>> engine.reset()
+        >>> while True:
+        ...     engine.step()
+    """
+
+    def __init__(self, layout: FiniteStateMachine.Layout, size: int, clock: Optional[Clock] = None, run_in_state_actions: bool = False) -> None:
+        """
+        Initialise le moteur avec size instances placées sur l'état initial, sans exécuter d'action.
+
+        Args:
+            layout (FiniteStateMachine.Layout): Le layout compilé.
+            size (int): Le nombre d'instances.
+            clock (Clock, optionnel): L'horloge du moteur, liée aux états du layout. Par défaut, Clock.system().
+            run_in_state_actions (bool): Indique si les actions de présence dans l'état sont exécutées pour chaque
+                instance qui ne franchit aucune transition. Par défaut à False.
+
+        Raises:
+            ImportError: NumPy n'est pas installé.
+            ValueError: Le layout n'est pas compilé.
+            ValueError: size doit être positif.
+            ValueError: Une condition du layout ne peut pas être vectorisée.
+
+        Utilisation:
+            >>> engine = BatchEngine(layout, size=10000, clock=VirtualClock())
+        """
+        if np is None:
+            raise ImportError("BatchEngine requires numpy")
+        if not layout.compiled:
+            raise ValueError("layout must be compiled")
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self.__layout = layout
+        self.__clock = Clock.system() if clock is None else clock
+        for state in layout.states:
+            state._bind_clock(self.__clock)
+        self.__run_in_state_actions = run_in_state_actions
+        self.__now: float = self.__clock.now()
+
+        template = layout.new_runtime()
+        count = len(template)
+        self.__current_indices = np.full(size, template.current_index, dtype=np.int64)
+        self.__entry_counts = np.zeros((size, count), dtype=np.int64)
+        self.__last_entry_times = np.zeros((size, count), dtype=np.float64)
+        self.__last_exit_times = np.zeros((size, count), dtype=np.float64)
+        self.__custom_values = np.empty((size, count), dtype=object)
+        for index, value in enumerate(template.custom_values):
+            self.__custom_values[:, index].fill(value)
+        self.__terminals = np.array(layout.terminals, dtype=bool)
+        self.__runtimes: List[Optional[LayoutRuntime]] = [None] * size
+
+        self.__table: List[Tuple[Tuple[Callable[[], Any], int, Transition], ...]] = [
+            tuple((self.__vectorize(transition), layout.index_of(transition.next_state), transition) for transition in state.transitions)
+            for state in layout.states]
+
+    def __vectorize(self, transition: Transition) -> Callable[[], Any]:
+        """
+        Construit l'évaluation vectorisée d'une transition.
+
+        Args:
+            transition (Transition): La transition.
+
+        Returns:
+            Callable[[], Any]: Une fonction qui renvoie un masque par instance, ou un booléen pour toutes.
+
+        Utilisation:
+            >>> compare = self.__vectorize(transition)
+        """
+        if isinstance(transition, ConditionalTransition) and isinstance(transition.condition, Condition):
+            return transition.condition._vectorize(self)
+        return lambda: bool(transition.transiting)
+
+    @property
+    def layout(self) -> FiniteStateMachine.Layout:
+        """
+        Obtient le layout partagé par les instances.
+
+        Returns:
+            FiniteStateMachine.Layout: Le layout compilé.
+
+        Utilisation:
+            >>> layout = engine.layout
+        """
+        return self.__layout
+
+    @property
+    def size(self) -> int:
+        """
+        Obtient le nombre d'instances.
+
+        Returns:
+            int: Le nombre d'instances.
+
+        Utilisation:
+            >>> size = engine.size
+        """
+        return len(self.__current_indices)
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Obtient l'horloge du moteur.
+
+        Returns:
+            Clock: L'horloge du moteur.
+
+        Utilisation:
+            >>> clock = engine.clock
+        """
+        return self.__clock
+
+    @property
+    def now(self) -> float:
+        """
+        Obtient l'instant du pas courant, auquel les conditions vectorisées sont évaluées.
+
+        Returns:
+            float: L'instant du dernier pas.
+
+        Utilisation:
+            >>> now = engine.now
+        """
+        return self.__now
+
+    @property
+    def current_indices(self) -> 'np.ndarray':
+        """
+        Obtient l'indice de l'état courant de chaque instance (voir FiniteStateMachine.Layout.index_of).
+
+        Returns:
+            np.ndarray: Un tableau de size entiers.
+
+        Utilisation:
+            >>> in_state = engine.current_indices == layout.index_of(state)
+        """
+        return self.__current_indices
+
+    @property
+    def entry_counts(self) -> 'np.ndarray':
+        """
+        Obtient le nombre d'entrées de chaque instance dans chaque état.
+
+        Returns:
+            np.ndarray: Un tableau de size lignes, une colonne par état.
+
+        Utilisation:
+            >>> counts = engine.entry_counts[:, layout.index_of(state)]
+        """
+        return self.__entry_counts
+
+    @property
+    def last_entry_times(self) -> 'np.ndarray':
+        """
+        Obtient l'instant de la dernière entrée de chaque instance dans chaque état.
+
+        Returns:
+            np.ndarray: Un tableau de size lignes, une colonne par état.
+
+        Utilisation:
+            >>> times = engine.last_entry_times[:, layout.index_of(state)]
+        """
+        return self.__last_entry_times
+
+    @property
+    def last_exit_times(self) -> 'np.ndarray':
+        """
+        Obtient l'instant de la dernière sortie de chaque instance de chaque état.
+
+        Returns:
+            np.ndarray: Un tableau de size lignes, une colonne par état.
+
+        Utilisation:
+            >>> times = engine.last_exit_times[:, layout.index_of(state)]
+        """
+        return self.__last_exit_times
+
+    @property
+    def custom_values(self) -> 'np.ndarray':
+        """
+        Obtient la valeur personnalisée de chaque état pour chaque instance.
+
+        Returns:
+            np.ndarray: Un tableau d'objets de size lignes, une colonne par état.
+
+        Utilisation:
+            >>> values = engine.custom_values[:, layout.index_of(state)]
+        """
+        return self.__custom_values
+
+    def runtime(self, instance: int) -> LayoutRuntime:
+        """
+        Obtient l'enregistrement d'exécution d'une instance, vue sur les lignes des tableaux du moteur.
+
+        Args:
+            instance (int): L'indice de l'instance.
+
+        Returns:
+            LayoutRuntime: L'enregistrement de l'instance.
+
+        Utilisation:
+            >>> runtime = engine.runtime(42)
+        """
+        runtime = self.__runtimes[instance]
+        if runtime is None:
+            runtime = LayoutRuntime.view(self.__entry_counts[instance], self.__last_entry_times[instance],
+                                         self.__last_exit_times[instance], self.__custom_values[instance])
+            self.__runtimes[instance] = runtime
+        runtime.current_index = int(self.__current_indices[instance])
+        return runtime
+
+    def __activate(self, instance: int) -> None:
+        """
+        Désigne l'enregistrement d'une instance comme celui du layout, avant l'exécution de ses actions.
+
+        Args:
+            instance (int): L'indice de l'instance.
+
+        Utilisation:
+            >>> self.__activate(42)
+        """
+        self.__layout.runtime = self.runtime(instance)
+
+    def occupancy(self) -> 'np.ndarray':
+        """
+        Obtient le nombre d'instances dans chaque état.
+
+        Returns:
+            np.ndarray: Un tableau d'entiers, un par état du layout.
+
+        Utilisation:
+            >>> counts = engine.occupancy()
+        """
+        return np.bincount(self.__current_indices, minlength=len(self.__table))
+
+    def reset(self) -> None:
+        """
+        Place toutes les instances sur l'état initial et exécute, pour chacune, l'action d'entrée de cet état.
+
+        Utilisation:
+            >>> engine.reset()
+        """
+        Tick.begin()
+        previous = self.__layout.runtime
+        try:
+            self.__now = self.__clock.now()
+            initial = self.__layout.index_of(self.__layout.initial_state)
+            state = self.__layout.states[initial]
+            self.__current_indices.fill(initial)
+            for instance in range(self.size):
+                self.__activate(instance)
+                state._exec_entering_action()
+        finally:
+            self.__layout.runtime = previous
+            Tick.end()
+
+    def step(self) -> int:
+        """
+        Évalue les transitions de toutes les instances à un même instant et franchit celles qui sont vraies.
+
+        Toutes les conditions sont évaluées avant qu'une transition ne soit franchie : les actions d'une instance
+        n'influencent pas l'évaluation des autres au cours du même pas. Le pas ouvre un tick (voir Tick).
+        L'instant du pas est lu sur l'horloge du moteur, comme les instants d'entrée et de sortie enregistrés
+        par les états : avec une VirtualClock, advance() fixe les deux.
+
+        Returns:
+            int: Le nombre d'instances qui ont franchi une transition.
+
+        Utilisation:
+            >>> fired = engine.step()
+        """
+        Tick.begin()
+        previous = self.__layout.runtime
+        try:
+            self.__now = self.__clock.now()
+            current = self.__current_indices
+            states = self.__layout.states
+            fired = []
+            for index, row in enumerate(self.__table):
+                if self.__terminals[index] or not (row or self.__run_in_state_actions):
+                    continue
+                pending = current == index
+                if not pending.any():
+                    continue
+                for compare, target, transition in row:
+                    mask = pending & compare()
+                    if mask.any():
+                        fired.append((index, target, transition, np.flatnonzero(mask)))
+                        pending &= ~mask
+                        if not pending.any():
+                            break
+                if self.__run_in_state_actions:
+                    for instance in np.flatnonzero(pending):
+                        self.__activate(instance)
+                        states[index]._exec_in_state_action()
+
+            count = 0
+            for index, target, transition, instances in fired:
+                current[instances] = target
+                count += len(instances)
+                source = states[index]
+                destination = states[target]
+                for instance in instances:
+                    self.__activate(instance)
+                    source._exec_exiting_action()
+                    transition._exec_transiting_action()
+                    destination._exec_entering_action()
+            return count
+        finally:
+            self.__layout.runtime = previous
+            Tick.end()
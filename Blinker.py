@@ -1,10 +1,12 @@
-from typing import Callable
+from typing import Callable, Optional, Tuple
 from enum import Enum, auto
 from FiniteStateMachine import FiniteStateMachine
 from State import State, ActionState, MonitoredState
 from Transition import ConditionalTransition, Transition, MonitoredTransition, ActionTransition
 from Condition import StateEntryDurationCondition, StateValueCondition, AlwaysTrueCondition
 from time import sleep
+from TimerWheel import TimerWheel
+from Clock import Clock
 
 class Blinker(FiniteStateMachine):
     """
@@ -39,19 +41,23 @@ class Blinker(FiniteStateMachine):
     """
     StateGenerator = Callable[[], MonitoredState]
 
-    def __init__(self, off_state_generator: StateGenerator, on_state_generator: StateGenerator) -> None:
+    def __init__(self, off_state_generator: StateGenerator, on_state_generator: StateGenerator, timer_wheel: Optional[TimerWheel] = None, clock: Optional[Clock] = None) -> None:
         """
         Initialise une instance de Blinker.
 
         Args:
             off_state_generator (StateGenerator): Callable générant l'état "éteint".
             on_state_generator (StateGenerator): Callable générant l'état "allumé".
+            timer_wheel (TimerWheel, optionnel): La roue qui suit les durées des états, quantifiées alors au tick.
+                Par défaut à None (chaque durée est comparée à l'horloge).
+            clock (Clock, optionnel): L'horloge du clignotant. Par défaut, Clock.system().
 
         Utilisation:
             >>> blinker = Blinker(off_state_generator=off_state_generator, on_state_generator=on_state_generator)
         """
         
         __default_value = 0
+        clock = Clock.system() if clock is None else clock
         self.__is_off = True
         self.__is_on = False
 
@@ -78,19 +84,19 @@ class Blinker(FiniteStateMachine):
         self.__on.add_transition(ConditionalTransition(next_state=self.__on, condition=AlwaysTrueCondition()))
         
         # first transition : from off duration to on
-        self.__sedc_off_duration = StateEntryDurationCondition(__default_value, self.__off_duration)
+        self.__sedc_off_duration = StateEntryDurationCondition(__default_value, self.__off_duration, timer_wheel=timer_wheel)
         self.__off_duration.add_transition(ConditionalTransition(next_state=self.__on, condition=self.__sedc_off_duration))
 
         # second transition : from on duration to off
-        self.__sedc_on_duration = StateEntryDurationCondition(__default_value, self.__on_duration)
+        self.__sedc_on_duration = StateEntryDurationCondition(__default_value, self.__on_duration, timer_wheel=timer_wheel)
         self.__on_duration.add_transition(ConditionalTransition(next_state=self.__off, condition=self.__sedc_on_duration))
 
         # third transition : from blink_off to blink_on
-        self.__sedc_blink_off = StateEntryDurationCondition(__default_value, self.__blink_off)
+        self.__sedc_blink_off = StateEntryDurationCondition(__default_value, self.__blink_off, timer_wheel=timer_wheel)
         self.__blink_off.add_transition(ConditionalTransition(next_state=self.__blink_on, condition=self.__sedc_blink_off))
 
         # fourth transition : from blink_on to blink_off
-        self.__sedc_blink_on = StateEntryDurationCondition(__default_value, self.__blink_on)
+        self.__sedc_blink_on = StateEntryDurationCondition(__default_value, self.__blink_on, timer_wheel=timer_wheel)
         self.__blink_on.add_transition(ConditionalTransition(next_state=self.__blink_off, condition=self.__sedc_blink_on))
 
         # fifth transition : from blink_begin to blink_off & from blink_begin to blink_on
@@ -102,15 +108,15 @@ class Blinker(FiniteStateMachine):
         self.__blink_stop_begin.add_transition(ConditionalTransition(next_state=self.__blink_stop_on, condition=StateValueCondition(True, self.__blink_stop_begin)))
 
         #from blink_stop_off to blink_stop_on
-        self.__sedc_blink_stop_off = StateEntryDurationCondition(__default_value, self.__blink_stop_off)
+        self.__sedc_blink_stop_off = StateEntryDurationCondition(__default_value, self.__blink_stop_off, timer_wheel=timer_wheel)
         self.__blink_stop_off.add_transition(ConditionalTransition(next_state=self.__blink_stop_on, condition= self.__sedc_blink_stop_off))
         
         #from blink_stop_on to blink_stop_off
-        self.sedc_blink_stop_on = StateEntryDurationCondition(__default_value, self.__blink_stop_on)
+        self.sedc_blink_stop_on = StateEntryDurationCondition(__default_value, self.__blink_stop_on, timer_wheel=timer_wheel)
         self.__blink_stop_on.add_transition(ConditionalTransition(next_state=self.__blink_stop_off, condition= self.sedc_blink_stop_on))
 
         #from blink_stop_on to blink_stop_end & from blink_stop_off to blink_stop_end
-        self.__sedc_blink_stop_begin = StateEntryDurationCondition(__default_value, self.__blink_stop_begin)
+        self.__sedc_blink_stop_begin = StateEntryDurationCondition(__default_value, self.__blink_stop_begin, timer_wheel=timer_wheel)
         self.__blink_stop_off.add_transition(ConditionalTransition(next_state=self.__blink_stop_end, condition=self.__sedc_blink_stop_begin))
         self.__blink_stop_on.add_transition(ConditionalTransition(next_state=self.__blink_stop_end, condition=self.__sedc_blink_stop_begin))
 
@@ -127,8 +133,9 @@ class Blinker(FiniteStateMachine):
             self.__blink_stop_begin, self.__blink_stop_off, self.__blink_stop_on, self.__blink_stop_end])   # off and on blink stop states
         
         layout.initial_state = self.__off
+        layout.compile()
 
-        super().__init__(layout)
+        super().__init__(layout, timer_wheel=timer_wheel, clock=clock)
 
         
     @property
@@ -262,114 +269,349 @@ class Blinker(FiniteStateMachine):
             >>> blinker.blink(n_cycles=5, cycle_duration=1, percent_on=0.5, begin_on=True, end_off=True)
         """
 
-        default_kwargs = {'cycle_duration': 1., 'percent_on': 0.5, 'begin_on': True, 'end_off': True, 'reciprocal': False}
-        reciprocal = kwargs['reciprocal'] if 'reciprocal' in kwargs else default_kwargs['reciprocal']
-
-        second_mandatory_kwargs = {'total_duration'}
-        third_mandatory_kwargs = {'total_duration', 'n_cycles'}
-        fourth_mandatory_kwargs = {'n_cycles'}
-        
-        if third_mandatory_kwargs <= set(kwargs.keys()):
-            total_duration = kwargs['total_duration']
-            n_cycles = kwargs['n_cycles']
-            if not isinstance(total_duration, float) or not isinstance(n_cycles, float):
-                raise ValueError("total_duration and n_cycles must be integers")
-            cycle_duration = total_duration / n_cycles
-            percent_on = kwargs['percent_on'] if 'percent_on' in kwargs else default_kwargs['percent_on']
-            if not isinstance(percent_on, float):
-                raise ValueError("percent_on must be a float")
-            begin_on = kwargs['begin_on'] if 'begin_on' in kwargs else default_kwargs['begin_on']
-            if not isinstance(begin_on, bool):
-                raise ValueError("begin_on must be a boolean")
-            end_off = kwargs['end_off'] if 'end_off' in kwargs else default_kwargs['end_off']
-            if not isinstance(end_off, bool):
-                raise ValueError("end_off must be a boolean")
-            
-            if reciprocal:
-                percent_on = 1 - percent_on
-                begin_on = not begin_on
-
+        cycle_duration, percent_on, begin_on, total_duration, end_off = _parse_blink_arguments(kwargs)
+        if total_duration is None:
+            self.__sedc_blink_on.duration = cycle_duration * percent_on
+            self.__sedc_blink_off.duration = cycle_duration - self.__sedc_blink_on.duration
+            self.__blink_begin.custom_value = begin_on
+            self.transit_to(self.__blink_begin)
+        else:
             self.__sedc_blink_stop_begin.duration = total_duration
             self.sedc_blink_stop_on.duration = cycle_duration * percent_on
             self.__sedc_blink_stop_off.duration = cycle_duration - self.sedc_blink_stop_on.duration
             self.__blink_stop_begin.custom_value = begin_on
             self.__blink_stop_end.custom_value = end_off
             self.transit_to(self.__blink_stop_begin)
-        elif second_mandatory_kwargs <= set(kwargs.keys()):
-            total_duration = kwargs['total_duration']
-            if not isinstance(total_duration, float):
-                raise ValueError("total_duration must be an float")
-            cycle_duration = kwargs['cycle_duration'] if 'cycle_duration' in kwargs else default_kwargs['cycle_duration']
-            if not isinstance(cycle_duration, float):
-                raise ValueError("cycle_duration must be an integer")
-            percent_on = kwargs['percent_on'] if 'percent_on' in kwargs else default_kwargs['percent_on']
-            if not isinstance(percent_on, float):
-                raise ValueError("percent_on must be a float")
-            begin_on = kwargs['begin_on'] if 'begin_on' in kwargs else default_kwargs['begin_on']
-            if not isinstance(begin_on, bool):
-                raise ValueError("begin_on must be a boolean")
-            end_off = kwargs['end_off'] if 'end_off' in kwargs else default_kwargs['end_off']
-            if not isinstance(end_off, bool):
-                raise ValueError("end_off must be a boolean")
-            
-            if reciprocal:
-                percent_on = 1 - percent_on
-                begin_on = not begin_on
 
-            self.__sedc_blink_stop_begin.duration = total_duration
-            self.__blink_stop_begin.custom_value = begin_on
-            self.sedc_blink_stop_on.duration = cycle_duration * percent_on
-            self.__sedc_blink_stop_off.duration = cycle_duration - self.sedc_blink_stop_on.duration
-            self.__blink_stop_end.custom_value = end_off
-            self.transit_to(self.__blink_stop_begin)
+def _parse_blink_arguments(kwargs: dict) -> Tuple[float, float, bool, Optional[float], bool]:
+    """
+    Valide les arguments de blink() selon les configurations de Blinker.blink().
 
-        elif fourth_mandatory_kwargs <= set(kwargs.keys()):
-            n_cycles = kwargs['n_cycles']
-            if not isinstance(n_cycles, int):
-                raise ValueError("n_cycles must be an integer")
-            cycle_duration = kwargs['cycle_duration'] if 'cycle_duration' in kwargs else default_kwargs['cycle_duration']
-            if not isinstance(cycle_duration, float):
-                raise ValueError("cycle_duration must be an integer")
-            percent_on = kwargs['percent_on'] if 'percent_on' in kwargs else default_kwargs['percent_on']
-            if not isinstance(percent_on, float):
-                raise ValueError("percent_on must be a float")
-            begin_on = kwargs['begin_on'] if 'begin_on' in kwargs else default_kwargs['begin_on']
-            if not isinstance(begin_on, bool):
-                raise ValueError("begin_on must be a boolean")
-            end_off = kwargs['end_off'] if 'end_off' in kwargs else default_kwargs['end_off']
-            if not isinstance(end_off, bool):
-                raise ValueError("end_off must be a boolean")
-            
-            if reciprocal:
-                percent_on = 1 - percent_on
-                begin_on = not begin_on
+    Args:
+        kwargs (dict): Les arguments passés à blink(), y compris 'reciprocal'.
 
+    Returns:
+        Tuple[float, float, bool, Optional[float], bool]: La durée du cycle, le pourcentage allumé, l'état initial,
+        la durée totale (None si le clignotement est illimité) et la valeur de end_off, réciprocité appliquée.
+
+    Raises:
+        ValueError: Si les arguments spécifiés sont invalides.
+
+    Utilisation:
+        >>> cycle_duration, percent_on, begin_on, total_duration, end_off = _parse_blink_arguments(kwargs)
+    """
+    default_kwargs = {'cycle_duration': 1., 'percent_on': 0.5, 'begin_on': True, 'end_off': True, 'reciprocal': False}
+    keys = set(kwargs.keys())
+    total_duration = None
+
+    if {'total_duration', 'n_cycles'} <= keys:
+        total_duration = kwargs['total_duration']
+        n_cycles = kwargs['n_cycles']
+        if not isinstance(total_duration, float) or not isinstance(n_cycles, float):
+            raise ValueError("total_duration and n_cycles must be floats")
+        cycle_duration = total_duration / n_cycles
+    elif 'total_duration' in keys:
+        total_duration = kwargs['total_duration']
+        if not isinstance(total_duration, float):
+            raise ValueError("total_duration must be a float")
+    elif 'n_cycles' in keys:
+        n_cycles = kwargs['n_cycles']
+        if not isinstance(n_cycles, int):
+            raise ValueError("n_cycles must be an integer")
+
+    if 'n_cycles' not in keys or 'total_duration' not in keys:
+        cycle_duration = kwargs.get('cycle_duration', default_kwargs['cycle_duration'])
+        if not isinstance(cycle_duration, float):
+            raise ValueError("cycle_duration must be a float")
+        if 'n_cycles' in keys:
             total_duration = cycle_duration * n_cycles
-            self.__sedc_blink_stop_begin.duration = total_duration
-            self.__blink_stop_begin.custom_value = begin_on
-            self.sedc_blink_stop_on.duration = cycle_duration * percent_on
-            self.__sedc_blink_stop_off.duration = cycle_duration - self.sedc_blink_stop_on.duration
-            self.__blink_stop_end.custom_value = end_off
-            self.transit_to(self.__blink_stop_begin)
+
+    percent_on = kwargs.get('percent_on', default_kwargs['percent_on'])
+    if not isinstance(percent_on, float):
+        raise ValueError("percent_on must be a float")
+    begin_on = kwargs.get('begin_on', default_kwargs['begin_on'])
+    if not isinstance(begin_on, bool):
+        raise ValueError("begin_on must be a boolean")
+    end_off = kwargs.get('end_off', default_kwargs['end_off'])
+    if not isinstance(end_off, bool):
+        raise ValueError("end_off must be a boolean")
+
+    if kwargs.get('reciprocal', default_kwargs['reciprocal']):
+        percent_on = 1 - percent_on
+        begin_on = not begin_on
+    return cycle_duration, percent_on, begin_on, total_duration, end_off
+
+
+class PhaseBlinker():
+    """
+    Cette classe représente un clignotant calculé par arithmétique de phase, sans machine à états interne.
+
+    L'état allumé ou éteint est déduit à chaque suivi de l'instant de départ de la commande, de la durée du cycle,
+    du pourcentage allumé et de la durée totale. Seuls les changements d'état exécutent les actions des états
+    "éteint" et "allumé" : un suivi sans front ne coûte qu'une lecture d'horloge et quelques opérations.
+
+    Un clignotement borné se termine dans le même état qu'avec Blinker, qui applique la valeur de end_off comme
+    état final (end_off=True termine allumé) : PhaseBlinker remplace Blinker sans changer le comportement.
+
+    Attributes:
+        StateGenerator (Callable): Type de fonction générant un état surveillé.
+        __off (MonitoredState): État "éteint", dont les actions sont exécutées sur les fronts descendants.
+        __on (MonitoredState): État "allumé", dont les actions sont exécutées sur les fronts montants.
+        __lit (Optional[bool]): Dernier état appliqué, None avant le premier suivi.
+        __start (float): Instant de départ de la commande en cours.
+        __cycle (Optional[float]): Durée d'un cycle de clignotement, None pour un état fixe.
+        __first (float): Durée de la première phase du cycle.
+        __begin_on (bool): État de la première phase du cycle, ou état fixe.
+        __end (Optional[float]): Instant de fin de la commande en cours, None si elle est illimitée.
+        __final (bool): État appliqué après la fin de la commande.
+
+    Methods:
+        is_off(): Retourne True si le clignotant est éteint, False sinon.
+        is_on(): Retourne True si le clignotant est allumé, False sinon.
+        turn_off(**kwargs): Éteint le clignotant avec des options facultatives.
+        turn_on(**kwargs): Allume le clignotant avec des options facultatives.
+        blink(**kwargs): Fait clignoter le clignotant avec différentes configurations.
+        track(): Applique l'état courant et exécute les actions du front éventuel.
+        next_deadline(now): Retourne l'instant du prochain front.
+
+    Utilisation:
+        >>> blinker = PhaseBlinker(off_state_generator=off_state_generator, on_state_generator=on_state_generator)
+        >>> blinker.blink(cycle_duration=1., percent_on=0.5, begin_on=True)
+        >>> blinker.track()
+    """
+    StateGenerator = Blinker.StateGenerator
+
+    def __init__(self, off_state_generator: StateGenerator, on_state_generator: StateGenerator, clock: Optional[Clock] = None) -> None:
+        """
+        Initialise une instance de PhaseBlinker, éteinte.
+
+        Args:
+            off_state_generator (StateGenerator): Callable générant l'état "éteint".
+            on_state_generator (StateGenerator): Callable générant l'état "allumé".
+            clock (Clock, optionnel): L'horloge du clignotant, liée aussi aux deux états. Par défaut, Clock.system().
+
+        Utilisation:
+            >>> blinker = PhaseBlinker(off_state_generator=off_state_generator, on_state_generator=on_state_generator)
+        """
+        self.__clock = Clock.system() if clock is None else clock
+        self.__off = off_state_generator()
+        self.__on = on_state_generator()
+        self.__off._bind_clock(self.__clock)
+        self.__on._bind_clock(self.__clock)
+        self.__lit: Optional[bool] = None
+        self.__is_off = True
+        self.__is_on = False
+        self.__program(False, apply=False)
+
+    @property
+    def is_off(self) -> bool:
+        """
+        Getter de la propriété is_off, retourne True si la dernière commande est une extinction.
+
+        Returns:
+            bool: True si la dernière commande est une extinction, False autrement.
+
+        Utilisation:
+            >>> blinker.is_off
+        """
+        return self.__is_off
+
+    @is_off.setter
+    def is_off(self) -> None:
+        raise ValueError("is_off is a read-only property")
+
+    @property
+    def is_on(self) -> bool:
+        """
+        Getter de la propriété is_on, retourne True si la dernière commande est un allumage.
+
+        Returns:
+            bool: True si la dernière commande est un allumage, False autrement.
+
+        Utilisation:
+            >>> blinker.is_on
+        """
+        return self.__is_on
+
+    @is_on.setter
+    def is_on(self) -> None:
+        raise ValueError("is_on is a read-only property")
+
+    def turn_off(self, **kwargs) -> None:
+        """
+        Éteint le clignotant selon les paramètres spécifiés.
+
+        Args:
+            - Aucun argument:
+                * Clignotant éteint instantanément.
+
+            - Configuration avec la durée :
+                * 'duration' (float): Durée d'extinction du clignotant, en secondes, avant qu'il ne s'allume.
+
+        Raises:
+            ValueError: Si les arguments spécifiés sont invalides.
+
+        Utilisation:
+            >>> blinker.turn_off()
+            >>> blinker.turn_off(duration=5.)
+        """
+        if kwargs == {}:
+            self.__program(False)
+        elif set(kwargs.keys()) == {'duration'}:
+            self.__program(False, total_duration=kwargs['duration'], final=True)
         else:
-            cycle_duration = kwargs['cycle_duration'] if 'cycle_duration' in kwargs else default_kwargs['cycle_duration']
-            if not isinstance(cycle_duration, float):
-                raise ValueError("cycle_duration must be an float")
-            percent_on = kwargs['percent_on'] if 'percent_on' in kwargs else default_kwargs['percent_on']
-            if not isinstance(percent_on, float):
-                raise ValueError("percent_on must be a float")
-            begin_on = kwargs['begin_on'] if 'begin_on' in kwargs else default_kwargs['begin_on']
-            if not isinstance(begin_on, bool):
-                raise ValueError("begin_on must be a boolean")
-            
-            if reciprocal:
-                percent_on = 1 - percent_on
-                begin_on = not begin_on
+            raise ValueError("turn_off takes at most 1 argument")
+        self.__is_off = True
+        self.__is_on = False
 
-            self.__sedc_blink_on.duration = cycle_duration * percent_on
-            self.__sedc_blink_off.duration = cycle_duration - self.__sedc_blink_on.duration
-            self.__blink_begin.custom_value = begin_on
-            self.transit_to(self.__blink_begin)
+    def turn_on(self, **kwargs) -> None:
+        """
+        Allume le clignotant selon les paramètres spécifiés.
+
+        Args:
+            - Aucun argument:
+                * Clignotant allumé instantanément.
+
+            - Configuration avec la durée :
+                * 'duration' (float): Durée d'allumage du clignotant, en secondes, avant qu'il ne s'éteigne.
+
+        Raises:
+            ValueError: Si les arguments spécifiés sont invalides.
+
+        Utilisation:
+            >>> blinker.turn_on()
+            >>> blinker.turn_on(duration=5.)
+        """
+        if kwargs == {}:
+            self.__program(True)
+        elif set(kwargs.keys()) == {'duration'}:
+            self.__program(True, total_duration=kwargs['duration'], final=False)
+        else:
+            raise ValueError("turn_on takes at most 1 argument")
+        self.__is_off = False
+        self.__is_on = True
+
+    def blink(self, **kwargs) -> None:
+        """
+        Fait clignoter le clignotant selon les paramètres spécifiés.
+
+        Accepte les mêmes configurations que Blinker.blink().
+
+        Raises:
+            ValueError: Si les arguments spécifiés sont invalides.
+
+        Utilisation:
+            >>> blinker.blink(cycle_duration=1., percent_on=0.5, begin_on=True)
+            >>> blinker.blink(total_duration=10., cycle_duration=1., percent_on=0.5, begin_on=True, end_off=True)
+            >>> blinker.blink(total_duration=10., n_cycles=5., percent_on=0.5, begin_on=True, end_off=True)
+            >>> blinker.blink(n_cycles=5, cycle_duration=1., percent_on=0.5, begin_on=True, end_off=True)
+        """
+        cycle_duration, percent_on, begin_on, total_duration, end_off = _parse_blink_arguments(kwargs)
+        self.__program(begin_on, cycle_duration, percent_on, total_duration, end_off)
+
+    def track(self) -> bool:
+        """
+        Applique l'état du clignotant à l'instant courant. Les actions ne sont exécutées que sur un front.
+
+        Returns:
+            bool: Toujours True, le clignotant ne se termine jamais.
+
+        Utilisation:
+            >>> blinker.track()
+        """
+        lit = self.__lit_at(self.__clock.now())
+        if lit != self.__lit:
+            self.__apply(lit)
+        return True
+
+    def next_deadline(self, now: float) -> Optional[float]:
+        """
+        Calcule l'instant du prochain front.
+
+        Args:
+            now (float): L'instant courant.
+
+        Returns:
+            Optional[float]: L'instant du prochain front, None si l'état ne changera plus.
+
+        Utilisation:
+            >>> deadline = blinker.next_deadline(clock.now())
+        """
+        end = self.__end
+        if end is not None and now >= end:
+            return None
+        deadline = None
+        if self.__cycle is not None:
+            phase = (now - self.__start) % self.__cycle
+            deadline = now + (self.__first - phase if phase < self.__first else self.__cycle - phase)
+        if end is not None and (deadline is None or end < deadline):
+            deadline = end
+        return deadline
+
+    def __program(self, begin_on: bool, cycle_duration: Optional[float] = None, percent_on: float = 1., total_duration: Optional[float] = None, final: bool = False, apply: bool = True) -> None:
+        """
+        Enregistre une commande à partir de l'instant courant et applique, par défaut, immédiatement son premier état.
+
+        Args:
+            begin_on (bool): L'état initial, ou l'état fixe sans cycle.
+            cycle_duration (Optional[float]): La durée d'un cycle, None pour un état fixe.
+            percent_on (float): Le pourcentage du cycle pendant lequel le clignotant est allumé.
+            total_duration (Optional[float]): La durée de la commande, None si elle est illimitée.
+            final (bool): L'état appliqué après la fin de la commande.
+            apply (bool): Indique si le premier état est appliqué immédiatement plutôt qu'au prochain suivi.
+
+        Utilisation:
+            >>> self.__program(True, cycle_duration=1., percent_on=0.5)
+        """
+        self.__start = self.__clock.now()
+        self.__begin_on = begin_on
+        if cycle_duration is None or cycle_duration <= 0:
+            self.__cycle = None
+            self.__first = 0.
+        else:
+            on_duration = cycle_duration * percent_on
+            self.__cycle = cycle_duration
+            self.__first = on_duration if begin_on else cycle_duration - on_duration
+        self.__end = None if total_duration is None else self.__start + total_duration
+        self.__final = final
+        if apply:
+            self.__apply(self.__lit_at(self.__start))
+
+    def __lit_at(self, now: float) -> bool:
+        """
+        Calcule l'état du clignotant à un instant donné.
+
+        Args:
+            now (float): L'instant considéré.
+
+        Returns:
+            bool: True si le clignotant est allumé, False sinon.
+
+        Utilisation:
+            >>> lit = self.__lit_at(self.__clock.now())
+        """
+        if self.__end is not None and now >= self.__end:
+            return self.__final
+        if self.__cycle is None:
+            return self.__begin_on
+        if (now - self.__start) % self.__cycle < self.__first:
+            return self.__begin_on
+        return not self.__begin_on
+
+    def __apply(self, lit: bool) -> None:
+        """
+        Exécute les actions de sortie de l'état précédent et d'entrée du nouvel état.
+
+        Args:
+            lit (bool): Le nouvel état.
+
+        Utilisation:
+            >>> self.__apply(True)
+        """
+        if self.__lit is not None:
+            (self.__on if self.__lit else self.__off)._exec_exiting_action()
+        self.__lit = lit
+        (self.__on if lit else self.__off)._exec_entering_action()
 
 class SideBlinker():
     """
@@ -422,7 +664,9 @@ class SideBlinker():
             left_off_state_generator : Blinker.StateGenerator,
             left_on_state_generator : Blinker.StateGenerator,
             right_off_state_generator : Blinker.StateGenerator,
-            right_on_state_generator : Blinker.StateGenerator
+            right_on_state_generator : Blinker.StateGenerator,
+            blinker_class : type = Blinker,
+            clock : Optional[Clock] = None
             ) -> None:
         """
         Initialise une instance de SideBlinker.
@@ -432,6 +676,8 @@ class SideBlinker():
             - left_on_state_generator (Blinker.StateGenerator): Le générateur d'état pour le clignotant gauche lorsqu'il est allumé.
             - right_off_state_generator (Blinker.StateGenerator): Le générateur d'état pour le clignotant droit lorsqu'il est éteint.
             - right_on_state_generator (Blinker.StateGenerator): Le générateur d'état pour le clignotant droit lorsqu'il est allumé.
+            - blinker_class (type): Le moteur de chaque clignotant, Blinker ou PhaseBlinker. Par défaut à Blinker.
+            - clock (Clock, optionnel): L'horloge des deux clignotants. Par défaut, Clock.system().
 
         Utilisation:
             >>> side_blinker = SideBlinker(
@@ -441,8 +687,8 @@ class SideBlinker():
             >>>     on_state_generator
             >>> )
         """
-        self.__left_blinker = Blinker(left_off_state_generator, left_on_state_generator)
-        self.__right_blinker = Blinker(right_off_state_generator, right_on_state_generator)
+        self.__left_blinker = blinker_class(left_off_state_generator, left_on_state_generator, clock=clock)
+        self.__right_blinker = blinker_class(right_off_state_generator, right_on_state_generator, clock=clock)
 
     def turn_off(self, side: Side) -> None:
         """
@@ -6,10 +6,21 @@ from Transition import ConditionalTransition
 from Robot import Robot
 from ManualControl import ManualControlFSM
 from time import perf_counter
+from Clock import Clock
+from typing import Optional
+from RobotBackend import RobotBackend
 
 class C64(FiniteStateMachine):
-    def __init__(self):
-        self.robot : Robot  = Robot()
+    def __init__(self, clock : Optional[Clock] = None, backend : Optional[RobotBackend] = None, fast_start : bool = False):
+        # Every time source of the robot and of the sub-FSMs follows this clock (see VirtualClock).
+        # fast_start builds the blinkers and task FSMs on first use.
+        start = perf_counter()
+        clock = Clock.system() if clock is None else clock
+        self.robot : Robot  = Robot(clock=clock, backend=backend, fast_start=fast_start)
+        self.__startup_start = start
+        self.__startup_timings = {'robot': perf_counter() - start}
+        self.__first_tick = None
+        states_start = perf_counter()
 
         robot_instantiation  = MonitoredState()
         robot_instantiation.custom_value = self.robot.is_instanciated
@@ -59,7 +70,7 @@ class C64(FiniteStateMachine):
             self.robot.eye_blinker.turn_off(self.robot.eye_blinker.Side.BOTH)
             
         shut_down_robot.add_entering_action(shut_down_robot_entering_action)
-        shut_down_robot.add_in_state_action(self.robot.eye_blinker.track)
+        shut_down_robot.add_in_state_action(lambda: self.robot.eye_blinker.track())
         shut_down_robot.add_exiting_action(shut_down_exiting_action)
 
         end = ActionState(ActionState.Parameters(terminal=True))
@@ -67,8 +78,7 @@ class C64(FiniteStateMachine):
         home = MonitoredState()
         home.add_entering_action(lambda : print("Robot is home"))
 
-        task1 = TaskState()  
-        task1.task_value = ManualControlFSM(robot=self.robot)
+        task1 = TaskState(task_factory=lambda: ManualControlFSM(robot=self.robot))
         
         def task1_eyes_entering_action():
             self.robot.set_left_eye_color("red")
@@ -85,8 +95,7 @@ class C64(FiniteStateMachine):
         task1.add_in_state_action(task1_eyes_in_state_action)
         task1.add_exiting_action(task1_eyes_exiting_action)
 
-        task2 = MonitoredState()
-        task2.custom_value = WonderingFSM(robot=self.robot)
+        task2 = TaskState(task_factory=lambda: WonderingFSM(robot=self.robot))
 
         def task2_eyes_entering_action():
             self.robot.set_right_eye_color("magenta")
@@ -95,7 +104,7 @@ class C64(FiniteStateMachine):
             self.robot.turn_on_right_eye()
             
         def task2_eyes_in_state_action():
-            task2.custom_value.track()
+            task2.task_value.track()
 
         def task2_eyes_exiting_action():
             self.robot.turn_off_eyes()
@@ -163,7 +172,45 @@ class C64(FiniteStateMachine):
         task2.add_transition(task2_to_home)
 
 
+        if not fast_start:
+            task_start = perf_counter()
+            task1.task_value
+            task2.task_value
+            self.__startup_timings['tasks'] = perf_counter() - task_start
+        self.__startup_timings['states'] = perf_counter() - states_start
+
+        layout_start = perf_counter()
         self.layout = FiniteStateMachine.Layout()
         self.layout.add_states([robot_instantiation, instantiation_failed, robot_integrity, integrity_failed, integrity_succeeded, shut_down_robot, end, home, task1, task2])
         self.layout.initial_state = robot_instantiation
-        super().__init__(layout=self.layout)
+        self.layout.compile()
+        self.__startup_timings['layout'] = perf_counter() - layout_start
+
+        fsm_start = perf_counter()
+        super().__init__(layout=self.layout, clock=clock)
+        self.__startup_timings['fsm'] = perf_counter() - fsm_start
+        self.__startup_timings['construction'] = perf_counter() - start
+
+    def track(self) -> bool:
+        run = super().track()
+        if self.__first_tick is None:
+            self.__first_tick = perf_counter() - self.__startup_start
+        return run
+
+    @property
+    def time_to_first_tick(self) -> Optional[float]:
+        # Wall-clock seconds from the start of the construction to the end of the first tick, None before it.
+        return self.__first_tick
+
+    def startup_report(self) -> str:
+        # Breakdown of the construction (robot probes included) and time to first tick, in milliseconds.
+        timings = self.robot.startup_timings
+        lines = [f"{'step':<24} {'ms':>9}"]
+        for name in ('board', 'remote', 'camera_servo', 'range_servo', 'distance_sensor', 'peripherals', 'blinkers'):
+            if name in timings:
+                lines.append(f"{'robot.' + name:<24} {timings[name] * 1e3:>9.3f}")
+        for name, duration in self.__startup_timings.items():
+            lines.append(f"{name:<24} {duration * 1e3:>9.3f}")
+        first_tick = 'n/a' if self.__first_tick is None else f"{self.__first_tick * 1e3:.3f}"
+        lines.append(f"{'time_to_first_tick':<24} {first_tick:>9}")
+        return "\n".join(lines)
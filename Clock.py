@@ -0,0 +1,474 @@
+import heapq
+import itertools
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Optional
+from TimerWheel import TimerWheel
+
+class Clock(ABC):
+    """
+    Source de temps des machines à états finis, des états, des transitions et des conditions.
+
+    Une machine à états finis possède une horloge et la transmet à ses états, à leurs transitions et à leurs
+    conditions (voir FiniteStateMachine). Chaque horloge possède sa TimerWheel.
+
+    Méthodes:
+        system() -> SystemClock:
+            Obtient l'horloge système partagée.
+
+        now() -> float:
+            Obtient l'instant courant, en secondes.
+
+        sleep(duration: float) -> None:
+            Suspend le fil d'exécution pendant une durée.
+
+        wait(event: threading.Event, timeout: float) -> bool:
+            Attend un événement pendant une durée au plus.
+
+        sleep_async(duration: float) -> None:
+            Suspend la tâche asyncio courante pendant une durée.
+
+        hold() -> ContextManager:
+            Retient le temps de sleep_async() pendant un travail hors de la boucle asyncio.
+
+        drives_time() -> bool:
+            Indique si sleep() depuis le fil appelant fait passer le temps.
+
+    Utilisation:
+        >>> clock = Clock.system()
+        >>> now = clock.now()
+        >>> clock.sleep(0.01)
+    """
+
+    __system: Optional['SystemClock'] = None
+
+    def __init__(self) -> None:
+        """
+        Initialise l'horloge, sans roue d'échéances.
+
+        Utilisation:
+            >>> super().__init__()
+        """
+        self.__timer_wheel: Optional[TimerWheel] = None
+
+    @staticmethod
+    def system() -> 'SystemClock':
+        """
+        Obtient l'horloge système partagée, utilisée par défaut.
+
+        Returns:
+            SystemClock: L'horloge système.
+
+        Utilisation:
+            >>> clock = Clock.system()
+        """
+        if Clock.__system is None:
+            Clock.__system = SystemClock()
+        return Clock.__system
+
+    @abstractmethod
+    def now(self) -> float:
+        """
+        Obtient l'instant courant, en secondes.
+
+        Returns:
+            float: L'instant courant.
+
+        Utilisation:
+            >>> now = clock.now()
+        """
+        pass
+
+    @abstractmethod
+    def sleep(self, duration: float) -> None:
+        """
+        Suspend le fil d'exécution pendant une durée.
+
+        Args:
+            duration (float): La durée, en secondes.
+
+        Utilisation:
+            >>> clock.sleep(0.01)
+        """
+        pass
+
+    @abstractmethod
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """
+        Attend qu'un événement soit signalé, pendant une durée au plus.
+
+        Args:
+            event (threading.Event): L'événement à attendre.
+            timeout (float): La durée maximale, en secondes.
+
+        Returns:
+            bool: True si l'événement est signalé, False sinon.
+
+        Utilisation:
+            >>> stopped = clock.wait(stop_event, 0.05)
+        """
+        pass
+
+    async def sleep_async(self, duration: float) -> None:
+        """
+        Suspend la tâche asyncio courante pendant une durée, sans bloquer la boucle d'événements.
+
+        Args:
+            duration (float): La durée, en secondes.
+
+        Utilisation:
+            >>> await clock.sleep_async(0.01)
+        """
+        import asyncio
+        await asyncio.sleep(max(duration, 0.))
+
+    @contextmanager
+    def hold(self):
+        """
+        Retient le temps de sleep_async() pendant un travail hors de la boucle asyncio. Sans effet sur une horloge
+        réelle, dont le temps passe de lui-même (voir VirtualClock.hold).
+
+        Utilisation:
+            >>> with clock.hold():
+            ...     await loop.run_in_executor(None, robot.read_distance_sensor)
+        """
+        yield self
+
+    def drives_time(self) -> bool:
+        """
+        Indique si sleep() appelée depuis le fil courant fait passer le temps, plutôt que d'attendre qu'un autre
+        fil le fasse avancer. Toujours vrai pour une horloge réelle.
+
+        Returns:
+            bool: True si le fil courant fait passer le temps.
+
+        Utilisation:
+            >>> if clock.drives_time():
+            ...     clock.sleep(latency)
+        """
+        return True
+
+    @property
+    def timer_wheel(self) -> TimerWheel:
+        """
+        Obtient la roue d'échéances de l'horloge, créée au premier appel.
+
+        Returns:
+            TimerWheel: La roue d'échéances.
+
+        Utilisation:
+            >>> wheel = clock.timer_wheel
+        """
+        if self.__timer_wheel is None:
+            self.__timer_wheel = self._make_timer_wheel()
+        return self.__timer_wheel
+
+    def _advance_timer_wheel(self) -> None:
+        """
+        Avance la roue de l'horloge, si elle a été créée, au plus une fois par tick (voir TimerWheel.advance_once).
+
+        Utilisation:
+            >>> clock._advance_timer_wheel()
+        """
+        if self.__timer_wheel is not None:
+            self.__timer_wheel.advance_once()
+
+    def _make_timer_wheel(self) -> TimerWheel:
+        """
+        Crée la roue d'échéances de l'horloge.
+
+        Returns:
+            TimerWheel: Une roue qui lit cette horloge.
+
+        Utilisation:
+            >>> wheel = clock._make_timer_wheel()
+        """
+        return TimerWheel(clock=self.now)
+
+class SystemClock(Clock):
+    """
+    Horloge du système, fondée sur time.perf_counter. Sa roue d'échéances est TimerWheel.shared().
+
+    Utilisation:
+        >>> clock = Clock.system()
+        >>> now = clock.now()
+    """
+
+    now = staticmethod(time.perf_counter)
+    sleep = staticmethod(time.sleep)
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """
+        Attend qu'un événement soit signalé, pendant une durée au plus.
+
+        Args:
+            event (threading.Event): L'événement à attendre.
+            timeout (float): La durée maximale, en secondes.
+
+        Returns:
+            bool: True si l'événement est signalé, False sinon.
+
+        Utilisation:
+            >>> stopped = clock.wait(stop_event, 0.05)
+        """
+        return event.wait(timeout)
+
+    def _make_timer_wheel(self) -> TimerWheel:
+        """
+        Obtient la roue partagée du processus.
+
+        Returns:
+            TimerWheel: TimerWheel.shared().
+
+        Utilisation:
+            >>> wheel = clock._make_timer_wheel()
+        """
+        return TimerWheel.shared()
+
+class VirtualClock(Clock):
+    """
+    Horloge virtuelle, pour simuler plus vite que le temps réel.
+
+    Le temps n'avance que par advance(), ou par sleep() et wait() appelées depuis le fil propriétaire (celui
+    qui a créé l'horloge) : une boucle start() avec poll_period saute directement à la prochaine échéance.
+    Depuis un autre fil, comme celui d'un DistanceSampler, sleep() et wait() attendent que le fil propriétaire
+    fasse avancer le temps virtuel jusqu'à l'échéance.
+
+    Sur une boucle asyncio, sleep_async() fait avancer le temps virtuel jusqu'à l'échéance la plus proche parmi
+    les tâches endormies, une fois que toutes les tâches prêtes ont eu la main et que plus aucun travail n'est
+    retenu par hold() : les tâches d'un AsyncScheduler s'exécutent ainsi dans l'ordre de leurs échéances, aussi
+    vite que possible.
+
+    Attributs:
+        __now (float): L'instant virtuel courant.
+        __owner (int): L'identifiant du fil propriétaire.
+        __changed (threading.Condition): La condition signalée à chaque avance du temps.
+        __sleepers (list): Le tas des tâches asyncio endormies : échéance, séquence et événement de réveil.
+        __holds (int): Le nombre de travaux en cours qui retiennent le temps (voir hold()).
+        __activity (int): Le compteur des endormissements et réveils, qui indique au pilote si des tâches ont bougé.
+
+    Méthodes:
+        advance(duration: float) -> None:
+            Fait avancer le temps virtuel.
+
+        advance_to(instant: float) -> None:
+            Fait avancer le temps virtuel jusqu'à un instant.
+
+    Utilisation:
+        >>> clock = VirtualClock()
+        >>> c64 = C64(clock=clock)
+        >>> c64.start(time_budget=3600., poll_period=0.02)
+    """
+
+    REAL_POLL_PERIOD: float = 0.05
+
+    def __init__(self, start: float = 0.) -> None:
+        """
+        Initialise l'horloge virtuelle. Le fil appelant en devient le propriétaire.
+
+        Args:
+            start (float): L'instant virtuel initial, en secondes. Par défaut à 0.
+
+        Utilisation:
+            >>> clock = VirtualClock()
+        """
+        super().__init__()
+        self.__now: float = start
+        self.__owner: int = threading.get_ident()
+        self.__changed = threading.Condition()
+        self.__sleepers: list = []
+        self.__sequence = itertools.count()
+        self.__holds: int = 0
+        self.__activity: int = 0
+        self.__seen: int = -1
+        self.__driving: bool = False
+        self.__loop = None
+
+    def now(self) -> float:
+        """
+        Obtient l'instant virtuel courant.
+
+        Returns:
+            float: L'instant virtuel courant.
+
+        Utilisation:
+            >>> now = clock.now()
+        """
+        return self.__now
+
+    def advance(self, duration: float) -> None:
+        """
+        Fait avancer le temps virtuel.
+
+        Args:
+            duration (float): La durée, en secondes.
+
+        Raises:
+            ValueError: duration doit être positive.
+
+        Utilisation:
+            >>> clock.advance(1.)
+        """
+        if duration < 0:
+            raise ValueError("duration must be positive")
+        self.advance_to(self.__now + duration)
+
+    def advance_to(self, instant: float) -> None:
+        """
+        Fait avancer le temps virtuel jusqu'à un instant. Sans effet si l'instant est déjà passé.
+
+        Args:
+            instant (float): L'instant virtuel visé.
+
+        Utilisation:
+            >>> clock.advance_to(60.)
+        """
+        with self.__changed:
+            if instant > self.__now:
+                self.__now = instant
+            self.__changed.notify_all()
+
+    def sleep(self, duration: float) -> None:
+        """
+        Depuis le fil propriétaire, fait avancer le temps virtuel. Depuis un autre fil, attend qu'il ait avancé.
+
+        Args:
+            duration (float): La durée, en secondes.
+
+        Utilisation:
+            >>> clock.sleep(0.01)
+        """
+        if self.drives_time():
+            self.advance(max(duration, 0.))
+            return
+        deadline = self.__now + duration
+        with self.__changed:
+            while self.__now < deadline:
+                self.__changed.wait(self.REAL_POLL_PERIOD)
+
+    def drives_time(self) -> bool:
+        """
+        Indique si le fil courant est le propriétaire de l'horloge, le seul dont sleep() fait avancer le temps virtuel.
+
+        Returns:
+            bool: True depuis le fil propriétaire.
+
+        Utilisation:
+            >>> owner = clock.drives_time()
+        """
+        return threading.get_ident() == self.__owner
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """
+        Attend qu'un événement soit signalé, pendant une durée virtuelle au plus.
+
+        Args:
+            event (threading.Event): L'événement à attendre.
+            timeout (float): La durée virtuelle maximale, en secondes.
+
+        Returns:
+            bool: True si l'événement est signalé, False sinon.
+
+        Utilisation:
+            >>> stopped = clock.wait(stop_event, 0.05)
+        """
+        if threading.get_ident() == self.__owner:
+            if not event.is_set():
+                self.advance(max(timeout, 0.))
+            return event.is_set()
+        deadline = self.__now + timeout
+        with self.__changed:
+            while self.__now < deadline and not event.is_set():
+                self.__changed.wait(self.REAL_POLL_PERIOD)
+        return event.is_set()
+
+    async def sleep_async(self, duration: float) -> None:
+        """
+        Suspend la tâche asyncio courante jusqu'à l'échéance virtuelle. Depuis le fil propriétaire, chaque tâche
+        endormie attend son propre asyncio.Event ; le temps virtuel n'avance jusqu'à l'échéance la plus proche que
+        lorsqu'aucune tâche n'est plus prête et qu'aucun travail n'est retenu (voir hold()). Depuis un autre fil,
+        la tâche attend que le fil propriétaire fasse avancer le temps.
+
+        Args:
+            duration (float): La durée, en secondes.
+
+        Utilisation:
+            >>> await clock.sleep_async(0.01)
+        """
+        import asyncio
+        deadline = self.__now + max(duration, 0.)
+        if threading.get_ident() != self.__owner:
+            while self.__now < deadline:
+                await asyncio.sleep(self.REAL_POLL_PERIOD)
+            return
+        woken = asyncio.Event()
+        entry = (deadline, next(self.__sequence), woken)
+        heapq.heappush(self.__sleepers, entry)
+        self.__activity += 1
+        self.__drive_soon(asyncio.get_running_loop())
+        try:
+            await woken.wait()
+        finally:
+            if not woken.is_set():
+                self.__sleepers.remove(entry)
+                heapq.heapify(self.__sleepers)
+                self.__activity += 1
+
+    @contextmanager
+    def hold(self):
+        """
+        Retient le temps virtuel de sleep_async() pendant un travail hors de la boucle, comme un appel exécuté
+        dans un exécuteur : les tâches endormies ne sont pas réveillées avant que le travail ne se termine.
+
+        Utilisation:
+            >>> with clock.hold():
+            ...     await loop.run_in_executor(None, robot.read_distance_sensor)
+        """
+        self.__holds += 1
+        try:
+            yield self
+        finally:
+            self.__holds -= 1
+            self.__activity += 1
+            if self.__loop is not None and not self.__loop.is_closed():
+                self.__drive_soon(self.__loop)
+
+    def __drive_soon(self, loop) -> None:
+        """
+        Programme un passage du pilote des tâches endormies sur la boucle, s'il n'y en a pas déjà un.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): La boucle des tâches endormies.
+
+        Utilisation:
+            >>> self.__drive_soon(asyncio.get_running_loop())
+        """
+        self.__loop = loop
+        if not self.__driving:
+            self.__driving = True
+            loop.call_soon(self.__drive)
+
+    def __drive(self) -> None:
+        """
+        Pilote des tâches endormies. Tant que des tâches s'endorment ou se réveillent, il repasse après elles
+        sur la boucle ; après un passage sans activité, il fait avancer le temps virtuel jusqu'à l'échéance la
+        plus proche et réveille toutes les tâches dont l'échéance est atteinte.
+
+        Utilisation:
+            >>> loop.call_soon(self.__drive)
+        """
+        self.__driving = False
+        sleepers = self.__sleepers
+        if self.__holds or not sleepers:
+            return
+        if self.__activity != self.__seen:
+            self.__seen = self.__activity
+            self.__drive_soon(self.__loop)
+            return
+        self.advance_to(sleepers[0][0])
+        while sleepers and sleepers[0][0] <= self.__now:
+            heapq.heappop(sleepers)[2].set()
+        self.__activity += 1
+        self.__drive_soon(self.__loop)
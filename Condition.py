@@ -1,10 +1,19 @@
 from State import State, MonitoredState
+from enum import Enum, auto
 from abc import abstractmethod
 from Transition import Transition
-from typing import List, TYPE_CHECKING
+from typing import Any, Callable, List, Optional, TYPE_CHECKING
+from Clock import Clock
+from RateStatistics import RateStatistics
+from Profiler import Profiler
+from Tick import Tick
+from LayoutRuntime import DetachedRuntime, LayoutRuntime
+from weakref import WeakKeyDictionary
 from time import perf_counter
 if TYPE_CHECKING:
+    from BatchEngine import BatchEngine
     from Robot import Robot
+    from TimerWheel import TimerWheel
 
 class Condition:
     """
@@ -18,7 +27,37 @@ class Condition:
     Méthodes:
         _compare(): Méthode abstraite qui doit être implémentée pour comparer la condition.
         __bool__(): Permet à l'objet Condition de se comporter comme un booléen en fonction du résultat de _compare().
+        next_deadline(): Obtient la prochaine échéance d'une condition temporelle.
+        _bind_clock(): Lie la condition à une horloge.
+        _vectorize(): Construit l'évaluation de la condition sur toutes les instances d'un BatchEngine.
+        _cache_key(): Obtient la clé partagée par les conditions identiques, pour le cache de tick.
+
+    Propriétés:
+        event_sources: Les sources d'événements dont dépend la condition.
+        clock: L'horloge de la condition.
+        rate: La fréquence maximale d'évaluation de la condition.
+        rate_statistics: La cadence effective des évaluations, si une fréquence est déclarée.
+        tick_cached: Indique si le résultat de la condition est partagé pendant un tick avec les conditions identiques.
+
+    Classes:
+        EventSource (Enum): Les sources d'événements pouvant déclencher la réévaluation d'une condition.
     """
+
+    __slots__ = ('__inverse', '_clock', '__rate_period', '__rate_statistics', '__next_evaluation', '__last_result', '__tick_cached')
+
+    class EventSource(Enum):
+        """
+        Représente les sources d'événements pouvant déclencher la réévaluation d'une condition
+        dans le mode événementiel de FiniteStateMachine.
+
+        Utilisation:
+            >>> source = Condition.EventSource.REMOTE_KEY
+        """
+        REMOTE_KEY = auto()
+        DISTANCE_SAMPLE = auto()
+        TIMER = auto()
+        CUSTOM_VALUE = auto()
+
     def __init__(self, inverse: bool = False) -> None:
         """
         Initialise la condition.
@@ -35,6 +74,37 @@ class Condition:
         if not isinstance(inverse, bool):
             raise TypeError("inverse must be of type bool")
         self.__inverse: bool = inverse
+        self._clock: Clock = Clock.system()
+        self.__rate_period: Optional[float] = None
+        self.__rate_statistics: Optional[RateStatistics] = None
+        self.__next_evaluation: float = float('-inf')
+        self.__last_result: bool = False
+        self.__tick_cached: bool = False
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Obtient l'horloge de la condition, liée par la machine à états finis qui la contient.
+
+        Renvoie:
+            Clock: L'horloge de la condition. Par défaut, Clock.system().
+
+        Utilisation:
+            >>> clock = condition.clock
+        """
+        return self._clock
+
+    def _bind_clock(self, clock: Clock) -> None:
+        """
+        Lie la condition à une horloge.
+
+        Args:
+            clock (Clock): L'horloge à utiliser.
+
+        Utilisation:
+            >>> condition._bind_clock(VirtualClock())
+        """
+        self._clock = clock
 
     @abstractmethod
     def _compare(self) -> bool:
@@ -46,18 +116,253 @@ class Condition:
         """
         pass
 
+    @property
+    def rate(self) -> Optional[float]:
+        """
+        Obtient la fréquence maximale d'évaluation de la condition.
+
+        Renvoie:
+            Optional[float]: La fréquence, en Hz, None si la condition est évaluée à chaque tick.
+
+        Utilisation:
+            >>> rate = condition.rate
+        """
+        return None if self.__rate_period is None else 1. / self.__rate_period
+
+    @rate.setter
+    def rate(self, rate: Optional[float]) -> None:
+        """
+        Déclare la fréquence maximale d'évaluation de la condition. Entre deux évaluations, la condition renvoie
+        son dernier résultat : une lecture matérielle lente (télécommande, télémètre) n'est ainsi pas répétée à
+        chaque tick de la machine.
+
+        Args:
+            rate (Optional[float]): La fréquence, en Hz, None pour évaluer la condition à chaque tick.
+
+        Raises:
+            ValueError: Si la fréquence n'est pas positive.
+
+        Utilisation:
+            >>> condition.rate = 20.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.__next_evaluation = float('-inf')
+        if rate is None:
+            self.__rate_period = None
+            self.__rate_statistics = None
+        else:
+            self.__rate_period = 1. / rate
+            self.__rate_statistics = RateStatistics(self.__rate_period)
+
+    @property
+    def rate_statistics(self) -> Optional[RateStatistics]:
+        """
+        Obtient la cadence effective des évaluations de la condition.
+
+        Renvoie:
+            Optional[RateStatistics]: Les mesures, None si aucune fréquence n'est déclarée.
+
+        Utilisation:
+            >>> condition.rate_statistics.rate
+        """
+        return self.__rate_statistics
+
+    __tick_cache: dict = {}
+    __cache_tick: Optional[int] = None
+
+    @property
+    def tick_cached(self) -> bool:
+        """
+        Indique si le résultat de la condition est mis en cache pour le tick en cours (voir Tick).
+
+        Returns:
+            bool: True si la condition partage son résultat avec les conditions de même clé (voir _cache_key()).
+
+        Utilisation:
+            >>> cached = condition.tick_cached
+        """
+        return self.__tick_cached
+
+    @tick_cached.setter
+    def tick_cached(self, tick_cached: bool) -> None:
+        """
+        Marque la condition comme constante pendant un tick. Les conditions marquées qui partagent la même clé
+        (classe, paramètres et source, voir _cache_key()) ne sont alors évaluées qu'une fois par tick : les
+        suivantes relisent le résultat, avant inversion. Le cache est vidé à l'ouverture de chaque tick ; hors
+        d'un tick, la condition est toujours évaluée.
+
+        Args:
+            tick_cached (bool): True pour mettre le résultat en cache.
+
+        Raises:
+            TypeError: tick_cached doit être de type bool.
+            ValueError: La condition n'a pas de clé de cache.
+
+        Utilisation:
+            >>> condition.tick_cached = True
+        """
+        if not isinstance(tick_cached, bool):
+            raise TypeError("tick_cached must be of type bool")
+        if tick_cached and self._cache_key() is None:
+            raise ValueError("condition has no cache key")
+        self.__tick_cached = tick_cached
+
+    def _cache_key(self) -> Optional[tuple]:
+        """
+        Obtient la clé qui identifie le résultat de la condition pendant un tick : deux conditions de même clé
+        doivent renvoyer le même résultat de _compare() pendant un tick. À redéfinir par les conditions qui
+        lisent une source partagée, comme le matériel du robot.
+
+        Returns:
+            Optional[tuple]: La clé, None si le résultat ne peut pas être partagé.
+
+        Utilisation:
+            >>> key = condition._cache_key()
+        """
+        return None
+
+    def __cached_compare(self) -> bool:
+        """
+        Compare la condition mise en cache, en relisant le résultat du tick en cours s'il existe.
+
+        Returns:
+            bool: Le résultat de _compare(), avant inversion.
+
+        Utilisation:
+            >>> result = self.__cached_compare()
+        """
+        tick = Tick.current()
+        if tick is None:
+            return bool(self._compare())
+        cache = Condition.__tick_cache
+        if tick != Condition.__cache_tick:
+            cache.clear()
+            Condition.__cache_tick = tick
+        key = self._cache_key()
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = bool(self._compare())
+        return result
+
     def __bool__(self) -> bool:
         """
         Évalue la condition en utilisant la méthode _compare et inverse le résultat si nécessaire.
 
+        Si une fréquence est déclarée (voir rate), la condition n'est réévaluée qu'une fois sa période écoulée.
+        Si un Profiler est actif, l'évaluation est mesurée.
+
         Renvoie:
             bool: Le résultat final de la condition, potentiellement inversé.
 
         Utilisation:
             >>> bool(condition)
         """
+        profiler = Profiler.active
+        if profiler is not None:
+            start = perf_counter()
+            result = self.__evaluate()
+            profiler._record(self, Profiler.Kind.CONDITION, start)
+            return result
+        return self.__evaluate()
+
+    def __evaluate(self) -> bool:
+        """
+        Évalue la condition, en respectant sa fréquence déclarée, et inverse le résultat si nécessaire.
+
+        Renvoie:
+            bool: Le résultat final de la condition, potentiellement inversé.
+
+        Utilisation:
+            >>> self.__evaluate()
+        """
+        if self.__rate_period is not None:
+            now = self._clock.now()
+            if now < self.__next_evaluation:
+                return self.__last_result
+            next_evaluation = self.__next_evaluation + self.__rate_period
+            self.__next_evaluation = next_evaluation if next_evaluation > now else now + self.__rate_period
+            self.__rate_statistics.record(now)
+            if self.__tick_cached:
+                self.__last_result = self.__cached_compare() != self.__inverse
+            else:
+                self.__last_result = bool(self._compare()) if not self.__inverse else not self._compare()
+            return self.__last_result
+        if self.__tick_cached:
+            return self.__cached_compare() != self.__inverse
         return self._compare() if not self.__inverse else not self._compare()
 
+    def next_deadline(self, now: float) -> Optional[float]:
+        """
+        Obtient le prochain instant (dans le temps de son horloge) auquel la condition peut changer de valeur d'elle-même.
+
+        Les conditions qui ne dépendent pas du temps renvoient None : elles doivent être sondées.
+
+        Args:
+            now (float): L'instant courant. Seules les échéances strictement futures sont retournées.
+
+        Renvoie:
+            Optional[float]: La prochaine échéance de la condition, None si aucune.
+
+        Utilisation:
+            >>> condition.next_deadline(condition.clock.now())
+        """
+        return None
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements dont dépend la condition.
+
+        Renvoie:
+            Optional[frozenset]: Les sources d'événements (Condition.EventSource), un ensemble vide si la condition
+            ne change jamais d'elle-même, None si la condition doit être évaluée à chaque tick.
+
+        Utilisation:
+            >>> condition.event_sources
+        """
+        return None
+
+    def _vectorize(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Construit l'évaluation de la condition sur toutes les instances d'un BatchEngine, inversée si nécessaire.
+
+        Args:
+            engine (BatchEngine): Le moteur dont les tableaux sont lus.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie un masque booléen NumPy (une valeur par instance), ou un
+            booléen qui vaut pour toutes les instances.
+
+        Raises:
+            ValueError: Si la condition dépend de l'instance et ne peut pas être vectorisée.
+
+        Utilisation:
+            >>> mask = condition._vectorize(engine)()
+        """
+        compare = self._compare_batch(engine)
+        if self.__inverse:
+            return lambda: compare() ^ True
+        return compare
+
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Construit l'évaluation, non inversée, de la condition sur toutes les instances d'un BatchEngine.
+
+        Par défaut, la condition ne dépend pas de l'instance : elle est évaluée une fois par pas et son résultat
+        vaut pour toutes les instances.
+
+        Args:
+            engine (BatchEngine): Le moteur dont les tableaux sont lus.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie un masque booléen NumPy ou un booléen.
+
+        Utilisation:
+            >>> compare = condition._compare_batch(engine)
+        """
+        return lambda: bool(self._compare())
+
 class ConditionalTransition(Transition):
     """
     Représente une transition conditionnelle entre deux états.
@@ -72,6 +377,9 @@ class ConditionalTransition(Transition):
     Méthodes:
         is_transiting(): Évalue la condition pour déterminer si la transition doit avoir lieu.
     """
+
+    __slots__ = ('__condition',)
+
     def __init__(self, next_state: State, condition: Condition = None) -> None:
         """
         Initialise la transition conditionnelle.
@@ -165,6 +473,8 @@ class ManyConditions(Condition):
         add_conditions(): Ajoute plusieurs conditions à la collection.
     """
 
+    __slots__ = ('_conditions',)
+
     def __init__(self, inverse: bool = False) -> None:
         """
         Initialise la collection de conditions.
@@ -193,8 +503,23 @@ class ManyConditions(Condition):
         """
         if not isinstance(condition, Condition):
             raise TypeError("condition must be of type Condition")
+        condition._bind_clock(self._clock)
         self._conditions.append(condition)
 
+    def _bind_clock(self, clock: Clock) -> None:
+        """
+        Lie la collection et chacune de ses conditions à une horloge.
+
+        Args:
+            clock (Clock): L'horloge à utiliser.
+
+        Utilisation:
+            >>> many_conditions._bind_clock(VirtualClock())
+        """
+        super()._bind_clock(clock)
+        for condition in self._conditions:
+            condition._bind_clock(clock)
+
     def add_conditions(self, conditions: List[Condition]) -> None:
         """
         Ajoute plusieurs conditions à la collection.
@@ -213,6 +538,56 @@ class ManyConditions(Condition):
                 raise TypeError("condition must be of type Condition")
             self.add_condition(condition)
 
+    def next_deadline(self, now: float) -> Optional[float]:
+        """
+        Obtient la plus proche échéance parmi les conditions de la collection.
+
+        Args:
+            now (float): L'instant courant.
+
+        Renvoie:
+            Optional[float]: La plus proche échéance future, None si aucune condition n'est temporelle.
+
+        Utilisation:
+            >>> many_conditions.next_deadline(many_conditions.clock.now())
+        """
+        deadlines = [deadline for deadline in (condition.next_deadline(now) for condition in self._conditions) if deadline is not None]
+        return min(deadlines) if deadlines else None
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient l'union des sources d'événements des conditions de la collection.
+
+        Renvoie:
+            Optional[frozenset]: Les sources d'événements, None si l'une des conditions doit être évaluée à chaque tick.
+
+        Utilisation:
+            >>> many_conditions.event_sources
+        """
+        sources = frozenset()
+        for condition in self._conditions:
+            condition_sources = condition.event_sources
+            if condition_sources is None:
+                return None
+            sources |= condition_sources
+        return sources
+
+    def _vectorize_conditions(self, engine: 'BatchEngine') -> List[Callable[[], Any]]:
+        """
+        Construit l'évaluation vectorisée de chacune des conditions de la collection.
+
+        Args:
+            engine (BatchEngine): Le moteur dont les tableaux sont lus.
+
+        Renvoie:
+            List[Callable[[], Any]]: Les évaluations, dans l'ordre des conditions.
+
+        Utilisation:
+            >>> compares = many_conditions._vectorize_conditions(engine)
+        """
+        return [condition._vectorize(engine) for condition in self._conditions]
+
 class AllConditions(ManyConditions):
     """
     Représente un ensemble de conditions qui s'évalue à True si toutes les conditions sont vraies.
@@ -223,6 +598,8 @@ class AllConditions(ManyConditions):
         _compare(): Compare toutes les conditions et renvoie True si toutes les conditions sont vraies, False sinon.
     """
 
+    __slots__ = ()
+
     def __init__(self, inverse: bool = False) -> None:
         """
         Initialise l'ensemble de conditions.
@@ -246,6 +623,24 @@ class AllConditions(ManyConditions):
             >>> all_conditions._compare()
         """
         return all(condition for condition in self._conditions)
+
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Combine les évaluations vectorisées des conditions par un « et » logique.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie le masque des instances pour lesquelles toutes les conditions sont vraies.
+
+        Utilisation:
+            >>> compare = all_conditions._compare_batch(engine)
+        """
+        compares = self._vectorize_conditions(engine)
+        def compare():
+            result = True
+            for condition in compares:
+                result = result & condition()
+            return result
+        return compare
     
 class AnyConditions(ManyConditions):
     """
@@ -257,6 +652,8 @@ class AnyConditions(ManyConditions):
         _compare(): Évalue les conditions en utilisant l'opérateur 'any' et renvoie le résultat.
     """
 
+    __slots__ = ()
+
     def __init__(self, inverse: bool = False) -> None:
         """
         Initialise l'ensemble de conditions.
@@ -280,6 +677,24 @@ class AnyConditions(ManyConditions):
             >>> any_conditions._compare()
         """
         return any(condition for condition in self._conditions)
+
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Combine les évaluations vectorisées des conditions par un « ou » logique.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie le masque des instances pour lesquelles l'une des conditions est vraie.
+
+        Utilisation:
+            >>> compare = any_conditions._compare_batch(engine)
+        """
+        compares = self._vectorize_conditions(engine)
+        def compare():
+            result = False
+            for condition in compares:
+                result = result | condition()
+            return result
+        return compare
     
 class NoneConditions(ManyConditions):
     """
@@ -291,6 +706,8 @@ class NoneConditions(ManyConditions):
         _compare(): Compare les conditions et renvoie True si aucune des conditions n'est vraie.
     """
 
+    __slots__ = ()
+
     def __init__(self, inverse: bool = False) -> None:
         """
         Initialise l'ensemble de conditions.
@@ -315,6 +732,24 @@ class NoneConditions(ManyConditions):
         """
         return not any(condition for condition in self._conditions)
 
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Combine les évaluations vectorisées des conditions : aucune ne doit être vraie.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie le masque des instances pour lesquelles aucune condition n'est vraie.
+
+        Utilisation:
+            >>> compare = none_conditions._compare_batch(engine)
+        """
+        compares = self._vectorize_conditions(engine)
+        def compare():
+            result = False
+            for condition in compares:
+                result = result | condition()
+            return result ^ True
+        return compare
+
 class MonitoredStateCondition(Condition):
     """
     Une condition basée sur l'état surveillé.
@@ -331,6 +766,8 @@ class MonitoredStateCondition(Condition):
         _compare(): Méthode abstraite qui doit être implémentée pour comparer la condition.
     """
 
+    __slots__ = ('_monitored_state',)
+
     def __init__(self, monitored_state: MonitoredState, inverse: bool = False) -> None:
         """
         Initialise la condition basée sur l'état surveillé.
@@ -384,6 +821,15 @@ class MonitoredStateCondition(Condition):
             raise TypeError("monitored_state must be of type MonitoredState")
         self._monitored_state: MonitoredState = monitored_state
 
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Une condition sur l'état surveillé dépend de l'instance : les sous-classes vectorisables la redéfinissent.
+
+        Raises:
+            ValueError: La condition ne peut pas être vectorisée.
+        """
+        raise ValueError(f"{type(self).__name__} cannot be vectorised")
+
 class StateEntryDurationCondition(MonitoredStateCondition):
     """
     Représente une condition basée sur la durée de la dernière entrée d'un état surveillé.
@@ -395,25 +841,126 @@ class StateEntryDurationCondition(MonitoredStateCondition):
         _compare(): Compare la durée de la dernière entrée de l'état surveillé avec le seuil.
     """
 
-    def __init__(self, duration: float, monitored_state: MonitoredState, inverse: bool = False) -> None:
+    __slots__ = ('_duration', '__timer_wheel', '__timers')
+
+    def __init__(self, duration: float, monitored_state: MonitoredState, inverse: bool = False, timer_wheel: Optional['TimerWheel'] = None) -> None:
         """
         Initialise la condition basée sur la durée de la dernière entrée de l'état surveillé.
 
+        Avec une TimerWheel, l'échéance est enregistrée à chaque entrée dans l'état surveillé, pour réveiller
+        la boucle de start(), et l'évaluation compare la durée à l'instant de la roue, lu une fois par tick.
+        La condition ne conserve aucun résultat et garde une échéance par enregistrement d'exécution : elle peut
+        être partagée par les machines d'un même layout.
+
         Args:
             duration (float): Le seuil de durée.
             monitored_state (MonitoredState): L'objet d'état surveillé.
             inverse (bool, optionnel): Si True, le résultat de la condition est inversé. Par défaut, False.
+            timer_wheel (TimerWheel, optionnel): La roue qui suit l'échéance. Par défaut, None (lecture de l'horloge à chaque évaluation).
 
         Raises:
             ValueError: Si la durée est négative.
 
         Utilisation:
             >>> condition = StateEntryDurationCondition(duration=1.0, monitored_state=monitored_state)
+            >>> condition = StateEntryDurationCondition(duration=1.0, monitored_state=monitored_state, timer_wheel=TimerWheel.shared())
         """
         super().__init__(monitored_state, inverse)
         if duration < 0:
             raise ValueError("duration must be positive")
         self._duration: float = duration
+        self.__timer_wheel: Optional['TimerWheel'] = timer_wheel
+        self.__timers: WeakKeyDictionary = WeakKeyDictionary()
+        if timer_wheel is not None:
+            monitored_state._add_entry_listener(self.__arm)
+            self.__arm()
+
+    @property
+    def timer_wheel(self) -> Optional['TimerWheel']:
+        """
+        Obtient la roue qui suit l'échéance de la condition.
+
+        Renvoie:
+            Optional[TimerWheel]: La roue, None si la condition lit l'horloge à chaque évaluation.
+
+        Utilisation:
+            >>> wheel = condition.timer_wheel
+        """
+        return self.__timer_wheel
+
+    @MonitoredStateCondition.monitored_state.setter
+    def monitored_state(self, monitored_state: MonitoredState) -> None:
+        """
+        Définir l'objet d'état surveillé, et y déplacer l'échéance suivie par la roue.
+
+        Args:
+            monitored_state (MonitoredState): Le nouvel objet d'état surveillé.
+
+        Raises:
+            TypeError: Si l'objet n'est pas de type MonitoredState.
+
+        Utilisation:
+            >>> condition.monitored_state = monitored_state
+        """
+        previous = self._monitored_state
+        MonitoredStateCondition.monitored_state.fset(self, monitored_state)
+        if self.__timer_wheel is not None:
+            previous._remove_entry_listener(self.__arm)
+            monitored_state._add_entry_listener(self.__arm)
+            self.__disarm()
+            self.__arm()
+
+    def _bind_clock(self, clock: Clock) -> None:
+        """
+        Lie la condition à une horloge. Une condition adossée à une roue passe à la roue de la nouvelle horloge.
+
+        Args:
+            clock (Clock): L'horloge à utiliser.
+
+        Utilisation:
+            >>> condition._bind_clock(VirtualClock())
+        """
+        changed = clock is not self._clock
+        super()._bind_clock(clock)
+        if changed and self.__timer_wheel is not None:
+            runtimes = list(self.__timers.keys())
+            self.__disarm()
+            self.__timer_wheel = clock.timer_wheel
+            for runtime in runtimes:
+                self.__arm(runtime)
+            self.__arm()
+
+    def __arm(self, runtime: Optional[LayoutRuntime] = None) -> None:
+        """
+        Enregistre dans la roue l'échéance de la dernière entrée pour un enregistrement d'exécution, en remplaçant
+        la précédente de cet enregistrement : les machines qui partagent le layout gardent chacune leur échéance.
+
+        Args:
+            runtime (LayoutRuntime, optionnel): L'enregistrement. Par défaut, celui où l'état lit en ce moment ;
+                sans effet hors du suivi d'un layout partagé.
+
+        Utilisation:
+            >>> self.__arm()
+        """
+        state = self._monitored_state
+        runtime = state._runtime if runtime is None else runtime
+        if isinstance(runtime, DetachedRuntime):
+            return
+        timer = self.__timers.get(runtime)
+        if timer is not None:
+            timer.cancel()
+        self.__timers[runtime] = self.__timer_wheel.schedule(state._last_entry_time_in(runtime) + self._duration)
+
+    def __disarm(self) -> None:
+        """
+        Annule les échéances de tous les enregistrements d'exécution.
+
+        Utilisation:
+            >>> self.__disarm()
+        """
+        for timer in self.__timers.values():
+            timer.cancel()
+        self.__timers.clear()
 
     @property
     def duration(self) -> float:
@@ -445,6 +992,10 @@ class StateEntryDurationCondition(MonitoredStateCondition):
         if duration < 0:
             raise ValueError("duration must be positive")
         self._duration: float = duration
+        if self.__timer_wheel is not None:
+            for runtime in list(self.__timers.keys()):
+                self.__arm(runtime)
+            self.__arm()
 
     def _compare(self) -> bool:
         """
@@ -456,8 +1007,52 @@ class StateEntryDurationCondition(MonitoredStateCondition):
         Utilisation:
             >>> condition._compare()
         """
+        if self.__timer_wheel is not None:
+            return self.__timer_wheel.now - self.monitored_state.last_entry_time >= self.duration
+        return self._clock.now() - self.monitored_state.last_entry_time >= self.duration
+
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Compare, pour chaque instance, la durée depuis la dernière entrée de l'état surveillé avec le seuil,
+        à l'instant du pas courant.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie le masque des instances dont la durée atteint le seuil.
+
+        Utilisation:
+            >>> compare = condition._compare_batch(engine)
+        """
+        last_entry_times = engine.last_entry_times[:, engine.layout.index_of(self._monitored_state)]
+        return lambda: engine.now - last_entry_times >= self._duration
+
+    def next_deadline(self, now: float) -> Optional[float]:
+        """
+        Obtient l'instant auquel la durée depuis la dernière entrée de l'état surveillé atteint le seuil.
+
+        Args:
+            now (float): L'instant courant.
+
+        Renvoie:
+            Optional[float]: L'échéance si elle est future, None sinon.
+
+        Utilisation:
+            >>> condition.next_deadline(condition.clock.now())
+        """
+        deadline = self.monitored_state.last_entry_time + self.duration
+        return deadline if deadline > now else None
 
-        return perf_counter() - self.monitored_state.last_entry_time >= self.duration
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements de la condition : l'expiration d'une échéance.
+
+        Renvoie:
+            Optional[frozenset]: {Condition.EventSource.TIMER}
+
+        Utilisation:
+            >>> condition.event_sources
+        """
+        return frozenset({Condition.EventSource.TIMER})
         
     
 class StateEntryCountCondition(MonitoredStateCondition):
@@ -472,6 +1067,8 @@ class StateEntryCountCondition(MonitoredStateCondition):
         reset_count(): Réinitialise le nombre de référence au nombre d'entrées actuel.
     """
 
+    __slots__ = ('__expected_count', '__auto_reset', '__ref_count')
+
     def __init__(self, expected_count: int, monitored_state: MonitoredState, auto_reset: bool, inverse: bool = False) -> None:
         """
         Initialise la condition basée sur le nombre d'entrées d'un état surveillé.
@@ -537,6 +1134,20 @@ class StateEntryCountCondition(MonitoredStateCondition):
             >>> condition._compare()
         """
         return self._monitored_state.entry_count - self.__ref_count >= self.__expected_count
+
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Compare, pour chaque instance, le nombre d'entrées de l'état surveillé avec le nombre attendu. Le nombre
+        de référence, porté par la condition, est commun à toutes les instances.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie le masque des instances qui atteignent le nombre attendu.
+
+        Utilisation:
+            >>> compare = condition._compare_batch(engine)
+        """
+        entry_counts = engine.entry_counts[:, engine.layout.index_of(self._monitored_state)]
+        return lambda: entry_counts - self.__ref_count >= self.__expected_count
     
     def reset_count(self) -> None:
         """
@@ -559,6 +1170,8 @@ class StateValueCondition(MonitoredStateCondition):
         _compare(): Compare la valeur personnalisée de l'état surveillé avec la valeur attendue.
     """
 
+    __slots__ = ('__expected_value',)
+
     def __init__(self, expected_value: any, monitored_state: MonitoredState, inverse: bool = False) -> None:
         """
         Initialise la condition basée sur la valeur personnalisée de l'état surveillé.
@@ -611,6 +1224,41 @@ class StateValueCondition(MonitoredStateCondition):
             >>> condition._compare()
         """
         return self._monitored_state.custom_value == self.__expected_value
+
+    def _compare_batch(self, engine: 'BatchEngine') -> Callable[[], Any]:
+        """
+        Compare, pour chaque instance, la valeur personnalisée de l'état surveillé avec la valeur attendue.
+
+        Une valeur attendue scalaire est comparée à toute la colonne d'un coup. Une autre valeur, comme une liste,
+        est comparée instance par instance : NumPy la diffuserait élément par élément sur la colonne.
+
+        Renvoie:
+            Callable[[], Any]: Une fonction qui renvoie le masque des instances dont la valeur est égale.
+
+        Utilisation:
+            >>> compare = condition._compare_batch(engine)
+        """
+        import numpy as np
+        custom_values = engine.custom_values[:, engine.layout.index_of(self._monitored_state)]
+        def compare():
+            expected = self.__expected_value
+            if expected is None or isinstance(expected, (bool, int, float, complex, str, bytes, Enum)):
+                return custom_values == expected
+            return np.fromiter((bool(value == expected) for value in custom_values), dtype=bool, count=len(custom_values))
+        return compare
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements de la condition : la modification d'une valeur personnalisée.
+
+        Renvoie:
+            Optional[frozenset]: {Condition.EventSource.CUSTOM_VALUE}
+
+        Utilisation:
+            >>> condition.event_sources
+        """
+        return frozenset({Condition.EventSource.CUSTOM_VALUE})
     
 class AlwaysTrueCondition(Condition):
     """
@@ -620,6 +1268,8 @@ class AlwaysTrueCondition(Condition):
         _compare(): Évalue la condition.
     """
 
+    __slots__ = ()
+
     def __init__(self, inverse: bool = False) -> None:
         """
         Initialise la condition qui évalue toujours à True.
@@ -644,6 +1294,19 @@ class AlwaysTrueCondition(Condition):
         """
         return True
 
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements de la condition : aucune, la condition est constante.
+
+        Renvoie :
+            Optional[frozenset]: Un ensemble vide.
+
+        Utilisation :
+            >>> condition.event_sources
+        """
+        return frozenset()
+
 class ValueCondition(Condition):
     """
     Une condition basée sur une valeur.
@@ -658,6 +1321,8 @@ class ValueCondition(Condition):
         _compare(): Compare la valeur à la valeur attendue.
     """
 
+    __slots__ = ('__value', '__expected_value')
+
     def __init__(self, value: any, expected_value: any, inverse: bool = False) -> None:
         """
         Initialise la condition basée sur une valeur.
@@ -686,6 +1351,19 @@ class ValueCondition(Condition):
         """
         return self.__value == self.__expected_value
 
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements de la condition : aucune, les valeurs comparées sont fixées à la construction.
+
+        Return :
+            Optional[frozenset]: Un ensemble vide.
+
+        Utilisation :
+            >>> condition.event_sources
+        """
+        return frozenset()
+
 
 class TimedCondition(Condition):
     """
@@ -704,7 +1382,9 @@ class TimedCondition(Condition):
         duration (float): La durée après laquelle la condition devient True.
     """
 
-    def __init__(self, duration: float = 1., time_reference: float = None, inverse: bool = False) -> None:
+    __slots__ = ('__duration', '__time_reference', '__counter_duration', '__expired', '__timer_wheel', '__timer')
+
+    def __init__(self, duration: float = 1., time_reference: float = None, inverse: bool = False, timer_wheel: Optional['TimerWheel'] = None) -> None:
         """
         Initialise la condition temporelle.
 
@@ -712,6 +1392,7 @@ class TimedCondition(Condition):
             duration (float, facultatif): La durée après laquelle la condition devient True. Par défaut à 1.
             time_reference (float, facultatif): Le point de référence temporel pour le début du comptage. Par défaut à None.
             inverse (bool, facultatif): Inverse le résultat de la condition. Par défaut à False.
+            timer_wheel (TimerWheel, facultatif): La roue qui suit l'échéance, évaluée alors par simple lecture d'un indicateur. Par défaut à None.
 
         Raises :
             ValueError: Si la durée est négative.   
@@ -725,6 +1406,10 @@ class TimedCondition(Condition):
         self.__duration: float = duration
         self.__counter_duration: float = 0
         self.__time_reference: float = time_reference
+        self.__timer_wheel: Optional['TimerWheel'] = timer_wheel
+        self.__timer = None
+        self.__expired: bool = False
+        self.__arm()
 
     @property
     def duration(self) -> float:
@@ -756,6 +1441,20 @@ class TimedCondition(Condition):
         if duration < 0:
             raise ValueError("duration must be positive")
         self.__duration: float = duration
+        self.__arm()
+
+    @property
+    def timer_wheel(self) -> Optional['TimerWheel']:
+        """
+        Obtient la roue qui suit l'échéance de la condition.
+
+        Return :
+            Optional[TimerWheel]: La roue, None si la condition lit l'horloge à chaque évaluation.
+
+        Utilisation :
+            >>> wheel = condition.timer_wheel
+        """
+        return self.__timer_wheel
 
     def reset(self) -> None:
         """
@@ -766,6 +1465,48 @@ class TimedCondition(Condition):
         """
         self.__counter_duration: float = 0
         self.__time_reference: float = 0
+        self.__arm()
+
+    def _bind_clock(self, clock: Clock) -> None:
+        """
+        Lie la condition à une horloge. Une condition adossée à une roue passe à la roue de la nouvelle horloge.
+
+        Args :
+            clock (Clock): L'horloge à utiliser.
+
+        Utilisation :
+            >>> condition._bind_clock(VirtualClock())
+        """
+        changed = clock is not self._clock
+        super()._bind_clock(clock)
+        if changed and self.__timer_wheel is not None:
+            self.__timer_wheel = clock.timer_wheel
+            self.__arm()
+
+    def __arm(self) -> None:
+        """
+        Enregistre l'échéance dans la roue, en remplaçant la précédente. Sans effet sans roue ou sans référence.
+
+        Utilisation :
+            >>> self.__arm()
+        """
+        if self.__timer_wheel is None:
+            return
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        self.__expired = False
+        if self.__time_reference is not None:
+            self.__timer = self.__timer_wheel.schedule(self.__time_reference + self.__duration, self.__expire)
+
+    def __expire(self) -> None:
+        """
+        Marque l'échéance comme atteinte. Appelée par la roue.
+
+        Utilisation :
+            >>> self.__expire()
+        """
+        self.__expired = True
 
     def _compare(self) -> bool:
         """
@@ -777,10 +1518,45 @@ class TimedCondition(Condition):
         Utilisation :
             >>> condition._compare()
         """
-        self.__counter_duration = perf_counter() - self.__time_reference
+        if self.__timer is not None:
+            return self.__expired
+        self.__counter_duration = self._clock.now() - self.__time_reference
         return self.__counter_duration >= self.__duration
+
+    def next_deadline(self, now: float) -> Optional[float]:
+        """
+        Obtient l'instant auquel la durée spécifiée sera écoulée depuis le point de référence temporel.
+
+        Args:
+            now (float): L'instant courant.
+
+        Return :
+            Optional[float]: L'échéance si elle est future, None sinon.
+
+        Utilisation :
+            >>> condition.next_deadline(condition.clock.now())
+        """
+        if self.__time_reference is None:
+            return None
+        deadline = self.__time_reference + self.__duration
+        return deadline if deadline > now else None
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements de la condition : l'expiration d'une échéance.
+
+        Return :
+            Optional[frozenset]: {Condition.EventSource.TIMER}
+
+        Utilisation :
+            >>> condition.event_sources
+        """
+        return frozenset({Condition.EventSource.TIMER})
     
 class RobotCondition(Condition):
+    __slots__ = ('_robot',)
+
     def __init__(self, robot : 'Robot', inverse: bool = False) -> None:
         from Robot import Robot
         super().__init__(inverse)
@@ -789,18 +1565,52 @@ class RobotCondition(Condition):
         self._robot: Robot = robot
 
 class DistanceSensorCondition(RobotCondition):
-    def __init__(self, robot : 'Robot', inverse: bool = False) -> None:
+    __slots__ = ('__expected_value', '__max_sample_age')
+
+    def __init__(self, robot : 'Robot', inverse: bool = False, max_sample_age: Optional[float] = None) -> None:
         super().__init__(robot, inverse)
         self.__expected_value = True
+        # Samples from the robot's distance sampler older than this are rejected (None accepts any age).
+        self.__max_sample_age = max_sample_age
         
     def _compare(self) -> bool:
-        return self._robot.reached_max_distance() == self.__expected_value
+        return self._robot.reached_max_distance(max_sample_age=self.__max_sample_age) == self.__expected_value
+
+    def _cache_key(self) -> Optional[tuple]:
+        return (DistanceSensorCondition, id(self._robot), self.__max_sample_age, self.__expected_value)
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        return frozenset({Condition.EventSource.DISTANCE_SAMPLE})
 
 class ManualControlCondition(RobotCondition):
+    __slots__ = ('__expected_value', '__read_once')
+
     def __init__(self, robot : 'Robot', expected_value : 'Robot.KeyCodes', read_once: bool= False, inverse: bool = False) -> None:
         super().__init__(robot, inverse)
         self.__expected_value = expected_value
         self.__read_once = read_once
         
     def _compare(self) -> bool:
-        return self._robot.read_input(read_once=self.__read_once) == self.__expected_value
\ No newline at end of file
+        return self._robot.read_input(read_once=self.__read_once) == self.__expected_value
+
+    def _cache_key(self) -> Optional[tuple]:
+        return (ManualControlCondition, id(self._robot), self.__expected_value, self.__read_once)
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        return frozenset({Condition.EventSource.REMOTE_KEY})
+
+class MotionCompleteCondition(RobotCondition):
+    __slots__ = ()
+
+    def __init__(self, robot : 'Robot', inverse: bool = False) -> None:
+        # True once the robot's last non-blocking motion (see Robot.turn_degree_async) is over, or if there is none.
+        super().__init__(robot, inverse)
+
+    def _compare(self) -> bool:
+        motion = self._robot.motion
+        return motion is None or motion.done
+
+    def _cache_key(self) -> Optional[tuple]:
+        return (MotionCompleteCondition, id(self._robot))
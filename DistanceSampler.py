@@ -0,0 +1,192 @@
+import threading
+from typing import Callable, Optional, Tuple
+from Clock import Clock
+
+class DistanceSampler:
+    """
+    Échantillonne un capteur de distance à fréquence fixe sur son propre fil d'exécution.
+
+    Le dernier échantillon et son horodatage (selon l'horloge de l'échantillonneur) sont publiés ensemble dans un seul attribut,
+    remplacé d'un bloc à chaque lecture : les lecteurs n'attendent jamais le capteur ni un verrou.
+
+    Attributs:
+        __read (Callable[[], Optional[int]]): La fonction de lecture du capteur, en millimètres.
+        __period (float): La période d'échantillonnage, en secondes.
+        __on_sample (Callable[[], None]): La fonction appelée après chaque publication.
+        __latest (Optional[Tuple[int, float]]): Le dernier échantillon publié et son horodatage.
+        __clock (Clock): L'horloge des horodatages et de la cadence.
+
+    Méthodes:
+        start() -> None:
+            Démarre le fil d'échantillonnage.
+
+        stop() -> None:
+            Arrête le fil d'échantillonnage.
+
+        sample() -> bool:
+            Effectue une lecture et publie l'échantillon.
+
+        sample_age(now: float = None) -> Optional[float]:
+            Obtient l'âge du dernier échantillon.
+
+    Utilisation:
+        >>> sampler = DistanceSampler(read=distance_sensor.read_mm, rate=20.)
+        >>> sampler.start()
+        >>> distance, timestamp = sampler.latest
+        >>> sampler.stop()
+    """
+
+    def __init__(self, read: Callable[[], Optional[int]], rate: float = 20., on_sample: Optional[Callable[[], None]] = None, clock: Optional[Clock] = None) -> None:
+        """
+        Initialise l'échantillonneur.
+
+        Args:
+            read (Callable[[], Optional[int]]): La fonction de lecture du capteur. Une lecture qui renvoie None n'est pas publiée.
+            rate (float): La fréquence d'échantillonnage, en Hz. Par défaut à 20.
+            on_sample (Callable[[], None], optionnel): La fonction appelée, depuis le fil d'échantillonnage, après chaque publication.
+            clock (Clock, optionnel): L'horloge des horodatages et de la cadence. Par défaut, Clock.system().
+
+        Raises:
+            TypeError: read doit être appelable.
+            ValueError: rate doit être positif.
+
+        Utilisation:
+            >>> sampler = DistanceSampler(read=distance_sensor.read_mm, rate=20.)
+        """
+        if not callable(read):
+            raise TypeError("read must be callable")
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.__read = read
+        self.__period: float = 1. / rate
+        self.__on_sample = on_sample
+        self.__clock = Clock.system() if clock is None else clock
+        self.__latest: Optional[Tuple[int, float]] = None
+        self.__stop_event = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def rate(self) -> float:
+        """
+        Obtient la fréquence d'échantillonnage, en Hz.
+
+        Returns:
+            float: La fréquence d'échantillonnage.
+
+        Utilisation:
+            >>> rate = sampler.rate
+        """
+        return 1. / self.__period
+
+    @property
+    def running(self) -> bool:
+        """
+        Indique si le fil d'échantillonnage est actif.
+
+        Returns:
+            bool: True si le fil d'échantillonnage est actif, False sinon.
+
+        Utilisation:
+            >>> running = sampler.running
+        """
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def latest(self) -> Optional[Tuple[int, float]]:
+        """
+        Obtient le dernier échantillon publié, sans bloquer.
+
+        Returns:
+            Optional[Tuple[int, float]]: La distance en millimètres et son horodatage, None si aucun échantillon n'a été publié.
+
+        Utilisation:
+            >>> distance, timestamp = sampler.latest
+        """
+        return self.__latest
+
+    def sample_age(self, now: float = None) -> Optional[float]:
+        """
+        Obtient l'âge du dernier échantillon publié.
+
+        Args:
+            now (float, optionnel): L'instant de référence. Par défaut, l'instant de l'horloge.
+
+        Returns:
+            Optional[float]: L'âge de l'échantillon en secondes, None si aucun échantillon n'a été publié.
+
+        Utilisation:
+            >>> age = sampler.sample_age()
+        """
+        latest = self.__latest
+        if latest is None:
+            return None
+        return (self.__clock.now() if now is None else now) - latest[1]
+
+    def sample(self) -> bool:
+        """
+        Effectue une lecture du capteur et publie l'échantillon.
+
+        Une lecture en erreur n'est pas publiée : le dernier échantillon vieillit et peut être rejeté par âge.
+
+        Returns:
+            bool: True si un échantillon a été publié, False sinon.
+
+        Utilisation:
+            >>> sampler.sample()
+        """
+        try:
+            value = self.__read()
+        except Exception:
+            return False
+        if value is None:
+            return False
+        self.__latest = (value, self.__clock.now())
+        if self.__on_sample is not None:
+            self.__on_sample()
+        return True
+
+    def start(self) -> None:
+        """
+        Démarre le fil d'échantillonnage. Sans effet s'il est déjà actif.
+
+        Utilisation:
+            >>> sampler.start()
+        """
+        if self.running:
+            return
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.__run, name="DistanceSampler", daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Arrête le fil d'échantillonnage et attend sa fin.
+
+        Args:
+            timeout (float, optionnel): Le délai maximal d'attente, en secondes.
+
+        Utilisation:
+            >>> sampler.stop()
+        """
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def __run(self) -> None:
+        """
+        Boucle du fil d'échantillonnage, cadencée sur des échéances fixes pour ne pas dériver.
+
+        Utilisation:
+            >>> self.__run()
+        """
+        clock = self.__clock
+        next_time = clock.now()
+        while not self.__stop_event.is_set():
+            self.sample()
+            next_time += self.__period
+            delay = next_time - clock.now()
+            if delay < 0:
+                next_time = clock.now()
+                delay = 0
+            clock.wait(self.__stop_event, delay)
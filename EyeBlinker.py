@@ -1,11 +1,11 @@
-from Blinker import SideBlinker
+from Blinker import SideBlinker, Blinker
 from State import MonitoredState
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from Robot import Robot
 
 class EyeBlinker(SideBlinker):
-    def __init__(self, robot: 'Robot'):
+    def __init__(self, robot: 'Robot', blinker_class: type = Blinker):
         self.robot = robot
 
         def off_right_state_generator() -> MonitoredState:
@@ -32,5 +32,7 @@ class EyeBlinker(SideBlinker):
             off_left_state_generator,
             on_left_state_generator,
             off_right_state_generator,
-            on_right_state_generator
+            on_right_state_generator,
+            blinker_class,
+            robot.clock
         )
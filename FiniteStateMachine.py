@@ -1,8 +1,15 @@
+from contextlib import contextmanager
 from enum import Enum, auto
-from Transition import Transition
+from collections import deque
+from Transition import Transition, ConditionalTransition
 from State import State, MonitoredState
-from time import perf_counter
-from typing import List
+from Condition import Condition
+from Tick import Tick
+from TimerWheel import TimerWheel
+from Clock import Clock
+from LayoutRuntime import DetachedRuntime, LayoutRuntime
+from TransitionTrace import TransitionTrace
+from typing import Any, Callable, List, Optional, Tuple
 
 class FiniteStateMachine:
     """
@@ -12,6 +19,8 @@ class FiniteStateMachine:
         __layout (Layout): La disposition de la machine à états finis contenant ses états et son état initial.
         __current_operational_state (OperationalState): L'état opérationnel actuel du FSM.
         __current_applicative_state (State): L'état applicatif actuel du FSM.
+        __runtime (Optional[LayoutRuntime]): L'enregistrement d'exécution de la machine, si le layout est compilé.
+        __trace (Optional[TransitionTrace]): L'historique des transitions de la machine, s'il est activé.
 
     Méthodes:
         __init__(layout: Layout, uninitialized: bool = True) -> None:
@@ -28,9 +37,24 @@ class FiniteStateMachine:
         
         track() -> bool:
             Suit l'état actuel de la machine à états finis et effectue les actions nécessaires en fonction des transitions.
+
+        runtime_scope() -> ContextManager:
+            Expose l'enregistrement d'exécution de la machine aux états de son layout le temps d'un bloc with.
+
+        post_event(source: Condition.EventSource) -> None:
+            Publie un événement dans la file d'événements du mode événementiel.
+
+        add_event_poller(source: Condition.EventSource, poller: Callable[[], Any]) -> None:
+            Ajoute une fonction sondée à chaque tick qui publie un événement quand sa valeur change.
         
-        start(reset: bool = True, time_budget: float = None) -> None:
+        next_deadline(now: float) -> Optional[float]:
+            Obtient la prochaine échéance temporelle des transitions de l'état courant.
+
+        start(reset: bool = True, time_budget: float = None, poll_period: float = None) -> None:
             Démarre la machine à états finis, en la réinitialisant éventuellement et en la faisant fonctionner pendant un budget de temps spécifié.
+
+        run(reset: bool = True, time_budget: float = None, poll_period: float = None) -> None:
+            Coroutine équivalente à start(), qui rend la main à la boucle asyncio entre deux ticks.
         
         stop() -> None:
             Arrête la machine à états finis, en définissant son état opérationnel sur IDLE.
@@ -50,6 +74,9 @@ class FiniteStateMachine:
         Attributs:
             __states (List[State]): La liste des états de la machine à états finis.
             initial_state (State): L'état initial de la machine à états finis.
+            runtime (Optional[LayoutRuntime]): L'enregistrement d'exécution de la machine en cours de suivi, ou de
+                l'unique machine du layout. Un DetachedRuntime hors du suivi quand le layout est partagé par
+                plusieurs machines, None tant que le layout n'est pas compilé.
 
         Méthodes:
             __init__() -> None:
@@ -60,8 +87,28 @@ class FiniteStateMachine:
             
             add_states(states: List[State]) -> None:
                 Ajoute une liste d'états à la liste des états de la machine à états finis.
+
+            add_state_group(name: str, states: List[State]) -> None:
+                Nomme un groupe d'états, auquel une transition globale peut être restreinte.
+
+            add_global_transition(transition: Transition, priority: int = 0, group: str = None) -> None:
+                Ajoute une transition applicable depuis tous les états, ou depuis ceux d'un groupe.
+
+            global_transitions_of(state: State) -> Tuple[Transition, ...]:
+                Obtient les transitions globales applicables depuis un état.
+
+            compile() -> None:
+                Fige les états et construit la table de transitions indexée par état.
+
+            new_runtime() -> LayoutRuntime:
+                Crée un enregistrement d'exécution vierge pour une machine supplémentaire.
+
+            index_of(state: State) -> int:
+                Obtient l'indice d'un état dans la table de transitions.
         """
 
+        TransitionRow = Tuple[Callable[[], bool], int, Transition]
+
         def __init__(self) -> None:
             """
             Initialise la disposition de la machine à états finis.
@@ -73,6 +120,18 @@ class FiniteStateMachine:
             """
             self.__states: List[State] = []
             self.initial_state = None
+            self.__compiled: bool = False
+            self.__indices: dict = {}
+            self.__transition_table: List[Tuple['FiniteStateMachine.Layout.TransitionRow', ...]] = []
+            self.__in_state_actions: List[Callable[[], None]] = []
+            self.__terminals: List[bool] = []
+            self.__custom_values: List[Any] = []
+            self.__compiled_runtime: Optional[LayoutRuntime] = None
+            self.__machines: int = 0
+            self.__groups: dict = {}
+            self.__global_transitions: List[Tuple[int, int, Transition, Optional[str]]] = []
+            self.__globals_by_state: dict = {}
+            self.runtime: Optional[LayoutRuntime] = None
 
         @property
         def initial_state(self) -> State:
@@ -121,9 +180,9 @@ class FiniteStateMachine:
                 >>> valid = layout.valid
             """
             for state in self.__states:
-                if not state.valid:
+                if not state.valid and not (self.global_transitions_of(state) and all(transition.valid for transition in state.transitions)):
                     return False
-            return self.__initial_state is not None
+            return self.__initial_state is not None and all(transition.valid for _, _, transition, _ in self.__global_transitions)
         
         @valid.setter
         def valid(self) -> None:
@@ -145,10 +204,13 @@ class FiniteStateMachine:
             Raises:
                 ValueError: L'état doit être de type State.
                 ValueError: L'état doit être unique.
+                ValueError: Le layout est compilé.
 
             Utilisation:
                 >>> layout.add_state(state)                
             """
+            if self.__compiled:
+                raise ValueError("layout is compiled, states cannot be added")
             if(not isinstance(state, State)):
                 raise ValueError("state must be of type State. Actual type is " + str(type(state)) + ".")
             if state in self.__states:
@@ -171,6 +233,301 @@ class FiniteStateMachine:
             for state in states:
                 self.add_state(state)
 
+        def add_state_group(self, name: str, states) -> None:
+            """
+            Nomme un groupe d'états, auquel une transition globale peut être restreinte (voir add_global_transition()).
+
+            Args:
+                name (str): Le nom du groupe.
+                states (List[State]): Les états du groupe.
+
+            Raises:
+                ValueError: Le layout est compilé.
+                ValueError: Le nom du groupe est déjà utilisé.
+                ValueError: Les états doivent être de type State.
+
+            Utilisation:
+                >>> layout.add_state_group("moving", [forward, backward, left, right])
+            """
+            if self.__compiled:
+                raise ValueError("layout is compiled, groups cannot be added")
+            if name in self.__groups:
+                raise ValueError("group name is already used")
+            states = frozenset(states)
+            if not all(isinstance(state, State) for state in states):
+                raise ValueError("states must be of type State")
+            self.__groups[name] = states
+            self.__globals_by_state.clear()
+
+        def add_global_transition(self, transition: Transition, priority: int = 0, group: str = None) -> None:
+            """
+            Ajoute une transition applicable depuis tous les états du layout, ou depuis ceux d'un groupe, sauf
+            depuis son propre état suivant et depuis les états terminaux.
+
+            Les transitions globales applicables depuis l'état courant sont évaluées avant ses propres transitions,
+            par priorité décroissante puis dans leur ordre d'ajout. Une même condition sert ainsi à tous les
+            états, au lieu d'être dupliquée sur chacun.
+
+            Args:
+                transition (Transition): La transition.
+                priority (int): La priorité de la transition. Par défaut à 0.
+                group (str, optionnel): Le nom du groupe d'états depuis lesquels la transition s'applique.
+                    Par défaut, tous les états.
+
+            Raises:
+                ValueError: Le layout est compilé.
+                ValueError: La transition doit être de type Transition.
+                ValueError: Le groupe n'existe pas.
+
+            Utilisation:
+                >>> layout.add_global_transition(ConditionalTransition(rotate, obstacle), priority=10, group="moving")
+            """
+            if self.__compiled:
+                raise ValueError("layout is compiled, transitions cannot be added")
+            if not isinstance(transition, Transition):
+                raise ValueError("transition must be of type Transition")
+            if group is not None and group not in self.__groups:
+                raise ValueError("group does not exist")
+            self.__global_transitions.append((priority, len(self.__global_transitions), transition, group))
+            self.__global_transitions.sort(key=lambda entry: (-entry[0], entry[1]))
+            self.__globals_by_state.clear()
+
+        def global_transitions_of(self, state: State) -> Tuple[Transition, ...]:
+            """
+            Obtient les transitions globales applicables depuis un état, dans leur ordre d'évaluation.
+
+            Args:
+                state (State): L'état.
+
+            Returns:
+                Tuple[Transition, ...]: Les transitions globales applicables.
+
+            Utilisation:
+                >>> transitions = layout.global_transitions_of(state)
+            """
+            transitions = self.__globals_by_state.get(state)
+            if transitions is None:
+                if state.terminal:
+                    transitions = ()
+                else:
+                    transitions = tuple(transition for _, _, transition, group in self.__global_transitions
+                                        if transition.next_state is not state and (group is None or state in self.__groups[group]))
+                self.__globals_by_state[state] = transitions
+            return transitions
+
+        @property
+        def states(self) -> Tuple[State, ...]:
+            """
+            Getter des états de la machine à états finis, dans leur ordre d'ajout.
+
+            Returns:
+                Tuple[State, ...]: Les états de la machine à états finis.
+
+            Utilisation:
+                >>> states = layout.states
+            """
+            return tuple(self.__states)
+
+        @property
+        def transitions(self) -> Tuple[Transition, ...]:
+            """
+            Getter des transitions de la machine à états finis, état par état dans l'ordre d'ajout des états.
+
+            Les transitions globales suivent, par ordre d'évaluation. La position d'une transition dans ce tuple
+            est son identifiant dans un TransitionTrace, comme la position d'un état dans states est le sien.
+
+            Returns:
+                Tuple[Transition, ...]: Les transitions de la machine à états finis.
+
+            Utilisation:
+                >>> transition = layout.transitions[transition_id]
+            """
+            return tuple(transition for state in self.__states for transition in state.transitions) + \
+                tuple(transition for _, _, transition, _ in self.__global_transitions)
+
+        @property
+        def global_transitions(self) -> Tuple[Transition, ...]:
+            """
+            Getter des transitions globales, dans leur ordre d'évaluation.
+
+            Returns:
+                Tuple[Transition, ...]: Les transitions globales.
+
+            Utilisation:
+                >>> transitions = layout.global_transitions
+            """
+            return tuple(transition for _, _, transition, _ in self.__global_transitions)
+
+        @property
+        def compiled(self) -> bool:
+            """
+            Indique si le layout a été compilé.
+
+            Returns:
+                bool: True si la table de transitions est construite, False sinon.
+
+            Utilisation:
+                >>> compiled = layout.compiled
+            """
+            return self.__compiled
+
+        @property
+        def transition_table(self) -> List[Tuple['FiniteStateMachine.Layout.TransitionRow', ...]]:
+            """
+            Getter de la table de transitions, indexée par état.
+
+            Chaque ligne contient, dans l'ordre d'évaluation, des triplets (condition, indice de l'état suivant, transition)
+            où condition est l'appelable qui évalue la transition.
+
+            Returns:
+                List[Tuple[TransitionRow, ...]]: La table de transitions.
+
+            Utilisation:
+                >>> conditions = layout.transition_table[layout.index_of(state)]
+            """
+            return self.__transition_table
+
+        @property
+        def in_state_actions(self) -> List[Callable[[], None]]:
+            """
+            Getter des actions de présence dans l'état, indexées par état.
+
+            Returns:
+                List[Callable[[], None]]: Les actions de présence des états.
+
+            Utilisation:
+                >>> layout.in_state_actions[layout.index_of(state)]()
+            """
+            return self.__in_state_actions
+
+        @property
+        def terminals(self) -> List[bool]:
+            """
+            Getter des indicateurs d'état terminal, indexés par état.
+
+            Returns:
+                List[bool]: True pour les états terminaux.
+
+            Utilisation:
+                >>> terminal = layout.terminals[layout.index_of(state)]
+            """
+            return self.__terminals
+
+        def index_of(self, state: State) -> int:
+            """
+            Obtient l'indice d'un état dans la table de transitions.
+
+            Args:
+                state (State): L'état recherché.
+
+            Returns:
+                int: L'indice de l'état.
+
+            Raises:
+                ValueError: Le layout n'est pas compilé.
+                ValueError: L'état n'appartient pas au layout.
+
+            Utilisation:
+                >>> index = layout.index_of(state)
+            """
+            if not self.__compiled:
+                raise ValueError("layout is not compiled")
+            index = self.__indices.get(state)
+            if index is None:
+                raise ValueError("state is not in the layout")
+            return index
+
+        def new_runtime(self) -> LayoutRuntime:
+            """
+            Crée un enregistrement d'exécution vierge, placé sur l'état initial. Les valeurs personnalisées sont
+            celles des états au moment de la compilation, copiées superficiellement.
+
+            Returns:
+                LayoutRuntime: Le nouvel enregistrement.
+
+            Raises:
+                ValueError: Le layout n'est pas compilé.
+
+            Utilisation:
+                >>> runtime = layout.new_runtime()
+            """
+            if not self.__compiled:
+                raise ValueError("layout is not compiled")
+            return LayoutRuntime(len(self.__states), self.__indices[self.__initial_state], self.__custom_values)
+
+        def _claim_runtime(self) -> LayoutRuntime:
+            """
+            Fournit l'enregistrement d'exécution d'une nouvelle machine : la première machine reçoit l'enregistrement
+            créé à la compilation, qui porte les valeurs des états, les suivantes un enregistrement vierge. Dès la
+            deuxième machine, le layout n'expose plus d'enregistrement hors du suivi (voir DetachedRuntime).
+
+            Returns:
+                LayoutRuntime: L'enregistrement de la machine.
+
+            Utilisation:
+                >>> runtime = layout._claim_runtime()
+            """
+            self.__machines += 1
+            runtime = self.__compiled_runtime
+            if runtime is None:
+                if self.__machines == 2:
+                    self.runtime = DetachedRuntime()
+                return self.new_runtime()
+            self.__compiled_runtime = None
+            return runtime
+
+        def compile(self) -> None:
+            """
+            Fige les états et construit la table de transitions indexée par état.
+
+            Les transitions globales applicables depuis chaque état sont placées en tête de sa ligne. Les
+            transitions ne peuvent plus être ajoutées aux états une fois le layout compilé. Les conditions
+            des ConditionalTransition sont capturées directement : remplacer la condition d'une transition
+            après la compilation n'a pas d'effet sur la table (modifier ses paramètres, comme une durée, en a).
+
+            Les données d'exécution des MonitoredState sont ensuite rangées dans un LayoutRuntime : un layout compilé
+            peut être partagé par plusieurs machines, chacune avec son enregistrement (voir LayoutRuntime). Ce qui
+            reste porté par les objets eux-mêmes est commun à toutes ces machines : les compteurs des
+            MonitoredTransition, la référence des TimedCondition et les valeurs capturées par les actions.
+
+            Raises:
+                ValueError: Le layout n'est pas valide.
+                ValueError: Une transition mène vers un état absent du layout.
+
+            Utilisation:
+                >>> layout.compile()
+            """
+            if self.__compiled:
+                return
+            if not self.valid:
+                raise ValueError("layout is not valid")
+            indices = {state: index for index, state in enumerate(self.__states)}
+            table = []
+            for state in self.__states:
+                row = []
+                for transition in self.global_transitions_of(state) + state.transitions:
+                    target = indices.get(transition.next_state)
+                    if target is None:
+                        raise ValueError("transition leads to a state which is not in the layout")
+                    if isinstance(transition, ConditionalTransition):
+                        condition = transition.condition.__bool__
+                    else:
+                        condition = lambda transition=transition: transition.transiting
+                    row.append((condition, target, transition))
+                table.append(tuple(row))
+                state._freeze()
+            self.__indices = indices
+            self.__transition_table = table
+            self.__in_state_actions = [state._exec_in_state_action for state in self.__states]
+            self.__terminals = [state.terminal for state in self.__states]
+            self.__compiled = True
+            self.runtime = LayoutRuntime(len(self.__states), indices[self.__initial_state])
+            for index, state in enumerate(self.__states):
+                if isinstance(state, MonitoredState):
+                    state._attach(self, index)
+            self.__custom_values = list(self.runtime.custom_values)
+            self.__compiled_runtime = self.runtime
+
     class OperationalState(Enum):
         """
         Représente les états opérationnels de la machine à états finis.
@@ -183,16 +540,23 @@ class FiniteStateMachine:
         RUNNING = auto()
         TERMINAL_REACHED = auto()
 
-    def __init__(self, layout: Layout, uninitialized: bool = True):
+    def __init__(self, layout: Layout, uninitialized: bool = True, timer_wheel: Optional[TimerWheel] = None, clock: Optional[Clock] = None, rate: Optional[float] = None, trace: Optional[TransitionTrace] = None):
         """
         Initialise la machine à états finis avec la disposition fournie.
 
         Args:
             layout (Layout): La disposition de la machine à états finis.
             uninitialized (bool): Indique si la machine à états finis doit être initialisée ou non.
+            timer_wheel (TimerWheel, optionnel): La roue dont les échéances réveillent aussi la boucle de start(),
+                y compris celles des machines suivies depuis les actions de ses états. Par défaut à None.
+            clock (Clock, optionnel): L'horloge de la machine, liée à tous les états du layout, à leurs transitions
+                et à leurs conditions. Par défaut, Clock.system().
+            rate (float, optionnel): La fréquence de suivi de la machine pour un RateScheduler, en Hz. Par défaut à None.
+            trace (TransitionTrace, optionnel): L'historique où enregistrer les transitions (voir trace). Par défaut à None.
 
         Raises:
             ValueError: Le layout n'est pas valide.
+            ValueError: rate doit être positive.
 
         Utilisation:
             >>> layout = FiniteStateMachine.Layout()
@@ -202,14 +566,346 @@ class FiniteStateMachine:
 
         if not layout.valid:
             raise ValueError("layout is not valid")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
 
         self.__layout = layout
-        self.__current_applicative_state = layout.initial_state
+        self.__rate: Optional[float] = rate
+        self.__timer_wheel = timer_wheel
+        self.__clock = Clock.system() if clock is None else clock
+        for state in layout.states:
+            state._bind_clock(self.__clock)
+        for transition in layout.global_transitions:
+            transition._bind_clock(self.__clock)
+        self.__event_driven = False
+        self.__event_queue = deque()
+        self.__event_pollers: List[list] = []
+        self.__pending_sources = set()
+        self.__timer_deadline: Optional[float] = None
+        self.__state_entered = True
+        self.__runtime: Optional[LayoutRuntime] = None
+        self.__trace: Optional[TransitionTrace] = None
+        self.__trace_states: dict = {}
+        self.__trace_transitions: dict = {}
+        self.__load_layout_table()
+        self.trace = trace
+        self.__set_current_state(layout.initial_state)
         self.__current_operational_state = self.OperationalState.UNINITIALIZED
 
         if not uninitialized:
             self.reset()
 
+    def __load_layout_table(self) -> None:
+        """
+        Charge la table de transitions du layout s'il est compilé, et réclame l'enregistrement d'exécution
+        de la machine à la première occasion.
+
+        Utilisation:
+            >>> self.__load_layout_table()
+        """
+        self.__compiled = self.__layout.compiled
+        self.__states = self.__layout.states
+        self.__transition_table = self.__layout.transition_table
+        self.__in_state_actions = self.__layout.in_state_actions
+        self.__terminals = self.__layout.terminals
+        self.__current_index = None
+        if self.__compiled and self.__runtime is None:
+            self.__runtime = self.__layout._claim_runtime()
+
+    def __activate_runtime(self) -> Optional[LayoutRuntime]:
+        """
+        Désigne l'enregistrement d'exécution de la machine comme celui du layout, lu et écrit par ses états.
+
+        Returns:
+            Optional[LayoutRuntime]: L'enregistrement exposé auparavant par le layout, à rétablir ensuite.
+
+        Utilisation:
+            >>> previous = self.__activate_runtime()
+        """
+        layout = self.__layout
+        previous = layout.runtime
+        if self.__runtime is not None:
+            layout.runtime = self.__runtime
+        return previous
+
+    @contextmanager
+    def runtime_scope(self):
+        """
+        Expose l'enregistrement d'exécution de la machine le temps d'un bloc with : les états d'un layout partagé
+        y sont lus et écrits pour cette machine. track(), transit_to() et start() le font d'eux-mêmes.
+
+        Utilisation:
+            >>> with fsm.runtime_scope():
+            ...     state.custom_value = True
+        """
+        previous = self.__activate_runtime()
+        try:
+            yield self
+        finally:
+            self.__layout.runtime = previous
+
+    def __set_current_state(self, state: State, index: Optional[int] = None) -> None:
+        """
+        Définit l'état applicatif courant et, si le layout est compilé, son indice dans la table de transitions.
+
+        Args:
+            state (State): Le nouvel état courant.
+            index (Optional[int]): L'indice de l'état s'il est déjà connu.
+
+        Utilisation:
+            >>> self.__set_current_state(state)
+        """
+        self.__current_applicative_state = state
+        self.__state_entered = True
+        if self.__compiled:
+            self.__current_index = index if index is not None else self.__layout.index_of(state)
+            self.__runtime.current_index = self.__current_index
+
+    @property
+    def rate(self) -> Optional[float]:
+        """
+        Obtient la fréquence de suivi déclarée pour la machine (voir RateScheduler).
+
+        Returns:
+            Optional[float]: La fréquence, en Hz, None si elle n'est pas déclarée.
+
+        Utilisation:
+            >>> rate = fsm.rate
+        """
+        return self.__rate
+
+    @rate.setter
+    def rate(self, rate: Optional[float]) -> None:
+        """
+        Déclare la fréquence de suivi de la machine.
+
+        Args:
+            rate (Optional[float]): La fréquence, en Hz, None pour ne pas en déclarer.
+
+        Raises:
+            ValueError: rate doit être positive.
+
+        Utilisation:
+            >>> fsm.rate = 50.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.__rate = rate
+
+    @property
+    def tick_rate(self) -> Optional[float]:
+        """
+        Obtient la fréquence de suivi en vigueur : celle de l'état courant si elle est déclarée, sinon celle de la machine.
+
+        Returns:
+            Optional[float]: La fréquence, en Hz, None si aucune n'est déclarée.
+
+        Utilisation:
+            >>> period = 1. / fsm.tick_rate
+        """
+        state = self.current_applicative_state
+        if state is not None and state.rate is not None:
+            return state.rate
+        return self.__rate
+
+    @property
+    def runtime(self) -> Optional[LayoutRuntime]:
+        """
+        Obtient l'enregistrement d'exécution de la machine à états finis.
+
+        Returns:
+            Optional[LayoutRuntime]: L'enregistrement, ou None si le layout n'était pas compilé.
+
+        Utilisation:
+            >>> count = fsm.runtime.entry_counts[layout.index_of(state)]
+        """
+        return self.__runtime
+
+    @runtime.setter
+    def runtime(self, value) -> None:
+        """
+        Empêche la modification de l'enregistrement d'exécution.
+
+        Raises:
+            ValueError: runtime est une propriété en lecture seule.
+
+        Utilisation:
+            >>> fsm.runtime = runtime
+        """
+        raise ValueError("runtime is a read-only property")
+
+    @property
+    def trace(self) -> Optional[TransitionTrace]:
+        """
+        Obtient l'historique des transitions de la machine à états finis.
+
+        Chaque transition y est enregistrée à l'instant de l'horloge de la machine où elle est décidée, avec
+        l'identifiant de l'état de départ, de l'état d'arrivée et de la transition : leur position dans
+        layout.states et layout.transitions.
+
+        Returns:
+            Optional[TransitionTrace]: L'historique, ou None s'il n'est pas activé.
+
+        Utilisation:
+            >>> for time, source, target, transition in fsm.trace.last(10):
+            ...     print(time, layout.states[source], layout.states[target])
+        """
+        return self.__trace
+
+    @trace.setter
+    def trace(self, trace: Optional[TransitionTrace]) -> None:
+        """
+        Active ou désactive l'historique des transitions.
+
+        Args:
+            trace (Optional[TransitionTrace]): L'historique, ou None pour le désactiver.
+
+        Raises:
+            ValueError: trace doit être de type TransitionTrace.
+
+        Utilisation:
+            >>> fsm.trace = TransitionTrace(capacity=4096)
+        """
+        if trace is not None and not isinstance(trace, TransitionTrace):
+            raise ValueError("trace must be of type TransitionTrace")
+        self.__trace = trace
+        self.__index_trace_ids()
+
+    def __index_trace_ids(self) -> None:
+        """
+        Indexe les identifiants des états et des transitions du layout pour l'historique des transitions.
+
+        Utilisation:
+            >>> self.__index_trace_ids()
+        """
+        if self.__trace is None:
+            return
+        self.__trace_states = {state: index for index, state in enumerate(self.__layout.states)}
+        self.__trace_transitions = {transition: index for index, transition in enumerate(self.__layout.transitions)}
+
+    def __record_transition(self, source: State, target: State, transition: Optional[Transition]) -> None:
+        """
+        Enregistre une transition dans l'historique.
+
+        Args:
+            source (State): L'état de départ.
+            target (State): L'état d'arrivée.
+            transition (Optional[Transition]): La transition, None pour une transition forcée.
+
+        Utilisation:
+            >>> self.__record_transition(state, transition.next_state, transition)
+        """
+        states = self.__trace_states
+        self.__trace.record(self.__clock.now(), states.get(source, -1), states.get(target, -1),
+                            self.__trace_transitions.get(transition, TransitionTrace.NO_TRANSITION))
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Obtient l'horloge de la machine à états finis.
+
+        Returns:
+            Clock: L'horloge de la machine.
+
+        Utilisation:
+            >>> now = fsm.clock.now()
+        """
+        return self.__clock
+
+    @clock.setter
+    def clock(self, value) -> None:
+        raise ValueError("clock is a read-only property")
+
+    @property
+    def event_driven(self) -> bool:
+        """
+        Indique si la machine à états finis fonctionne en mode événementiel.
+
+        En mode événementiel, toutes les transitions de l'état courant sont évaluées au premier tick suivant
+        son entrée. Ensuite, seules les transitions dont la condition dépend d'une source d'événements ayant
+        publié depuis le tick précédent sont évaluées (voir Condition.event_sources), ainsi que celles dont
+        la condition ne déclare pas ses sources. Les événements TIMER sont publiés par la machine elle-même
+        à l'échéance des conditions temporelles, et les événements CUSTOM_VALUE à chaque modification de la
+        valeur personnalisée d'un MonitoredState du layout.
+
+        Returns:
+            bool: True si la machine est en mode événementiel, False sinon.
+
+        Utilisation:
+            >>> fsm.event_driven = True
+        """
+        return self.__event_driven
+
+    @event_driven.setter
+    def event_driven(self, event_driven: bool) -> None:
+        """
+        Active ou désactive le mode événementiel.
+
+        Args:
+            event_driven (bool): True pour activer le mode événementiel.
+
+        Raises:
+            TypeError: event_driven doit être de type bool.
+
+        Utilisation:
+            >>> fsm.event_driven = True
+        """
+        if not isinstance(event_driven, bool):
+            raise TypeError("event_driven must be of type bool")
+        if event_driven:
+            for state in self.__layout.states:
+                if isinstance(state, MonitoredState):
+                    state._add_custom_value_listener(self.__post_custom_value_event)
+        self.__event_queue.clear()
+        self.__event_driven = event_driven
+        self.__state_entered = True
+
+    def post_event(self, source: Condition.EventSource) -> None:
+        """
+        Publie un événement dans la file d'événements. Peut être appelée depuis un autre fil d'exécution.
+
+        Les événements publiés hors du mode événementiel sont ignorés.
+
+        Args:
+            source (Condition.EventSource): La source de l'événement.
+
+        Utilisation:
+            >>> fsm.post_event(Condition.EventSource.DISTANCE_SAMPLE)
+        """
+        if self.__event_driven:
+            self.__event_queue.append(source)
+
+    def __post_custom_value_event(self) -> None:
+        """
+        Publie un événement CUSTOM_VALUE.
+
+        Utilisation:
+            >>> self.__post_custom_value_event()
+        """
+        self.post_event(Condition.EventSource.CUSTOM_VALUE)
+
+    def add_event_poller(self, source: Condition.EventSource, poller: Callable[[], Any]) -> None:
+        """
+        Ajoute une fonction sondée une seule fois par tick en mode événementiel. Un événement de la source
+        fournie est publié chaque fois que la valeur retournée change.
+
+        Args:
+            source (Condition.EventSource): La source des événements publiés.
+            poller (Callable[[], Any]): La fonction à sonder.
+
+        Raises:
+            TypeError: source doit être de type Condition.EventSource.
+            TypeError: poller doit être appelable.
+
+        Utilisation:
+            >>> fsm.add_event_poller(Condition.EventSource.REMOTE_KEY, robot.read_input)
+        """
+        if not isinstance(source, Condition.EventSource):
+            raise TypeError("source must be of type Condition.EventSource")
+        if not callable(poller):
+            raise TypeError("poller must be callable")
+        self.__event_pollers.append([source, poller, None])
+
     @property
     def current_operational_state(self) -> int:
         """
@@ -270,7 +966,9 @@ class FiniteStateMachine:
             >>> fsm.reset()
         """
         self.__current_operational_state = self.OperationalState.IDLE
-        self.__current_applicative_state = self.__layout.initial_state
+        self.__load_layout_table()
+        self.__index_trace_ids()
+        self.__set_current_state(self.__layout.initial_state)
 
     def _transit_by(self, transition : Transition) -> None:
         """
@@ -282,9 +980,11 @@ class FiniteStateMachine:
         Utilisation:
             >>> fsm._transit_by(transition)
         """
+        if self.__trace is not None:
+            self.__record_transition(self.current_applicative_state, transition.next_state, transition)
         self.current_applicative_state._exec_exiting_action()
         transition._exec_transiting_action()
-        self.__current_applicative_state = transition.next_state
+        self.__set_current_state(transition.next_state)
         self.current_applicative_state._exec_entering_action()
 
     def transit_to(self, state : State) -> None:
@@ -297,14 +997,25 @@ class FiniteStateMachine:
         Utilisation:
             >>> fsm.transit_to(state)
         """
-        self.current_applicative_state._exec_exiting_action()
-        self.__current_applicative_state = state
-        self.current_applicative_state._exec_entering_action()
+        previous = self.__activate_runtime()
+        try:
+            if self.__trace is not None:
+                self.__record_transition(self.current_applicative_state, state, None)
+            self.current_applicative_state._exec_exiting_action()
+            self.__set_current_state(state)
+            self.current_applicative_state._exec_entering_action()
+        finally:
+            self.__layout.runtime = previous
         
     def track(self) -> bool:
         """
         Suit l'état actuel de la machine à états finis et effectue les actions nécessaires en fonction des transitions.
 
+        Si le layout a été compilé avant la construction (ou la réinitialisation) de la machine, le suivi
+        s'effectue à partir de la table de transitions du layout. Chaque appel ouvre un tick (voir Tick),
+        partagé avec les machines suivies depuis les actions de ses états, et fait avancer la roue de l'horloge
+        de la machine et sa timer_wheel, une seule fois par tick.
+
         Returns:
             bool: Indique si la machine à états finis est toujours en cours d'exécution.
 
@@ -314,10 +1025,118 @@ class FiniteStateMachine:
         Utilisation:
             >>> run = fsm.track()
         """
+        Tick.begin()
+        previous = self.__activate_runtime()
+        try:
+            self.__clock._advance_timer_wheel()
+            if self.__timer_wheel is not None:
+                self.__timer_wheel.advance_once()
+            if self.__event_driven:
+                return self._track_event_driven()
+            if self.__compiled:
+                return self._track_compiled()
+            return self._track_interpreted()
+        finally:
+            self.__layout.runtime = previous
+            Tick.end()
+
+    def _track_event_driven(self) -> bool:
+        """
+        Suit l'état actuel en n'évaluant que les transitions concernées par les événements publiés.
+
+        Returns:
+            bool: Indique si la machine à états finis est toujours en cours d'exécution.
+
+        Raises:
+            ValueError: current_applicative_state est None.
+
+        Utilisation:
+            >>> run = fsm._track_event_driven()
+        """
+        state = self.current_applicative_state
+        if state is None:
+            raise ValueError("current_applicative_state is None")
+
+        sources = self.__pending_sources
+        sources.clear()
+        for poller in self.__event_pollers:
+            value = poller[1]()
+            if value != poller[2]:
+                poller[2] = value
+                sources.add(poller[0])
+        queue = self.__event_queue
+        while queue:
+            sources.add(queue.popleft())
+        deadline = self.__timer_deadline
+        if deadline is not None and self.__clock.now() >= deadline:
+            sources.add(Condition.EventSource.TIMER)
+
+        full_evaluation = self.__state_entered
+        if full_evaluation:
+            self.__state_entered = False
+            transition = self.__global_transiting(state) or state.transiting
+        else:
+            transition = self.__global_transiting(state, sources) or state._transiting_on(sources)
+
+        if transition:
+            self._transit_by(transition)
+        else:
+            if full_evaluation or Condition.EventSource.TIMER in sources:
+                self.__timer_deadline = self.__next_deadline_of(state, self.__clock.now())
+            state._exec_in_state_action()
+
+        if self.current_applicative_state.terminal:
+            self.__current_operational_state = self.OperationalState.TERMINAL_REACHED
+            return False
+        return True
+
+    def _track_compiled(self) -> bool:
+        """
+        Suit l'état actuel à partir de la table de transitions du layout compilé.
+
+        Returns:
+            bool: Indique si la machine à états finis est toujours en cours d'exécution.
+
+        Utilisation:
+            >>> run = fsm._track_compiled()
+        """
+        index = self.__current_index
+        for condition, target, transition in self.__transition_table[index]:
+            if condition():
+                if self.__trace is not None:
+                    self.__trace.record(self.__clock.now(), index, target, self.__trace_transitions.get(transition, TransitionTrace.NO_TRANSITION))
+                self.__current_applicative_state._exec_exiting_action()
+                transition._exec_transiting_action()
+                self.__current_index = target
+                self.__runtime.current_index = target
+                self.__current_applicative_state = self.__states[target]
+                self.__current_applicative_state._exec_entering_action()
+                break
+        else:
+            self.__in_state_actions[index]()
+
+        if self.__terminals[self.__current_index]:
+            self.__current_operational_state = self.OperationalState.TERMINAL_REACHED
+            return False
+        return True
+
+    def _track_interpreted(self) -> bool:
+        """
+        Suit l'état actuel en parcourant les transitions des objets State.
+
+        Returns:
+            bool: Indique si la machine à états finis est toujours en cours d'exécution.
+
+        Raises:
+            ValueError: current_applicative_state est None.
+
+        Utilisation:
+            >>> run = fsm._track_interpreted()
+        """
         if self.current_applicative_state is None:
             raise ValueError("current_applicative_state is None")
         
-        transition = self.current_applicative_state.transiting
+        transition = self.__global_transiting(self.current_applicative_state) or self.current_applicative_state.transiting
             
         if transition:
             self._transit_by(transition)
@@ -328,30 +1147,202 @@ class FiniteStateMachine:
             self.__current_operational_state = self.OperationalState.TERMINAL_REACHED
             return False
         return True
-            
-    
-    def start(self, reset: bool = True, time_budget: float = None):
+
+    def next_deadline(self, now: float) -> Optional[float]:
         """
-        Démarre la machine à états finis, en la réinitialisant éventuellement et en la faisant fonctionner pendant un budget de temps spécifié.
+        Obtient la prochaine échéance temporelle des transitions de l'état courant.
+
+        Args:
+            now (float): L'instant courant.
+
+        Returns:
+            Optional[float]: La prochaine échéance future, None si aucune transition n'est temporelle.
+
+        Utilisation:
+            >>> deadline = fsm.next_deadline(fsm.clock.now())
+        """
+        if self.current_applicative_state is None:
+            return None
+        previous = self.__activate_runtime()
+        try:
+            return self.__next_deadline_of(self.current_applicative_state, now)
+        finally:
+            self.__layout.runtime = previous
+
+    def __next_deadline_of(self, state: State, now: float) -> Optional[float]:
+        """
+        Obtient la prochaine échéance temporelle des transitions d'un état et des transitions globales applicables.
+
+        Args:
+            state (State): L'état.
+            now (float): L'instant courant.
+
+        Returns:
+            Optional[float]: La prochaine échéance future, None si aucune transition n'est temporelle.
+
+        Utilisation:
+            >>> deadline = self.__next_deadline_of(state, now)
+        """
+        deadline = state.next_deadline(now)
+        for transition in self.__layout.global_transitions_of(state):
+            candidate = transition.next_deadline(now)
+            if candidate is not None and (deadline is None or candidate < deadline):
+                deadline = candidate
+        return deadline
+
+    def __global_transiting(self, state: State, sources: Optional[set] = None) -> Optional[Transition]:
+        """
+        Évalue les transitions globales applicables depuis un état, avant ses propres transitions.
+
+        Args:
+            state (State): L'état courant.
+            sources (set, optionnel): En mode événementiel, les sources ayant publié depuis le dernier tick : seules
+                les transitions concernées, ou qui ne déclarent pas leurs sources, sont évaluées. Par défaut, toutes.
+
+        Returns:
+            Optional[Transition]: La première transition globale en cours, None autrement.
+
+        Utilisation:
+            >>> transition = self.__global_transiting(state)
+        """
+        for transition in self.__layout.global_transitions_of(state):
+            if sources is not None:
+                transition_sources = transition.event_sources
+                if transition_sources is not None and transition_sources.isdisjoint(sources):
+                    continue
+            if transition.transiting:
+                return transition
+        return None
+
+    def _wait_next_tick(self, poll_period: float, end_time: Optional[float] = None) -> None:
+        """
+        Suspend le fil d'exécution jusqu'à la prochaine échéance de l'état courant ou jusqu'au prochain sondage requis.
+
+        Args:
+            poll_period (float): Le délai maximal entre deux ticks, pour les conditions qui doivent être sondées.
+            end_time (Optional[float]): L'instant de fin du budget de temps, s'il y en a un.
+
+        Utilisation:
+            >>> fsm._wait_next_tick(poll_period=0.01)
+        """
+        delay = self._next_tick_delay(poll_period, end_time)
+        if delay > 0:
+            self.__clock.sleep(delay)
+
+    def _next_tick_delay(self, poll_period: float, end_time: Optional[float] = None) -> float:
+        """
+        Calcule le délai jusqu'à la prochaine échéance de l'état courant ou jusqu'au prochain sondage requis.
+
+        Args:
+            poll_period (float): Le délai maximal entre deux ticks, pour les conditions qui doivent être sondées.
+            end_time (Optional[float]): L'instant de fin du budget de temps, s'il y en a un.
+
+        Returns:
+            float: Le délai, nul si la prochaine échéance est déjà atteinte.
+
+        Utilisation:
+            >>> delay = fsm._next_tick_delay(poll_period=0.01)
+        """
+        now = self.__clock.now()
+        wake_time = now + poll_period
+        deadline = self.next_deadline(now)
+        if deadline is not None and deadline < wake_time:
+            wake_time = deadline
+        if self.__timer_wheel is not None:
+            deadline = self.__timer_wheel.next_deadline(now)
+            if deadline is not None and deadline < wake_time:
+                wake_time = deadline
+        if end_time is not None and end_time < wake_time:
+            wake_time = end_time
+        return max(wake_time - now, 0.)
+
+    def _prepare_run(self, reset: bool = True) -> None:
+        """
+        Prépare la machine à fonctionner : la réinitialise éventuellement, la passe à l'état RUNNING et exécute
+        l'action d'entrée de l'état courant.
 
         Args:
             reset (bool): Indique si la machine à états finis doit être réinitialisée.
-            time_budget (float): Le budget de temps pour lequel la machine à états finis doit fonctionner.
 
         Utilisation:
-            >>> fsm.start()
+            >>> fsm._prepare_run()
         """
         if reset:
             self.reset()
         self.__current_operational_state = self.OperationalState.RUNNING
-        self.current_applicative_state._exec_entering_action()
+        with self.runtime_scope():
+            self.current_applicative_state._exec_entering_action()
+
+    def start(self, reset: bool = True, time_budget: float = None, poll_period: float = None):
+        """
+        Démarre la machine à états finis, en la réinitialisant éventuellement et en la faisant fonctionner pendant un budget de temps spécifié.
+
+        Sans poll_period, la boucle appelle track() sans interruption. Avec poll_period, la boucle dort entre
+        deux ticks jusqu'à la prochaine échéance des conditions temporelles de l'état courant
+        (StateEntryDurationCondition, TimedCondition) ou de la TimerWheel de la machine, sans jamais dépasser poll_period.
+        Le temps est celui de l'horloge de la machine : avec une VirtualClock, poll_period est requis pour que le temps
+        avance, et chaque attente saute directement à la prochaine échéance.
+
+        Args:
+            reset (bool): Indique si la machine à états finis doit être réinitialisée.
+            time_budget (float): Le budget de temps pour lequel la machine à états finis doit fonctionner.
+            poll_period (float): Le délai maximal entre deux ticks. Par défaut à None (boucle active).
+
+        Raises:
+            ValueError: poll_period doit être positif.
+
+        Utilisation:
+            >>> fsm.start()
+            >>> fsm.start(poll_period=0.02)
+        """
+        if poll_period is not None and poll_period <= 0:
+            raise ValueError("poll_period must be positive")
+        self._prepare_run(reset)
         run = True
-        init_time = perf_counter()
+        init_time = self.__clock.now()
+        end_time = init_time + time_budget if time_budget is not None else None
 
-        while ((time_budget is None) or (time_budget > perf_counter() - init_time)) and run:
+        while ((time_budget is None) or (time_budget > self.__clock.now() - init_time)) and run:
             run = self.track()
             if not run:
                 self.stop()
+            elif poll_period is not None:
+                self._wait_next_tick(poll_period, end_time)
+
+    async def run(self, reset: bool = True, time_budget: float = None, poll_period: float = None) -> None:
+        """
+        Fait fonctionner la machine à états finis dans une boucle asyncio, en rendant la main entre deux ticks.
+
+        Se comporte comme start(), mais attend la prochaine échéance avec Clock.sleep_async() (ou rend simplement
+        la main sans poll_period) : plusieurs machines peuvent ainsi fonctionner sur une même boucle d'événements
+        (voir AsyncScheduler). La boucle s'arrête aussi dès que stop() est appelée.
+
+        Args:
+            reset (bool): Indique si la machine à états finis doit être réinitialisée.
+            time_budget (float): Le budget de temps pour lequel la machine à états finis doit fonctionner.
+            poll_period (float): Le délai maximal entre deux ticks. Par défaut à None (un tick à chaque passage).
+
+        Raises:
+            ValueError: poll_period doit être positif.
+
+        Utilisation:
+            >>> asyncio.run(fsm.run(poll_period=0.02))
+        """
+        import asyncio
+        if poll_period is not None and poll_period <= 0:
+            raise ValueError("poll_period must be positive")
+        self._prepare_run(reset)
+        init_time = self.__clock.now()
+        end_time = init_time + time_budget if time_budget is not None else None
+
+        while ((time_budget is None) or (time_budget > self.__clock.now() - init_time)) \
+                and self.__current_operational_state == self.OperationalState.RUNNING:
+            if not self.track():
+                self.stop()
+            elif poll_period is not None:
+                await self.__clock.sleep_async(self._next_tick_delay(poll_period, end_time))
+            else:
+                await asyncio.sleep(0)
 
     def stop(self):
         """
@@ -0,0 +1,236 @@
+import mmap
+import struct
+import threading
+from enum import Enum
+from typing import List, Optional, Tuple
+from Clock import Clock
+
+class InputRecorder:
+    """
+    Journal binaire des entrées lues par le robot (télécommande, capteur de distance, achèvement des rotations),
+    pour les rejouer avec un ReplayBackend.
+
+    Le journal est un fichier en ajout seul projeté en mémoire : chaque lecture y est écrite par une simple copie
+    de quelques octets, sans appel système, et le fichier est agrandi par blocs. L'en-tête (MAGIC, version,
+    nombre d'entrées, instant de départ) est tenu à jour à chaque ajout : un journal interrompu reste lisible.
+    Chaque entrée contient l'instant de la lecture depuis le départ (double), la source (octet) et la valeur
+    lue (entier signé de 32 bits), en petit-boutiste. Les ajouts sont protégés par un verrou, car le capteur de
+    distance peut être lu depuis le fil d'un DistanceSampler.
+
+    Attributs:
+        MAGIC (bytes): La signature des journaux.
+        VERSION (int): La version du format des journaux.
+        __path (str): Le chemin du journal.
+        __clock (Clock): L'horloge des instants de lecture.
+        __start (float): L'instant de départ du journal.
+        __count (int): Le nombre d'entrées écrites.
+        __capacity (int): Le nombre d'entrées que peut contenir le fichier avant d'être agrandi.
+        __chunk (int): Le nombre d'entrées ajoutées à chaque agrandissement.
+        __file (Optional[BinaryIO]): Le fichier ouvert, None une fois fermé.
+        __map (Optional[mmap.mmap]): La projection du fichier.
+        __lock (threading.Lock): Le verrou des ajouts.
+
+    Méthodes:
+        record(source: InputRecorder.Source, value: int) -> None:
+            Ajoute une lecture au journal.
+
+        close() -> None:
+            Ferme le journal.
+
+        read(path: str) -> Tuple[float, List[Tuple[float, InputRecorder.Source, int]]]:
+            Relit un journal.
+
+    Classes:
+        Source (Enum):
+            Représente la source d'une lecture.
+
+    Utilisation:
+        >>> recorder = robot.start_recording("inputs.bin")
+        >>> c64.start(time_budget=600.)
+        >>> robot.stop_recording()
+    """
+
+    class Source(Enum):
+        """
+        Représente la source d'une lecture.
+
+        Utilisation:
+            >>> source = InputRecorder.Source.REMOTE
+        """
+        REMOTE = 1
+        DISTANCE = 2
+        TARGET_REACHED = 3
+
+    MAGIC: bytes = b'RBIN'
+    VERSION: int = 1
+    __HEADER = struct.Struct('<4sIQd')
+    __COUNT = struct.Struct('<Q')
+    __COUNT_OFFSET = 8
+    __ENTRY = struct.Struct('<dBi')
+
+    def __init__(self, path: str, clock: Optional[Clock] = None, chunk: int = 4096) -> None:
+        """
+        Crée un journal vide, en écrasant le fichier s'il existe.
+
+        Args:
+            path (str): Le chemin du journal.
+            clock (Clock, optionnel): L'horloge des instants de lecture. Par défaut, Clock.system().
+            chunk (int): Le nombre d'entrées ajoutées au fichier à chaque agrandissement. Par défaut à 4096.
+
+        Raises:
+            ValueError: chunk doit être positif.
+
+        Utilisation:
+            >>> recorder = InputRecorder("inputs.bin", clock=robot.clock)
+        """
+        if chunk <= 0:
+            raise ValueError("chunk must be positive")
+        self.__path: str = path
+        self.__clock: Clock = Clock.system() if clock is None else clock
+        self.__start: float = self.__clock.now()
+        self.__count: int = 0
+        self.__capacity: int = 0
+        self.__chunk: int = chunk
+        self.__lock = threading.Lock()
+        self.__file = open(path, 'w+b')
+        self.__map: Optional[mmap.mmap] = None
+        self.__grow()
+
+    @property
+    def path(self) -> str:
+        """
+        Obtient le chemin du journal.
+
+        Returns:
+            str: Le chemin du journal.
+
+        Utilisation:
+            >>> path = recorder.path
+        """
+        return self.__path
+
+    @property
+    def count(self) -> int:
+        """
+        Obtient le nombre d'entrées écrites.
+
+        Returns:
+            int: Le nombre d'entrées.
+
+        Utilisation:
+            >>> count = recorder.count
+        """
+        return self.__count
+
+    @property
+    def closed(self) -> bool:
+        """
+        Indique si le journal est fermé.
+
+        Returns:
+            bool: True si le journal est fermé.
+
+        Utilisation:
+            >>> if not recorder.closed: ...
+        """
+        return self.__file is None
+
+    def __grow(self) -> None:
+        """
+        Agrandit le fichier d'un bloc d'entrées et le projette à nouveau en mémoire.
+
+        Utilisation:
+            >>> self.__grow()
+        """
+        if self.__map is not None:
+            self.__map.close()
+        self.__capacity += self.__chunk
+        self.__file.truncate(InputRecorder.__HEADER.size + self.__capacity * InputRecorder.__ENTRY.size)
+        self.__map = mmap.mmap(self.__file.fileno(), 0)
+        InputRecorder.__HEADER.pack_into(self.__map, 0, InputRecorder.MAGIC, InputRecorder.VERSION, self.__count, self.__start)
+
+    def record(self, source: 'InputRecorder.Source', value: int) -> None:
+        """
+        Ajoute une lecture au journal, à l'instant courant de l'horloge. Sans effet si le journal est fermé.
+
+        Args:
+            source (InputRecorder.Source): La source de la lecture.
+            value (int): La valeur lue.
+
+        Utilisation:
+            >>> recorder.record(InputRecorder.Source.DISTANCE, 412)
+        """
+        time = self.__clock.now() - self.__start
+        with self.__lock:
+            if self.__file is None:
+                return
+            if self.__count == self.__capacity:
+                self.__grow()
+            InputRecorder.__ENTRY.pack_into(self.__map, InputRecorder.__HEADER.size + self.__count * InputRecorder.__ENTRY.size,
+                                            time, source.value, int(value))
+            self.__count += 1
+            InputRecorder.__COUNT.pack_into(self.__map, InputRecorder.__COUNT_OFFSET, self.__count)
+
+    def close(self) -> None:
+        """
+        Ferme le journal et ramène le fichier à la taille de ses entrées.
+
+        Utilisation:
+            >>> recorder.close()
+        """
+        with self.__lock:
+            if self.__file is None:
+                return
+            self.__map.flush()
+            self.__map.close()
+            self.__map = None
+            self.__file.truncate(InputRecorder.__HEADER.size + self.__count * InputRecorder.__ENTRY.size)
+            self.__file.close()
+            self.__file = None
+
+    def __enter__(self) -> 'InputRecorder':
+        """
+        Utilise le journal dans un bloc with.
+
+        Returns:
+            InputRecorder: Le journal.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Ferme le journal à la sortie du bloc with.
+        """
+        self.close()
+
+    @staticmethod
+    def read(path: str) -> Tuple[float, List[Tuple[float, 'InputRecorder.Source', int]]]:
+        """
+        Relit un journal, y compris un journal interrompu avant sa fermeture.
+
+        Args:
+            path (str): Le chemin du journal.
+
+        Returns:
+            Tuple[float, List[Tuple[float, InputRecorder.Source, int]]]: L'instant de départ du journal, et pour
+            chaque lecture l'instant depuis le départ, la source et la valeur lue.
+
+        Raises:
+            ValueError: Le fichier n'est pas un journal d'entrées.
+
+        Utilisation:
+            >>> start, entries = InputRecorder.read("inputs.bin")
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < InputRecorder.__HEADER.size:
+            raise ValueError("file is not an input log")
+        magic, version, count, start = InputRecorder.__HEADER.unpack_from(data, 0)
+        if magic != InputRecorder.MAGIC or version != InputRecorder.VERSION:
+            raise ValueError("file is not an input log")
+        end = InputRecorder.__HEADER.size + count * InputRecorder.__ENTRY.size
+        if len(data) < end:
+            raise ValueError("input log is truncated")
+        entries = [(time, InputRecorder.Source(source), value)
+                   for time, source, value in InputRecorder.__ENTRY.iter_unpack(data[InputRecorder.__HEADER.size:end])]
+        return start, entries
@@ -0,0 +1,151 @@
+from array import array
+from typing import List, Optional, Sequence
+
+class LayoutRuntime:
+    """
+    Enregistrement d'exécution compact d'une instance de machine à états finis.
+
+    Les données d'exécution des MonitoredState (nombre d'entrées, instants de la dernière entrée et de la
+    dernière sortie, valeur personnalisée) sont rangées dans des tableaux indexés par état. Un layout compilé
+    peut ainsi être partagé par plusieurs machines, chacune avec son propre enregistrement : le layout expose
+    l'enregistrement de la machine en cours de suivi, et les MonitoredState lisent et écrivent à travers lui.
+    Hors du suivi d'une machine, un layout partagé expose un DetachedRuntime.
+
+    Attributs:
+        current_index (Optional[int]): L'indice de l'état courant dans le layout.
+        entry_counts (array): Le nombre d'entrées de chaque état.
+        last_entry_times (array): L'instant de la dernière entrée dans chaque état.
+        last_exit_times (array): L'instant de la dernière sortie de chaque état.
+        custom_values (List[any]): La valeur personnalisée de chaque état.
+
+    Utilisation:
+        >>> runtime = layout.new_runtime()
+        >>> count = runtime.entry_counts[layout.index_of(state)]
+    """
+
+    def __init__(self, size: int, current_index: Optional[int] = None, custom_values: Optional[List[any]] = None) -> None:
+        """
+        Initialise un enregistrement vierge.
+
+        Args:
+            size (int): Le nombre d'états.
+            current_index (Optional[int]): L'indice de l'état courant. Par défaut à None.
+            custom_values (List[any], optionnel): Les valeurs personnalisées initiales, copiées superficiellement.
+                Par défaut, None pour chaque état.
+
+        Raises:
+            ValueError: custom_values doit contenir une valeur par état.
+
+        Utilisation:
+            >>> runtime = LayoutRuntime(size=4, current_index=0)
+        """
+        if custom_values is not None and len(custom_values) != size:
+            raise ValueError("custom_values must hold one value per state")
+        self.current_index: Optional[int] = current_index
+        self.entry_counts: array = array('q', bytes(8 * size))
+        self.last_entry_times: array = array('d', bytes(8 * size))
+        self.last_exit_times: array = array('d', bytes(8 * size))
+        self.custom_values: List[any] = list(custom_values) if custom_values is not None else [None] * size
+
+    @staticmethod
+    def view(entry_counts: Sequence[int], last_entry_times: Sequence[float], last_exit_times: Sequence[float],
+             custom_values: Sequence[any], current_index: Optional[int] = None) -> 'LayoutRuntime':
+        """
+        Crée un enregistrement sur des tableaux existants, sans les copier : les écritures des états y sont
+        reportées directement. Sert notamment aux lignes des tableaux d'un BatchEngine.
+
+        Args:
+            entry_counts (Sequence[int]): Le nombre d'entrées de chaque état.
+            last_entry_times (Sequence[float]): L'instant de la dernière entrée dans chaque état.
+            last_exit_times (Sequence[float]): L'instant de la dernière sortie de chaque état.
+            custom_values (Sequence[any]): La valeur personnalisée de chaque état.
+            current_index (Optional[int]): L'indice de l'état courant. Par défaut à None.
+
+        Returns:
+            LayoutRuntime: L'enregistrement.
+
+        Raises:
+            ValueError: Les tableaux doivent contenir une valeur par état.
+
+        Utilisation:
+            >>> runtime = LayoutRuntime.view(counts[i], entries[i], exits[i], values[i])
+        """
+        size = len(custom_values)
+        if not len(entry_counts) == len(last_entry_times) == len(last_exit_times) == size:
+            raise ValueError("arrays must hold one value per state")
+        runtime = LayoutRuntime.__new__(LayoutRuntime)
+        runtime.current_index = current_index
+        runtime.entry_counts = entry_counts
+        runtime.last_entry_times = last_entry_times
+        runtime.last_exit_times = last_exit_times
+        runtime.custom_values = custom_values
+        return runtime
+
+    def __len__(self) -> int:
+        """
+        Obtient le nombre d'états de l'enregistrement.
+
+        Returns:
+            int: Le nombre d'états.
+
+        Utilisation:
+            >>> size = len(runtime)
+        """
+        return len(self.custom_values)
+
+class DetachedRuntime:
+    """
+    Tient la place de l'enregistrement d'exécution d'un layout partagé par plusieurs machines, hors du suivi de
+    chacune d'elles : lire ou écrire les données d'un de ses états lève une erreur au lieu d'atteindre
+    l'enregistrement de la dernière machine suivie. Les accès passent alors par FiniteStateMachine.runtime_scope().
+
+    Utilisation:
+        >>> layout.runtime = DetachedRuntime()
+        >>> with fsm.runtime_scope():
+        ...     state.custom_value = True
+    """
+
+    def __getattr__(self, name: str) -> None:
+        """
+        Refuse tout accès aux données d'exécution.
+
+        Args:
+            name (str): Le nom de l'attribut demandé.
+
+        Raises:
+            ValueError: Le layout est partagé et aucune machine n'est en cours de suivi.
+        """
+        raise ValueError("layout is shared by several machines: access its states within fsm.runtime_scope()")
+
+    def __len__(self) -> int:
+        """
+        Refuse tout accès aux données d'exécution.
+
+        Raises:
+            ValueError: Le layout est partagé et aucune machine n'est en cours de suivi.
+        """
+        raise ValueError("layout is shared by several machines: access its states within fsm.runtime_scope()")
+
+class RuntimeHost:
+    """
+    Porte l'enregistrement d'exécution d'un MonitoredState qui n'appartient à aucun layout compilé.
+
+    Un FiniteStateMachine.Layout compilé joue le même rôle pour ses états : son attribut runtime désigne
+    l'enregistrement de la machine en cours de suivi.
+
+    Attributs:
+        runtime (LayoutRuntime): L'enregistrement d'exécution, d'un seul état.
+
+    Utilisation:
+        >>> host = RuntimeHost()
+        >>> host.runtime.entry_counts[0]
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialise un enregistrement d'un seul état.
+
+        Utilisation:
+            >>> host = RuntimeHost()
+        """
+        self.runtime: LayoutRuntime = LayoutRuntime(1)
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from Robot import Robot
 
 class LedBlinker(SideBlinker):
-    def __init__(self, robot: 'Robot'):
+    def __init__(self, robot: 'Robot', blinker_class: type = Blinker):
         self.robot = robot
 
         def off_right_state_generator() -> MonitoredState:
@@ -32,6 +32,8 @@ class LedBlinker(SideBlinker):
             off_left_state_generator,
             on_left_state_generator,
             off_right_state_generator,
-            on_right_state_generator
+            on_right_state_generator,
+            blinker_class,
+            robot.clock
         )
 
@@ -35,8 +35,9 @@ class ManualControlFSM(FiniteStateMachine):
             state_right])
         
         layout.initial_state = self.state_stop
+        layout.compile()
 
-        super().__init__(layout)
+        super().__init__(layout, clock=self.__robot.clock)
         
         
     def __create_state(self, direction : 'Robot.MoveDirection', side = None, cycle_duration = 1.0, percent_on = .5, begin_on = True, off = False) -> ManualControlState:
@@ -0,0 +1,191 @@
+from enum import Enum, auto
+from typing import Callable, Optional
+from Clock import Clock
+from Tick import Tick
+
+class MotionHandle:
+    """
+    Suit un mouvement lancé sans attendre sa fin, comme une rotation de Robot.turn_degree_async().
+
+    L'achèvement est sondé auprès du matériel au plus une fois par tick (voir Tick) : toutes les conditions
+    d'un même tick voient le même état. Un mouvement remplacé par une autre commande du robot, ou annulé, ne
+    s'achèvera plus.
+
+    Attributs:
+        __poll (Callable[[], bool]): La fonction qui indique si le matériel a atteint sa cible.
+        __stop (Callable[[], None]): La fonction qui arrête le mouvement.
+        __clock (Clock): L'horloge des attentes.
+        __status (MotionHandle.Status): L'état du mouvement.
+        __tick (Optional[int]): Le tick du dernier sondage.
+
+    Méthodes:
+        cancel() -> None:
+            Arrête le mouvement.
+
+        wait(poll_period: float = 0.05) -> bool:
+            Attend la fin du mouvement, en bloquant.
+
+        wait_async(poll_period: float = 0.05) -> bool:
+            Attend la fin du mouvement dans une boucle asyncio.
+
+    Classes:
+        Status (Enum):
+            Représente l'état d'un mouvement.
+
+    Utilisation:
+        >>> motion = robot.turn_degree_async(90)
+        >>> while not motion.done:
+        ...     fsm.track()
+    """
+
+    class Status(Enum):
+        """
+        Représente l'état d'un mouvement.
+
+        Utilisation:
+            >>> motion.status == MotionHandle.Status.COMPLETED
+        """
+        RUNNING = auto()
+        COMPLETED = auto()
+        CANCELLED = auto()
+
+    def __init__(self, poll: Callable[[], bool], stop: Callable[[], None], clock: Optional[Clock] = None) -> None:
+        """
+        Initialise le suivi d'un mouvement en cours.
+
+        Args:
+            poll (Callable[[], bool]): La fonction qui indique si le matériel a atteint sa cible.
+            stop (Callable[[], None]): La fonction qui arrête le mouvement.
+            clock (Clock, optionnel): L'horloge des attentes. Par défaut, Clock.system().
+
+        Utilisation:
+            >>> motion = MotionHandle(lambda: gpg.target_reached(left, right), gpg.stop)
+        """
+        self.__poll = poll
+        self.__stop = stop
+        self.__clock: Clock = Clock.system() if clock is None else clock
+        self.__status: MotionHandle.Status = MotionHandle.Status.RUNNING
+        self.__tick: Optional[int] = None
+
+    @property
+    def status(self) -> 'MotionHandle.Status':
+        """
+        Obtient l'état du mouvement, en sondant le matériel s'il est en cours et ne l'a pas été pendant ce tick.
+
+        Returns:
+            MotionHandle.Status: L'état du mouvement.
+
+        Utilisation:
+            >>> status = motion.status
+        """
+        if self.__status is MotionHandle.Status.RUNNING:
+            tick = Tick.current()
+            if tick is None or tick != self.__tick:
+                self.__tick = tick
+                if self.__poll():
+                    self.__status = MotionHandle.Status.COMPLETED
+        return self.__status
+
+    @status.setter
+    def status(self, value) -> None:
+        """
+        Empêche la modification de l'état.
+
+        Raises:
+            ValueError: status est une propriété en lecture seule.
+
+        Utilisation:
+            >>> motion.status = MotionHandle.Status.COMPLETED
+        """
+        raise ValueError("status is a read-only property")
+
+    @property
+    def done(self) -> bool:
+        """
+        Indique si le mouvement est terminé, qu'il soit achevé ou annulé.
+
+        Returns:
+            bool: True si le mouvement n'est plus en cours.
+
+        Utilisation:
+            >>> if motion.done: ...
+        """
+        return self.status is not MotionHandle.Status.RUNNING
+
+    @property
+    def completed(self) -> bool:
+        """
+        Indique si le mouvement a atteint sa cible.
+
+        Returns:
+            bool: True si le mouvement est achevé.
+
+        Utilisation:
+            >>> if motion.completed: ...
+        """
+        return self.status is MotionHandle.Status.COMPLETED
+
+    def cancel(self) -> None:
+        """
+        Arrête le mouvement s'il est en cours.
+
+        Utilisation:
+            >>> motion.cancel()
+        """
+        if self.status is MotionHandle.Status.RUNNING:
+            self.__stop()
+            self.__status = MotionHandle.Status.CANCELLED
+
+    def _supersede(self) -> None:
+        """
+        Marque le mouvement comme annulé, sans arrêter les moteurs : une autre commande l'a remplacé.
+
+        Utilisation:
+            >>> motion._supersede()
+        """
+        if self.__status is MotionHandle.Status.RUNNING:
+            self.__status = MotionHandle.Status.CANCELLED
+
+    def wait(self, poll_period: float = 0.05) -> bool:
+        """
+        Attend la fin du mouvement, en bloquant le fil d'exécution.
+
+        Args:
+            poll_period (float): Le délai entre deux sondages, en secondes. Par défaut à 0.05.
+
+        Returns:
+            bool: True si le mouvement est achevé, False s'il a été annulé.
+
+        Raises:
+            ValueError: poll_period doit être positif.
+
+        Utilisation:
+            >>> motion.wait()
+        """
+        if poll_period <= 0:
+            raise ValueError("poll_period must be positive")
+        while not self.done:
+            self.__clock.sleep(poll_period)
+        return self.completed
+
+    async def wait_async(self, poll_period: float = 0.05) -> bool:
+        """
+        Attend la fin du mouvement sans bloquer la boucle asyncio (voir Clock.sleep_async).
+
+        Args:
+            poll_period (float): Le délai entre deux sondages, en secondes. Par défaut à 0.05.
+
+        Returns:
+            bool: True si le mouvement est achevé, False s'il a été annulé.
+
+        Raises:
+            ValueError: poll_period doit être positif.
+
+        Utilisation:
+            >>> await motion.wait_async()
+        """
+        if poll_period <= 0:
+            raise ValueError("poll_period must be positive")
+        while not self.done:
+            await self.__clock.sleep_async(poll_period)
+        return self.completed
@@ -0,0 +1,320 @@
+import json
+from enum import Enum
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+
+class Profiler:
+    """
+    Mesure le nombre d'appels et la latence des actions des états, des actions des transitions et des
+    évaluations des conditions.
+
+    L'instrumentation est facultative : State._exec_*_action, Transition._exec_transiting_action et
+    Condition.__bool__ ne consultent que Profiler.active, qui vaut None tant qu'aucun profileur n'est activé.
+    Les durées sont inclusives : l'action de présence d'un état qui suit une machine imbriquée compte le suivi
+    de cette machine, dont les états sont aussi mesurés séparément. Elles sont mesurées en temps réel
+    (time.perf_counter), quelle que soit l'horloge des machines.
+
+    Attributs:
+        active (Optional[Profiler]): Le profileur activé, None si aucun.
+        __records (Dict[Tuple[int, Profiler.Kind], Profiler.Record]): Les mesures, par objet et par type d'appel.
+        __targets (Dict[int, object]): Les objets mesurés, conservés pour que leur identifiant ne soit pas réutilisé.
+        __labels (Dict[int, str]): Les noms des objets mesurés.
+
+    Méthodes:
+        enable() -> None:
+            Active le profileur.
+
+        disable() -> None:
+            Désactive le profileur.
+
+        set_label(target: object, label: str) -> None:
+            Nomme un objet dans les résultats.
+
+        reset() -> None:
+            Efface les mesures.
+
+        report() -> List[Dict[str, Any]]:
+            Obtient les mesures.
+
+        table(sort: str = 'total') -> str:
+            Met en forme les mesures sous forme de tableau.
+
+        to_json() -> str:
+            Met en forme les mesures en JSON.
+
+    Classes:
+        Kind (Enum):
+            Représente le type d'un appel mesuré.
+
+        Record:
+            Les mesures d'un appel.
+
+    Utilisation:
+        >>> with Profiler() as profiler:
+        ...     c64.start(time_budget=10.)
+        >>> print(profiler.table())
+    """
+
+    active: Optional['Profiler'] = None
+
+    class Kind(Enum):
+        """
+        Représente le type d'un appel mesuré.
+
+        Utilisation:
+            >>> kind = Profiler.Kind.CONDITION
+        """
+        ENTERING = 'entering'
+        IN_STATE = 'in_state'
+        EXITING = 'exiting'
+        TRANSITING = 'transiting'
+        CONDITION = 'condition'
+
+    class Record:
+        """
+        Les mesures d'un appel : nombre, durées totale, minimale et maximale, et histogramme des latences.
+
+        L'histogramme compte les appels par puissance de deux de microsecondes : la case i contient les durées
+        comprises entre 2^(i-1) et 2^i µs, la case 0 les durées inférieures à 1 µs.
+
+        Attributs:
+            count (int): Le nombre d'appels.
+            total (float): La durée totale, en secondes.
+            minimum (float): La durée minimale, en secondes.
+            maximum (float): La durée maximale, en secondes.
+            histogram (List[int]): Le nombre d'appels dans chaque case.
+        """
+
+        BUCKETS: int = 32
+
+        def __init__(self) -> None:
+            """
+            Initialise des mesures vides.
+            """
+            self.count: int = 0
+            self.total: float = 0.
+            self.minimum: float = float('inf')
+            self.maximum: float = 0.
+            self.histogram: List[int] = [0] * Profiler.Record.BUCKETS
+
+        def add(self, duration: float) -> None:
+            """
+            Enregistre un appel.
+
+            Args:
+                duration (float): La durée de l'appel, en secondes.
+            """
+            self.count += 1
+            self.total += duration
+            if duration < self.minimum:
+                self.minimum = duration
+            if duration > self.maximum:
+                self.maximum = duration
+            bucket = int(duration * 1e6).bit_length()
+            self.histogram[min(bucket, Profiler.Record.BUCKETS - 1)] += 1
+
+        def percentile(self, fraction: float) -> float:
+            """
+            Estime un centile à partir de l'histogramme, par la borne supérieure de sa case.
+
+            Args:
+                fraction (float): Le centile, entre 0 et 1.
+
+            Returns:
+                float: La durée estimée, en secondes.
+            """
+            threshold = fraction * self.count
+            cumulated = 0
+            for bucket, count in enumerate(self.histogram):
+                cumulated += count
+                if count and cumulated >= threshold:
+                    return min((1 << bucket) * 1e-6, self.maximum)
+            return self.maximum
+
+    def __init__(self) -> None:
+        """
+        Initialise un profileur inactif.
+
+        Utilisation:
+            >>> profiler = Profiler()
+        """
+        self.__records: Dict[Tuple[int, Profiler.Kind], Profiler.Record] = {}
+        self.__targets: Dict[int, object] = {}
+        self.__labels: Dict[int, str] = {}
+        self.__type_counts: Dict[str, int] = {}
+
+    def enable(self) -> None:
+        """
+        Active le profileur, à la place de celui qui l'était.
+
+        Utilisation:
+            >>> profiler.enable()
+        """
+        Profiler.active = self
+
+    def disable(self) -> None:
+        """
+        Désactive le profileur s'il est actif.
+
+        Utilisation:
+            >>> profiler.disable()
+        """
+        if Profiler.active is self:
+            Profiler.active = None
+
+    def __enter__(self) -> 'Profiler':
+        """
+        Active le profileur pour la durée d'un bloc with.
+
+        Returns:
+            Profiler: Le profileur.
+
+        Utilisation:
+            >>> with Profiler() as profiler: ...
+        """
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Désactive le profileur à la sortie du bloc with.
+        """
+        self.disable()
+
+    def set_label(self, target: object, label: str) -> None:
+        """
+        Nomme un état, une transition ou une condition dans les résultats.
+
+        Args:
+            target (object): L'objet mesuré.
+            label (str): Son nom.
+
+        Utilisation:
+            >>> profiler.set_label(home, "home")
+        """
+        self.__targets[id(target)] = target
+        self.__labels[id(target)] = label
+
+    def label(self, target: object) -> str:
+        """
+        Obtient le nom d'un objet dans les résultats : celui donné par set_label(), sinon son type suivi de son
+        rang d'apparition parmi les objets de ce type.
+
+        Args:
+            target (object): L'objet mesuré.
+
+        Returns:
+            str: Son nom.
+
+        Utilisation:
+            >>> profiler.label(home)
+        """
+        key = id(target)
+        label = self.__labels.get(key)
+        if label is None:
+            name = type(target).__name__
+            index = self.__type_counts.get(name, 0)
+            self.__type_counts[name] = index + 1
+            label = f"{name}#{index}"
+            self.__targets[key] = target
+            self.__labels[key] = label
+        return label
+
+    def reset(self) -> None:
+        """
+        Efface les mesures, en conservant les noms.
+
+        Utilisation:
+            >>> profiler.reset()
+        """
+        self.__records.clear()
+
+    def _record(self, target: object, kind: 'Profiler.Kind', start: float) -> None:
+        """
+        Enregistre un appel qui a commencé à l'instant start (time.perf_counter).
+
+        Args:
+            target (object): L'état, la transition ou la condition appelé.
+            kind (Profiler.Kind): Le type d'appel.
+            start (float): L'instant du début de l'appel.
+
+        Utilisation:
+            >>> start = perf_counter()
+            >>> profiler._record(self, Profiler.Kind.ENTERING, start)
+        """
+        duration = perf_counter() - start
+        key = (id(target), kind)
+        record = self.__records.get(key)
+        if record is None:
+            record = self.__records[key] = Profiler.Record()
+            self.label(target)
+        record.add(duration)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Obtient les mesures, une entrée par objet et par type d'appel.
+
+        Returns:
+            List[Dict[str, Any]]: Pour chaque entrée, le nom, le type d'appel, le nombre d'appels, les durées
+            totale, moyenne, minimale, maximale, médiane et au 99e centile en secondes, et l'histogramme.
+
+        Utilisation:
+            >>> entries = profiler.report()
+        """
+        entries = []
+        for (key, kind), record in self.__records.items():
+            entries.append({
+                'name': self.__labels[key],
+                'kind': kind.value,
+                'count': record.count,
+                'total': record.total,
+                'mean': record.total / record.count,
+                'min': record.minimum,
+                'max': record.maximum,
+                'p50': record.percentile(0.5),
+                'p99': record.percentile(0.99),
+                'histogram_us': {str(1 << bucket): count for bucket, count in enumerate(record.histogram) if count}
+            })
+        return entries
+
+    def table(self, sort: str = 'total') -> str:
+        """
+        Met en forme les mesures sous forme de tableau, en microsecondes.
+
+        Args:
+            sort (str): La colonne de tri décroissant : 'total', 'count', 'mean', 'max' ou 'p99'. Par défaut à 'total'.
+
+        Returns:
+            str: Le tableau.
+
+        Raises:
+            ValueError: La colonne de tri n'existe pas.
+
+        Utilisation:
+            >>> print(profiler.table(sort='max'))
+        """
+        if sort not in ('total', 'count', 'mean', 'max', 'p99'):
+            raise ValueError("sort must be one of 'total', 'count', 'mean', 'max' or 'p99'")
+        entries = sorted(self.report(), key=lambda entry: entry[sort], reverse=True)
+        width = max([len(entry['name']) for entry in entries] + [4])
+        lines = [f"{'name':<{width}}  {'kind':<10}  {'count':>8}  {'total us':>12}  {'mean us':>9}  {'p50 us':>9}  {'p99 us':>9}  {'max us':>9}"]
+        for entry in entries:
+            lines.append(
+                f"{entry['name']:<{width}}  {entry['kind']:<10}  {entry['count']:>8}  {entry['total'] * 1e6:>12.1f}  "
+                f"{entry['mean'] * 1e6:>9.2f}  {entry['p50'] * 1e6:>9.2f}  {entry['p99'] * 1e6:>9.2f}  {entry['max'] * 1e6:>9.2f}")
+        return "\n".join(lines)
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """
+        Met en forme les mesures en JSON (voir report()).
+
+        Args:
+            indent (Optional[int]): L'indentation. Par défaut à 2.
+
+        Returns:
+            str: Le document JSON.
+
+        Utilisation:
+            >>> open("profile.json", "w").write(profiler.to_json())
+        """
+        return json.dumps(self.report(), indent=indent)
@@ -0,0 +1,271 @@
+import heapq
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+from Clock import Clock
+from FiniteStateMachine import FiniteStateMachine
+from RateStatistics import RateStatistics
+
+class RateScheduler:
+    """
+    Suit plusieurs machines à états finis et tâches périodiques sur un seul fil, chacune à sa propre fréquence.
+
+    Les composants sont rangés dans un tas par échéance : le planificateur dort jusqu'à la plus proche, exécute
+    le composant puis le replace une période plus loin. La période d'une machine est celle de son état courant
+    s'il en déclare une (State.rate), sinon la sienne (FiniteStateMachine.rate). Un composant en retard de plus
+    d'une période reprend sa cadence à partir de l'instant courant plutôt que d'enchaîner les exécutions.
+
+    La cadence effective et la gigue de chaque composant sont mesurées (voir RateStatistics). Les conditions
+    dont la fréquence est déclarée (Condition.rate) exposent les leurs.
+
+    Attributs:
+        __clock (Clock): L'horloge du planificateur.
+        __components (List[RateScheduler.Component]): Les composants suivis.
+        __running (bool): Indique si le planificateur fonctionne.
+
+    Méthodes:
+        add_fsm(fsm: FiniteStateMachine, rate: float = None, name: str = None) -> RateStatistics:
+            Ajoute une machine à états finis.
+
+        add_task(callback: Callable[[], Any], rate: float, name: str = None) -> RateStatistics:
+            Ajoute une fonction appelée périodiquement.
+
+        start(time_budget: float = None, reset: bool = True) -> None:
+            Fait fonctionner les composants.
+
+        stop() -> None:
+            Arrête le planificateur.
+
+    Classes:
+        Component:
+            Un composant suivi par le planificateur.
+
+    Utilisation:
+        >>> scheduler = RateScheduler(clock=c64.clock)
+        >>> scheduler.add_fsm(c64, rate=100.)
+        >>> scheduler.add_task(c64.robot.led_blinker.track, rate=50.)
+        >>> scheduler.start(time_budget=60.)
+        >>> scheduler.statistics
+    """
+
+    class Component:
+        """
+        Un composant suivi par le planificateur.
+
+        Attributs:
+            name (str): Le nom du composant.
+            fsm (Optional[FiniteStateMachine]): La machine à états finis, None pour une tâche.
+            callback (Callable[[], Any]): La fonction exécutée à chaque échéance.
+            rate (Optional[float]): La fréquence du composant, en Hz.
+            statistics (RateStatistics): La cadence effective du composant.
+        """
+
+        def __init__(self, name: str, fsm: Optional[FiniteStateMachine], callback: Callable[[], Any], rate: Optional[float]) -> None:
+            """
+            Initialise le composant.
+
+            Args:
+                name (str): Le nom du composant.
+                fsm (Optional[FiniteStateMachine]): La machine à états finis, None pour une tâche.
+                callback (Callable[[], Any]): La fonction exécutée à chaque échéance.
+                rate (Optional[float]): La fréquence du composant, en Hz.
+            """
+            self.name: str = name
+            self.fsm: Optional[FiniteStateMachine] = fsm
+            self.callback: Callable[[], Any] = callback
+            self.rate: Optional[float] = rate
+            self.statistics: RateStatistics = RateStatistics(1. / rate if rate is not None else None)
+
+        @property
+        def period(self) -> float:
+            """
+            Obtient la période en vigueur du composant.
+
+            Returns:
+                float: La période, en secondes.
+            """
+            if self.fsm is not None:
+                state = self.fsm.current_applicative_state
+                if state is not None and state.rate is not None:
+                    return 1. / state.rate
+            return 1. / self.rate
+
+    def __init__(self, clock: Optional[Clock] = None) -> None:
+        """
+        Initialise un planificateur vide.
+
+        Args:
+            clock (Clock, optionnel): L'horloge du planificateur. Par défaut, Clock.system().
+
+        Utilisation:
+            >>> scheduler = RateScheduler()
+        """
+        self.__clock: Clock = Clock.system() if clock is None else clock
+        self.__components: List[RateScheduler.Component] = []
+        self.__running: bool = False
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Obtient l'horloge du planificateur.
+
+        Returns:
+            Clock: L'horloge du planificateur.
+
+        Utilisation:
+            >>> clock = scheduler.clock
+        """
+        return self.__clock
+
+    @property
+    def statistics(self) -> Dict[str, RateStatistics]:
+        """
+        Obtient la cadence effective de chaque composant, par nom.
+
+        Returns:
+            Dict[str, RateStatistics]: Les mesures de chaque composant.
+
+        Utilisation:
+            >>> for name, statistics in scheduler.statistics.items():
+            ...     print(name, statistics)
+        """
+        return {component.name: component.statistics for component in self.__components}
+
+    def __add(self, name: Optional[str], fsm: Optional[FiniteStateMachine], callback: Callable[[], Any], rate: Optional[float]) -> RateStatistics:
+        """
+        Ajoute un composant.
+
+        Args:
+            name (Optional[str]): Le nom du composant, généré à partir de son type si None.
+            fsm (Optional[FiniteStateMachine]): La machine à états finis, None pour une tâche.
+            callback (Callable[[], Any]): La fonction exécutée à chaque échéance.
+            rate (Optional[float]): La fréquence du composant, en Hz.
+
+        Returns:
+            RateStatistics: Les mesures du composant.
+
+        Raises:
+            ValueError: Le nom est déjà utilisé.
+        """
+        if name is None:
+            source = fsm if fsm is not None else callback
+            name = f"{getattr(source, '__qualname__', type(source).__name__)}-{len(self.__components)}"
+        if any(component.name == name for component in self.__components):
+            raise ValueError("name is already used")
+        component = RateScheduler.Component(name, fsm, callback, rate)
+        self.__components.append(component)
+        return component.statistics
+
+    def add_fsm(self, fsm: FiniteStateMachine, rate: float = None, name: str = None) -> RateStatistics:
+        """
+        Ajoute une machine à états finis, suivie jusqu'à atteindre un état terminal ou être arrêtée.
+
+        Args:
+            fsm (FiniteStateMachine): La machine à états finis, qui doit utiliser l'horloge du planificateur.
+            rate (float, optionnel): La fréquence de suivi, en Hz. Par défaut, celle de la machine (FiniteStateMachine.rate).
+            name (str, optionnel): Le nom de la machine dans les mesures.
+
+        Returns:
+            RateStatistics: La cadence effective de la machine.
+
+        Raises:
+            ValueError: La machine n'utilise pas l'horloge du planificateur.
+            ValueError: Aucune fréquence n'est déclarée, ou elle n'est pas positive.
+            ValueError: Le nom est déjà utilisé.
+
+        Utilisation:
+            >>> scheduler.add_fsm(c64, rate=100.)
+        """
+        if fsm.clock is not self.__clock:
+            raise ValueError("fsm must use the scheduler clock")
+        rate = fsm.rate if rate is None else rate
+        if rate is None or rate <= 0:
+            raise ValueError("rate must be positive")
+        return self.__add(name, fsm, fsm.track, rate)
+
+    def add_task(self, callback: Callable[[], Any], rate: float, name: str = None) -> RateStatistics:
+        """
+        Ajoute une fonction appelée périodiquement, tant que le planificateur fonctionne.
+
+        Args:
+            callback (Callable[[], Any]): La fonction à appeler.
+            rate (float): La fréquence d'appel, en Hz.
+            name (str, optionnel): Le nom de la tâche dans les mesures.
+
+        Returns:
+            RateStatistics: La cadence effective de la tâche.
+
+        Raises:
+            ValueError: rate doit être positive.
+            ValueError: Le nom est déjà utilisé.
+
+        Utilisation:
+            >>> scheduler.add_task(robot.led_blinker.track, rate=50.)
+        """
+        if rate is None or rate <= 0:
+            raise ValueError("rate must be positive")
+        return self.__add(name, None, callback, rate)
+
+    def start(self, time_budget: float = None, reset: bool = True) -> None:
+        """
+        Fait fonctionner les composants jusqu'à la fin du budget de temps, jusqu'à l'appel de stop() ou, sans
+        budget, jusqu'à ce que toutes les machines soient arrêtées.
+
+        Args:
+            time_budget (float): Le budget de temps, dans le temps de l'horloge. Par défaut à None.
+            reset (bool): Indique si les machines à états finis doivent être réinitialisées au démarrage.
+
+        Utilisation:
+            >>> scheduler.start(time_budget=60.)
+        """
+        clock = self.__clock
+        for component in self.__components:
+            component.statistics.reset()
+            if component.fsm is not None:
+                component.fsm._prepare_run(reset)
+        now = clock.now()
+        end_time = now + time_budget if time_budget is not None else None
+        sequence = itertools.count()
+        heap = [(now, next(sequence), component) for component in self.__components]
+        heapq.heapify(heap)
+        machines = sum(1 for component in self.__components if component.fsm is not None)
+        self.__running = True
+
+        while heap and self.__running:
+            due, _, component = heap[0]
+            if end_time is not None and due >= end_time:
+                break
+            now = clock.now()
+            if due > now:
+                clock.sleep(due - now)
+                now = clock.now()
+            heapq.heappop(heap)
+            component.statistics.record(now)
+            if component.fsm is not None:
+                if not component.callback():
+                    component.fsm.stop()
+                    machines -= 1
+                    if machines == 0:
+                        break
+                    continue
+                if component.fsm.current_operational_state != FiniteStateMachine.OperationalState.RUNNING:
+                    machines -= 1
+                    if machines == 0:
+                        break
+                    continue
+            else:
+                component.callback()
+            period = component.period
+            due += period
+            if due + period <= now:
+                due = now + period
+            heapq.heappush(heap, (due, next(sequence), component))
+        self.__running = False
+
+    def stop(self) -> None:
+        """
+        Arrête le planificateur après le composant en cours. Peut être appelée depuis une action ou une tâche.
+
+        Utilisation:
+            >>> scheduler.stop()
+        """
+        self.__running = False
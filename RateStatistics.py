@@ -0,0 +1,169 @@
+from math import sqrt
+from typing import Optional
+
+class RateStatistics:
+    """
+    Mesure la cadence effective d'un composant exécuté périodiquement (machine à états finis, tâche, condition).
+
+    Les intervalles entre deux exécutions consécutives sont accumulés en ligne (moyenne et variance de Welford),
+    sans conserver d'historique.
+
+    Attributs:
+        __period (Optional[float]): La période visée, en secondes.
+        __count (int): Le nombre d'exécutions enregistrées.
+        __last_time (Optional[float]): L'instant de la dernière exécution.
+        __mean (float): La moyenne des intervalles.
+        __m2 (float): La somme des carrés des écarts à la moyenne des intervalles.
+        __max_interval (float): Le plus grand intervalle.
+
+    Méthodes:
+        record(time: float) -> None:
+            Enregistre une exécution.
+
+        reset() -> None:
+            Efface les mesures.
+
+    Utilisation:
+        >>> statistics = RateStatistics(period=0.02)
+        >>> statistics.record(clock.now())
+        >>> statistics.rate, statistics.jitter
+    """
+
+    def __init__(self, period: Optional[float] = None) -> None:
+        """
+        Initialise des mesures vides.
+
+        Args:
+            period (float, optionnel): La période visée, en secondes. Par défaut à None.
+
+        Utilisation:
+            >>> statistics = RateStatistics(period=0.02)
+        """
+        self.__period: Optional[float] = period
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Efface les mesures.
+
+        Utilisation:
+            >>> statistics.reset()
+        """
+        self.__count: int = 0
+        self.__last_time: Optional[float] = None
+        self.__mean: float = 0.
+        self.__m2: float = 0.
+        self.__max_interval: float = 0.
+
+    def record(self, time: float) -> None:
+        """
+        Enregistre une exécution.
+
+        Args:
+            time (float): L'instant de l'exécution.
+
+        Utilisation:
+            >>> statistics.record(clock.now())
+        """
+        if self.__last_time is not None:
+            interval = time - self.__last_time
+            intervals = self.__count
+            delta = interval - self.__mean
+            self.__mean += delta / intervals
+            self.__m2 += delta * (interval - self.__mean)
+            if interval > self.__max_interval:
+                self.__max_interval = interval
+        self.__count += 1
+        self.__last_time = time
+
+    @property
+    def period(self) -> Optional[float]:
+        """
+        Obtient la période visée.
+
+        Returns:
+            Optional[float]: La période visée, en secondes, None si elle n'est pas déclarée.
+
+        Utilisation:
+            >>> period = statistics.period
+        """
+        return self.__period
+
+    @property
+    def count(self) -> int:
+        """
+        Obtient le nombre d'exécutions enregistrées.
+
+        Returns:
+            int: Le nombre d'exécutions.
+
+        Utilisation:
+            >>> count = statistics.count
+        """
+        return self.__count
+
+    @property
+    def mean_period(self) -> Optional[float]:
+        """
+        Obtient l'intervalle moyen entre deux exécutions.
+
+        Returns:
+            Optional[float]: L'intervalle moyen, en secondes, None avant deux exécutions.
+
+        Utilisation:
+            >>> mean_period = statistics.mean_period
+        """
+        return self.__mean if self.__count > 1 else None
+
+    @property
+    def rate(self) -> Optional[float]:
+        """
+        Obtient la fréquence effective.
+
+        Returns:
+            Optional[float]: La fréquence, en Hz, None avant deux exécutions.
+
+        Utilisation:
+            >>> rate = statistics.rate
+        """
+        return 1. / self.__mean if self.__count > 1 and self.__mean > 0 else None
+
+    @property
+    def jitter(self) -> Optional[float]:
+        """
+        Obtient la gigue, écart type des intervalles entre deux exécutions.
+
+        Returns:
+            Optional[float]: La gigue, en secondes, None avant deux exécutions.
+
+        Utilisation:
+            >>> jitter = statistics.jitter
+        """
+        return sqrt(self.__m2 / (self.__count - 1)) if self.__count > 1 else None
+
+    @property
+    def max_interval(self) -> Optional[float]:
+        """
+        Obtient le plus grand intervalle entre deux exécutions.
+
+        Returns:
+            Optional[float]: Le plus grand intervalle, en secondes, None avant deux exécutions.
+
+        Utilisation:
+            >>> max_interval = statistics.max_interval
+        """
+        return self.__max_interval if self.__count > 1 else None
+
+    def __repr__(self) -> str:
+        """
+        Représente les mesures sous forme lisible.
+
+        Returns:
+            str: La fréquence effective, la gigue et le nombre d'exécutions.
+
+        Utilisation:
+            >>> print(statistics)
+        """
+        if self.__count < 2:
+            return f"RateStatistics(count={self.__count})"
+        return f"RateStatistics(rate={self.rate:.2f} Hz, jitter={self.jitter * 1e3:.3f} ms, count={self.__count})"
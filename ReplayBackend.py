@@ -0,0 +1,225 @@
+from typing import Dict, List, Optional, Tuple
+from RobotBackend import RobotBackend
+from InputRecorder import InputRecorder
+from Clock import VirtualClock
+
+class ReplayBackend(RobotBackend):
+    """
+    Matériel rejoué à partir d'un journal d'entrées (voir InputRecorder), pour reproduire hors du robot une exécution
+    enregistrée sur le terrain.
+
+    Chaque lecture de la télécommande, du capteur de distance ou de l'achèvement d'une rotation renvoie la lecture
+    suivante de la même source dans le journal, et fait avancer l'horloge virtuelle jusqu'à son instant
+    d'enregistrement : la machine à états finis voit les mêmes valeurs, dans le même ordre et aux mêmes instants,
+    aussi vite que possible. La période de suivi du rejeu doit être celle de l'enregistrement.
+
+    Le temps écoulé entre deux lectures (latence des sorties, calcul) n'est pas journalisé : le rejeu est exact
+    à l'instant près tant qu'il reste négligeable devant la période de suivi. Sinon, une condition temporelle
+    évaluée entre deux lectures peut basculer un tick plus tard qu'à l'enregistrement ; la divergence se voit
+    alors à remaining ou à exhausted. Une source épuisée renvoie sa dernière valeur, ou une valeur neutre si elle
+    n'a jamais été lue (touche NONE, distance nulle, rotation achevée), et exhausted devient vrai.
+
+    Les commandes des sorties et des moteurs sont ignorées.
+
+    Attributs:
+        DEFAULTS (Dict[InputRecorder.Source, int]): La valeur d'une source jamais lue.
+        __clock (VirtualClock): L'horloge virtuelle du rejeu.
+        __entries (Dict[InputRecorder.Source, List[Tuple[float, int]]]): Les lectures enregistrées, par source.
+        __cursors (Dict[InputRecorder.Source, int]): La position de la prochaine lecture de chaque source.
+        __exhausted (bool): Indique si une source a été lue au-delà de sa dernière lecture enregistrée.
+
+    Utilisation:
+        >>> backend = ReplayBackend("inputs.bin")
+        >>> c64 = C64(clock=backend.clock, backend=backend)
+        >>> c64.start(poll_period=0.02)
+    """
+
+    DEFAULTS: Dict[InputRecorder.Source, int] = {
+        InputRecorder.Source.REMOTE: 0,
+        InputRecorder.Source.DISTANCE: 0,
+        InputRecorder.Source.TARGET_REACHED: 1
+    }
+
+    class Remote:
+        """
+        Télécommande rejouée.
+        """
+
+        def __init__(self, backend: 'ReplayBackend') -> None:
+            self.__backend = backend
+
+        def read(self) -> int:
+            """Lit la touche enfoncée."""
+            return self.__backend._next(InputRecorder.Source.REMOTE)
+
+    class Servo:
+        """
+        Servomoteur rejoué : ses commandes sont ignorées.
+        """
+
+        def rotate_servo(self, position: int) -> None:
+            """Tourne le servomoteur à une position."""
+            pass
+
+        def reset_servo(self) -> None:
+            """Ramène le servomoteur à sa position par défaut."""
+            pass
+
+    class DistanceSensor:
+        """
+        Capteur de distance rejoué.
+        """
+
+        def __init__(self, backend: 'ReplayBackend') -> None:
+            self.__backend = backend
+
+        def read_mm(self) -> int:
+            """Lit la distance, en millimètres."""
+            return self.__backend._next(InputRecorder.Source.DISTANCE)
+
+    def __init__(self, path: str, clock: Optional[VirtualClock] = None) -> None:
+        """
+        Charge un journal d'entrées.
+
+        Args:
+            path (str): Le chemin du journal.
+            clock (VirtualClock, optionnel): L'horloge virtuelle du rejeu, dont le temps doit partir de 0. Par défaut, une nouvelle VirtualClock.
+
+        Raises:
+            ValueError: Le fichier n'est pas un journal d'entrées.
+
+        Utilisation:
+            >>> backend = ReplayBackend("inputs.bin")
+        """
+        self.__clock: VirtualClock = VirtualClock() if clock is None else clock
+        _, entries = InputRecorder.read(path)
+        self.__entries: Dict[InputRecorder.Source, List[Tuple[float, int]]] = {source: [] for source in InputRecorder.Source}
+        for time, source, value in entries:
+            self.__entries[source].append((time, value))
+        self.__cursors: Dict[InputRecorder.Source, int] = {source: 0 for source in InputRecorder.Source}
+        self.__exhausted: bool = False
+
+    @property
+    def clock(self) -> VirtualClock:
+        """
+        Obtient l'horloge virtuelle du rejeu.
+
+        Returns:
+            VirtualClock: L'horloge du rejeu.
+        """
+        return self.__clock
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        Indique si une source a été lue au-delà de sa dernière lecture enregistrée.
+
+        Returns:
+            bool: True si le rejeu a dépassé le journal.
+        """
+        return self.__exhausted
+
+    @property
+    def remaining(self) -> int:
+        """
+        Obtient le nombre de lectures enregistrées qui n'ont pas encore été rejouées.
+
+        Returns:
+            int: Le nombre de lectures restantes, toutes sources confondues.
+        """
+        return sum(len(entries) - self.__cursors[source] for source, entries in self.__entries.items())
+
+    def _next(self, source: InputRecorder.Source) -> int:
+        """
+        Rejoue la lecture suivante d'une source et fait avancer l'horloge jusqu'à son instant.
+
+        Args:
+            source (InputRecorder.Source): La source lue.
+
+        Returns:
+            int: La valeur enregistrée.
+        """
+        entries = self.__entries[source]
+        cursor = self.__cursors[source]
+        if cursor == len(entries):
+            self.__exhausted = True
+            return entries[-1][1] if entries else ReplayBackend.DEFAULTS[source]
+        time, value = entries[cursor]
+        self.__cursors[source] = cursor + 1
+        self.__clock.advance_to(time)
+        return value
+
+    def init_remote(self, port: str) -> 'ReplayBackend.Remote':
+        return ReplayBackend.Remote(self)
+
+    def init_servo(self, port: str) -> 'ReplayBackend.Servo':
+        return ReplayBackend.Servo()
+
+    def init_distance_sensor(self, port: str) -> 'ReplayBackend.DistanceSensor':
+        return ReplayBackend.DistanceSensor(self)
+
+    def led_on(self, led: str) -> None:
+        pass
+
+    def led_off(self, led: str) -> None:
+        pass
+
+    def set_left_eye_color(self, color: Tuple[int, int, int]) -> None:
+        pass
+
+    def set_right_eye_color(self, color: Tuple[int, int, int]) -> None:
+        pass
+
+    def set_eye_color(self, color: Tuple[int, int, int]) -> None:
+        pass
+
+    def open_left_eye(self) -> None:
+        pass
+
+    def close_left_eye(self) -> None:
+        pass
+
+    def open_right_eye(self) -> None:
+        pass
+
+    def close_right_eye(self) -> None:
+        pass
+
+    def open_eyes(self) -> None:
+        pass
+
+    def close_eyes(self) -> None:
+        pass
+
+    def forward(self) -> None:
+        pass
+
+    def backward(self) -> None:
+        pass
+
+    def left(self) -> None:
+        pass
+
+    def right(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def turn_degrees(self, degrees: float, blocking: bool = True) -> Tuple[float, float]:
+        """
+        Ignore la rotation : son achèvement est rejoué par target_reached().
+
+        Returns:
+            Tuple[float, float]: Des cibles nulles.
+        """
+        return 0., 0.
+
+    def target_reached(self, left_target: float, right_target: float) -> bool:
+        """
+        Rejoue l'achèvement de la rotation en cours.
+
+        Returns:
+            bool: La valeur enregistrée.
+        """
+        return self._next(InputRecorder.Source.TARGET_REACHED) != 0
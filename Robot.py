@@ -1,6 +1,19 @@
 from enum import Enum, auto
+import threading
 import time
-import easygopigo3 as gpg
+try:
+    import easygopigo3 as gpg
+except ImportError:
+    # Off the robot, pass a backend such as SimulatedBackend.
+    gpg = None
+from Tick import Tick
+from DistanceSampler import DistanceSampler
+from MotionHandle import MotionHandle
+from Clock import Clock
+from RobotBackend import RobotBackend
+from InputRecorder import InputRecorder
+from typing import Callable, Dict, Optional
+from collections import Counter
 
 class Robot():
 
@@ -43,64 +56,121 @@ class Robot():
         STOP = auto()
         ROTATE = auto()
 
-    def __init__(self) -> None:
-        from LedBlinker import LedBlinker
-        from EyeBlinker import EyeBlinker
-
-        try:
-            self.__gpg = gpg.EasyGoPiGo3()
-        except:
-            self.__gpg = None
+    def __init__(self, blinker_class : Optional[type] = None, clock : Optional[Clock] = None, backend : Optional[RobotBackend] = None, fast_start : bool = False) -> None:
+        # fast_start builds the blinkers on first use. The peripherals share one bus, so they are always probed in turn.
+        start = time.perf_counter()
+        self.__startup_timings = {}
+        # One bus for every peripheral: calls from the main loop and from the distance sampler thread are serialised.
+        self.__bus = threading.RLock()
+        self.__clock = Clock.system() if clock is None else clock
+
+        # Without a backend, drive the GoPiGo3 board through easygopigo3.
+        if backend is not None:
+            self.__gpg = backend
+        else:
+            try:
+                self.__gpg = gpg.EasyGoPiGo3()
+            except:
+                self.__gpg = None
+        self.__startup_timings['board'] = time.perf_counter() - start
 
         self.__zero_servo_telemetre = 81
         self.__zero_servo_camera = 93
 
+        probe_start = time.perf_counter()
         self.init_remote()
         self.init_servo_motor()
         self.init_distance_sensor()
+        self.__startup_timings['peripherals'] = time.perf_counter() - probe_start
 
         self.right_eye_color = None
         self.left_eye_color = None
+        # Shadow registers: last value commanded to each output, used to skip writes that change nothing.
+        self.__outputs = {}
+        self.__suppressed_writes = Counter()
         self.max_distance = 300.0
+        # Result of reached_max_distance() when the sampler has no fresh sample: assume an obstacle.
+        self.stale_distance_reached = True
         self.__old_key = self.KeyCodes.NONE
 
         self.__current_key = self.KeyCodes.NONE
+        self.__edge_key = self.KeyCodes.NONE
+        self.__input_tick = None
+        self.__edge_tick = None
+        self.__range_sensor_angle = 0
+        self.__distance_sampler = None
+        self.__motion = None
+        self.__recorder = None
+
+        # Blinker runs an internal state machine, PhaseBlinker computes the same output from the phase.
+        self.__blinker_class = blinker_class
+        self.__led_blinker = None
+        self.__eye_blinker = None
+        if not fast_start:
+            blinker_start = time.perf_counter()
+            self.led_blinker
+            self.eye_blinker
+            self.__startup_timings['blinkers'] = time.perf_counter() - blinker_start
+        self.__startup_timings['total'] = time.perf_counter() - start
+
+    def __probe(self, name : str, init : Callable, port : str):
+        # A peripheral that fails to initialise is reported as missing (None).
+        start = time.perf_counter()
+        try:
+            with self.__bus:
+                device = init(port=port)
+        except:
+            device = None
+        self.__startup_timings[name] = time.perf_counter() - start
+        return device
 
-        self.led_blinker = LedBlinker(self)
-        self.eye_blinker = EyeBlinker(self)
-
-        
-        
     def init_remote(self):
         remote_control_port = 'AD1'
-        try:
-            self.__remote_control = self.__gpg.init_remote(port=remote_control_port)
-        except:
-            self.__remote_control = None
+        self.__remote_control = self.__probe('remote', lambda port: self.__gpg.init_remote(port=port), remote_control_port)
 
     def init_servo_motor(self):
         servo_cam_port = 'SERVO1'
         servo_range_port = 'SERVO2'
 
-        try:
-            self.__camera_servo_control = self.__gpg.init_servo(port=servo_cam_port)
-        except:
-            self.__camera_servo_control = None
-
-        try:
-            self.__range_sensor_servo_control = self.__gpg.init_servo(port=servo_range_port)
-        except:
-            self.__range_sensor_servo_control = None
+        self.__camera_servo_control = self.__probe('camera_servo', lambda port: self.__gpg.init_servo(port=port), servo_cam_port)
+        self.__range_sensor_servo_control = self.__probe('range_servo', lambda port: self.__gpg.init_servo(port=port), servo_range_port)
 
         if self.__camera_servo_control and self.__range_sensor_servo_control:
             self.reset_servos()
 
     def init_distance_sensor(self):
         distance_sensor_port = 'I2C'
-        try:
-            self.__distance_sensor = self.__gpg.init_distance_sensor(port=distance_sensor_port)
-        except:
-            self.__distance_sensor = None
+        self.__distance_sensor = self.__probe('distance_sensor', lambda port: self.__gpg.init_distance_sensor(port=port), distance_sensor_port)
+
+    @property
+    def led_blinker(self) -> 'LedBlinker':
+        if self.__led_blinker is None:
+            from Blinker import Blinker
+            from LedBlinker import LedBlinker
+            self.__led_blinker = LedBlinker(self, Blinker if self.__blinker_class is None else self.__blinker_class)
+        return self.__led_blinker
+
+    @property
+    def eye_blinker(self) -> 'EyeBlinker':
+        if self.__eye_blinker is None:
+            from Blinker import Blinker
+            from EyeBlinker import EyeBlinker
+            self.__eye_blinker = EyeBlinker(self, Blinker if self.__blinker_class is None else self.__blinker_class)
+        return self.__eye_blinker
+
+    @property
+    def startup_timings(self) -> Dict[str, float]:
+        # Wall-clock seconds spent in each step of the construction (board, each probe, peripherals, blinkers, total).
+        return dict(self.__startup_timings)
+
+    @property
+    def clock(self) -> Clock:
+        return self.__clock
+
+    @property
+    def motion(self) -> Optional[MotionHandle]:
+        # Last motion started by turn_degree_async() or move(ROTATE), None if there was none.
+        return self.__motion
 
     @property
     def is_instanciated(self) -> bool:
@@ -111,98 +181,256 @@ class Robot():
         return self.__remote_control is not None and self.__camera_servo_control is not None and self.__range_sensor_servo_control is not None and self.__distance_sensor is not None
 
 
+    @property
+    def suppressed_writes(self) -> Dict[str, int]:
+        return dict(self.__suppressed_writes)
+
+    @property
+    def suppressed_write_count(self) -> int:
+        return sum(self.__suppressed_writes.values())
+
+    def invalidate_outputs(self) -> None:
+        # Forget the shadow registers so that the next command of each output is written.
+        self.__outputs.clear()
+
+    def __coalesced_write(self, output : str, value, write : Callable, *args) -> bool:
+        if output in self.__outputs and self.__outputs[output] == value:
+            self.__suppressed_writes[output] += 1
+            return False
+        self.__outputs.pop(output, None)
+        with self.__bus:
+            write(*args)
+        self.__outputs[output] = value
+        return True
+
     def turn_on_left_led(self) -> None:
-        self.__gpg.led_on('left')
+        self.__coalesced_write('left_led', True, self.__gpg.led_on, 'left')
 
     def turn_off_left_led(self) -> None:
-        self.__gpg.led_off('left')
+        self.__coalesced_write('left_led', False, self.__gpg.led_off, 'left')
 
     def turn_on_right_led(self) -> None:
-        self.__gpg.led_on('right')
+        self.__coalesced_write('right_led', True, self.__gpg.led_on, 'right')
         
     def turn_off_right_led(self) -> None:
-        self.__gpg.led_off('right')
+        self.__coalesced_write('right_led', False, self.__gpg.led_off, 'right')
 
     def set_left_eye_color(self, color : str) -> None:
-        self.__gpg.set_left_eye_color(self.COLORS[color])
+        # A new colour is only shown when the eye is opened again.
+        if self.__coalesced_write('left_eye_color', color, self.__gpg.set_left_eye_color, self.COLORS[color]):
+            self.__outputs.pop('left_eye', None)
         self.left_eye_color = color
 
     def turn_on_left_eye(self) -> None:
-        self.__gpg.open_left_eye()
+        self.__coalesced_write('left_eye', True, self.__gpg.open_left_eye)
 
     def turn_off_left_eye(self) -> None:
-        self.__gpg.close_left_eye()
+        self.__coalesced_write('left_eye', False, self.__gpg.close_left_eye)
 
     def set_right_eye_color(self, color : str) -> None:
-        self.__gpg.set_right_eye_color(self.COLORS[color])
+        if self.__coalesced_write('right_eye_color', color, self.__gpg.set_right_eye_color, self.COLORS[color]):
+            self.__outputs.pop('right_eye', None)
         self.right_eye_color = color
 
     def turn_on_right_eye(self) -> None:
-        self.__gpg.open_right_eye()
+        self.__coalesced_write('right_eye', True, self.__gpg.open_right_eye)
 
     def turn_off_right_eye(self) -> None:
-        self.__gpg.close_right_eye()
+        self.__coalesced_write('right_eye', False, self.__gpg.close_right_eye)
 
     def set_eyes_color(self, color : str) -> None:
-        self.__gpg.set_eye_color(self.COLORS[color])
+        if self.__outputs.get('left_eye_color') == color and self.__outputs.get('right_eye_color') == color:
+            self.__suppressed_writes['eyes_color'] += 1
+        else:
+            self.__outputs.pop('left_eye_color', None)
+            self.__outputs.pop('right_eye_color', None)
+            self.__outputs.pop('left_eye', None)
+            self.__outputs.pop('right_eye', None)
+            with self.__bus:
+                self.__gpg.set_eye_color(self.COLORS[color])
+            self.__outputs['left_eye_color'] = color
+            self.__outputs['right_eye_color'] = color
         self.left_eye_color = color
         self.right_eye_color = color
 
     def turn_on_eyes(self) -> None:
-        self.__gpg.open_eyes()
+        self.__set_eyes(True, self.__gpg.open_eyes)
         
     def turn_off_eyes(self) -> None:
-        self.__gpg.close_eyes()
+        self.__set_eyes(False, self.__gpg.close_eyes)
+
+    def __set_eyes(self, opened : bool, write : Callable[[], None]) -> None:
+        if self.__outputs.get('left_eye') == opened and self.__outputs.get('right_eye') == opened:
+            self.__suppressed_writes['eyes'] += 1
+            return
+        self.__outputs.pop('left_eye', None)
+        self.__outputs.pop('right_eye', None)
+        with self.__bus:
+            write()
+        self.__outputs['left_eye'] = opened
+        self.__outputs['right_eye'] = opened
 
     def initialize_distance_sensor(self) -> None:
-        self.range_sensor_servo_control.reset_servo()
+        with self.__bus:
+            self.range_sensor_servo_control.reset_servo()
 
     def stop_robot(self) -> None:
-        self.__gpg.stop()
-
-    def move(self, config : MoveDirection) -> None:
-        if config == Robot.MoveDirection.FORWARD:
-            self.__gpg.forward()
-        elif config == Robot.MoveDirection.RIGHT:
-            self.__gpg.right()
-        elif config == Robot.MoveDirection.LEFT:
-            self.__gpg.left()
-        elif config == Robot.MoveDirection.BACKWARD:
-            self.__gpg.backward()
-        elif config == Robot.MoveDirection.STOP:
+        self.__supersede_motion()
+        self.__stop_motors()
+
+    def __stop_motors(self) -> None:
+        with self.__bus:
             self.__gpg.stop()
-        elif config == Robot.MoveDirection.ROTATE:
-            self.__gpg.turn_degrees(900)
+
+    def move(self, config : MoveDirection) -> Optional[MotionHandle]:
+        # ROTATE does not wait for the motors: it returns the handle of the rotation.
+        self.__supersede_motion()
+        if config == Robot.MoveDirection.ROTATE:
+            return self.turn_degree_async(900)
+        with self.__bus:
+            if config == Robot.MoveDirection.FORWARD:
+                self.__gpg.forward()
+            elif config == Robot.MoveDirection.RIGHT:
+                self.__gpg.right()
+            elif config == Robot.MoveDirection.LEFT:
+                self.__gpg.left()
+            elif config == Robot.MoveDirection.BACKWARD:
+                self.__gpg.backward()
+            elif config == Robot.MoveDirection.STOP:
+                self.__gpg.stop()
+        return None
 
     def turn_degree(self, degree: int):
-        self.__gpg.turn_degrees(degree)
+        self.__supersede_motion()
+        with self.__bus:
+            self.__gpg.turn_degrees(degree)
+
+    def turn_degree_async(self, degree: int) -> MotionHandle:
+        # Start the turn and return at once; the handle polls the encoders, at most once per tick.
+        self.__supersede_motion()
+        with self.__bus:
+            left_target, right_target = self.__gpg.turn_degrees(degree, blocking=False)
+        self.__motion = MotionHandle(lambda: self.__target_reached(left_target, right_target), self.__stop_motors, self.__clock)
+        return self.__motion
+
+    def __target_reached(self, left_target : float, right_target : float) -> bool:
+        with self.__bus:
+            reached = self.__gpg.target_reached(left_target, right_target)
+        if self.__recorder is not None:
+            self.__recorder.record(InputRecorder.Source.TARGET_REACHED, bool(reached))
+        return reached
+
+    def __supersede_motion(self) -> None:
+        # A new motor command replaces the motion in progress, which will then never complete.
+        if self.__motion is not None:
+            self.__motion._supersede()
         
     def read_input(self, read_once : bool = False): 
+        # Inside a tick, the remote is read once and every condition of the tick
+        # shares the sample; the read_once edge is also computed once per tick.
+        tick = Tick.current()
+        if tick is not None:
+            if tick != self.__input_tick:
+                self.__input_tick = tick
+                self.__current_key = Robot.KeyCodes(self.__read_remote())
+            if not read_once:
+                return self.__current_key
+            if tick != self.__edge_tick:
+                self.__edge_tick = tick
+                self.__edge_key = self.__read_edge(self.__current_key)
+            return self.__edge_key
         if read_once:
-            key_pressed = self.__remote_control.read()
-            if self.__old_key == Robot.KeyCodes.NONE:
-                self.__old_key = Robot.KeyCodes(key_pressed)
-                return Robot.KeyCodes(key_pressed)
-            elif Robot.KeyCodes(key_pressed) == Robot.KeyCodes.NONE:
-                self.__old_key = Robot.KeyCodes.NONE
-                return Robot.KeyCodes(key_pressed)
-            return Robot.KeyCodes.NONE
-        return Robot.KeyCodes(self.__remote_control.read())
-    
+            return self.__read_edge(Robot.KeyCodes(self.__read_remote()))
+        return Robot.KeyCodes(self.__read_remote())
+
+    def __read_remote(self) -> int:
+        with self.__bus:
+            key = self.__remote_control.read()
+        if self.__recorder is not None:
+            self.__recorder.record(InputRecorder.Source.REMOTE, key)
+        return key
+
+    @property
+    def recorder(self) -> Optional[InputRecorder]:
+        return self.__recorder
+
+    def start_recording(self, path : str) -> InputRecorder:
+        # Every remote, distance and rotation completion read is appended to the log, for a ReplayBackend.
+        self.stop_recording()
+        self.__recorder = InputRecorder(path, clock=self.__clock)
+        return self.__recorder
+
+    def stop_recording(self) -> None:
+        if self.__recorder is not None:
+            recorder, self.__recorder = self.__recorder, None
+            recorder.close()
+
+    def __read_edge(self, key_pressed : 'Robot.KeyCodes') -> 'Robot.KeyCodes':
+        if self.__old_key == Robot.KeyCodes.NONE:
+            self.__old_key = key_pressed
+            return key_pressed
+        elif key_pressed == Robot.KeyCodes.NONE:
+            self.__old_key = Robot.KeyCodes.NONE
+            return key_pressed
+        return Robot.KeyCodes.NONE
+
     def read_distance_sensor(self) -> int:
-        return self.__distance_sensor.read_mm()
+        with self.__bus:
+            distance = self.__distance_sensor.read_mm()
+        if self.__recorder is not None:
+            self.__recorder.record(InputRecorder.Source.DISTANCE, distance)
+        return distance
+
+    @property
+    def distance_sampler(self) -> Optional[DistanceSampler]:
+        return self.__distance_sampler
+
+    def start_distance_sampler(self, rate : float = 20., on_sample : Optional[Callable[[], None]] = None) -> DistanceSampler:
+        # Samples taken while the range sensor servo is turned away are not published.
+        self.stop_distance_sampler()
+        self.__distance_sampler = DistanceSampler(read=self.__read_centered_distance, rate=rate, on_sample=on_sample, clock=self.__clock)
+        self.__distance_sampler.start()
+        return self.__distance_sampler
+
+    def stop_distance_sampler(self) -> None:
+        if self.__distance_sampler is not None:
+            self.__distance_sampler.stop()
+            self.__distance_sampler = None
+
+    def distance_sample_age(self) -> Optional[float]:
+        if self.__distance_sampler is None:
+            return None
+        return self.__distance_sampler.sample_age()
+
+    def __read_centered_distance(self) -> Optional[int]:
+        # Runs on the sampler thread: the angle check and the read hold the bus so that a servo move cannot slip in between.
+        with self.__bus:
+            if self.__range_sensor_angle != 0:
+                return None
+            return self.read_distance_sensor()
     
-    def reached_max_distance(self) -> bool:
-        return self.__distance_sensor.read_mm() <= self.max_distance
+    def reached_max_distance(self, max_sample_age : Optional[float] = None) -> bool:
+        # With a sampler running, never read the sensor here: a sample that is missing or older than
+        # max_sample_age gives stale_distance_reached instead.
+        if self.__distance_sampler is not None:
+            sample = self.__distance_sampler.latest
+            if sample is None or (max_sample_age is not None and self.__clock.now() - sample[1] > max_sample_age):
+                return self.stale_distance_reached
+            return sample[0] <= self.max_distance
+        return self.read_distance_sensor() <= self.max_distance
 
     def get_distance(self, angle:int = 0) ->int:
         if angle < -45 :
             angle = -45
         elif angle > 45:
             angle = 45
-        self.__range_sensor_servo_control.rotate_servo(self.__zero_servo_telemetre - angle)
-        return self.read_distance_sensor()
+        with self.__bus:
+            self.__range_sensor_servo_control.rotate_servo(self.__zero_servo_telemetre - angle)
+            self.__range_sensor_angle = angle
+            return self.read_distance_sensor()
 
     def reset_servos(self) -> None:
-        self.__range_sensor_servo_control.rotate_servo(self.__zero_servo_telemetre)
-        self.__camera_servo_control.rotate_servo(self.__zero_servo_camera)
\ No newline at end of file
+        with self.__bus:
+            self.__range_sensor_servo_control.rotate_servo(self.__zero_servo_telemetre)
+            self.__range_sensor_angle = 0
+            self.__camera_servo_control.rotate_servo(self.__zero_servo_camera)
\ No newline at end of file
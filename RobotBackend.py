@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+class RobotBackend(ABC):
+    """
+    Interface matérielle utilisée par Robot : le sous-ensemble de l'API d'easygopigo3.EasyGoPiGo3 dont il se sert.
+
+    Les périphériques renvoyés par les méthodes init_* exposent les méthodes de leurs équivalents easygopigo3 :
+    read() pour la télécommande, rotate_servo(position) et reset_servo() pour les servomoteurs, read_mm() pour
+    le capteur de distance. Une méthode init_* qui lève une exception signale un périphérique absent.
+
+    easygopigo3.EasyGoPiGo3 satisfait cette interface sans en hériter ; SimulatedBackend l'implémente hors du robot.
+
+    Utilisation:
+        >>> robot = Robot(backend=SimulatedBackend())
+    """
+
+    @abstractmethod
+    def init_remote(self, port: str) -> object:
+        """Initialise la télécommande sur un port et renvoie le périphérique."""
+        pass
+
+    @abstractmethod
+    def init_servo(self, port: str) -> object:
+        """Initialise un servomoteur sur un port et renvoie le périphérique."""
+        pass
+
+    @abstractmethod
+    def init_distance_sensor(self, port: str) -> object:
+        """Initialise le capteur de distance sur un port et renvoie le périphérique."""
+        pass
+
+    @abstractmethod
+    def led_on(self, led: str) -> None:
+        """Allume une DEL ('left' ou 'right')."""
+        pass
+
+    @abstractmethod
+    def led_off(self, led: str) -> None:
+        """Éteint une DEL ('left' ou 'right')."""
+        pass
+
+    @abstractmethod
+    def set_left_eye_color(self, color: Tuple[int, int, int]) -> None:
+        """Définit la couleur de l'œil gauche, affichée à sa prochaine ouverture."""
+        pass
+
+    @abstractmethod
+    def set_right_eye_color(self, color: Tuple[int, int, int]) -> None:
+        """Définit la couleur de l'œil droit, affichée à sa prochaine ouverture."""
+        pass
+
+    @abstractmethod
+    def set_eye_color(self, color: Tuple[int, int, int]) -> None:
+        """Définit la couleur des deux yeux, affichée à leur prochaine ouverture."""
+        pass
+
+    @abstractmethod
+    def open_left_eye(self) -> None:
+        """Allume l'œil gauche."""
+        pass
+
+    @abstractmethod
+    def close_left_eye(self) -> None:
+        """Éteint l'œil gauche."""
+        pass
+
+    @abstractmethod
+    def open_right_eye(self) -> None:
+        """Allume l'œil droit."""
+        pass
+
+    @abstractmethod
+    def close_right_eye(self) -> None:
+        """Éteint l'œil droit."""
+        pass
+
+    @abstractmethod
+    def open_eyes(self) -> None:
+        """Allume les deux yeux."""
+        pass
+
+    @abstractmethod
+    def close_eyes(self) -> None:
+        """Éteint les deux yeux."""
+        pass
+
+    @abstractmethod
+    def forward(self) -> None:
+        """Fait avancer le robot."""
+        pass
+
+    @abstractmethod
+    def backward(self) -> None:
+        """Fait reculer le robot."""
+        pass
+
+    @abstractmethod
+    def left(self) -> None:
+        """Fait tourner le robot vers la gauche."""
+        pass
+
+    @abstractmethod
+    def right(self) -> None:
+        """Fait tourner le robot vers la droite."""
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Arrête les moteurs."""
+        pass
+
+    @abstractmethod
+    def turn_degrees(self, degrees: float, blocking: bool = True) -> Tuple[float, float]:
+        """Fait pivoter le robot sur place, en bloquant jusqu'à la fin de la rotation sauf si blocking est False, et renvoie les cibles des encodeurs gauche et droit."""
+        pass
+
+    @abstractmethod
+    def target_reached(self, left_target: float, right_target: float) -> bool:
+        """Indique si les encodeurs gauche et droit ont atteint les cibles renvoyées par turn_degrees()."""
+        pass
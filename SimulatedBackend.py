@@ -0,0 +1,463 @@
+import random
+import threading
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from RobotBackend import RobotBackend
+from Clock import Clock
+
+class SimulatedBackend(RobotBackend):
+    """
+    Matériel simulé du robot, pour exécuter Robot et les machines à états finis hors du robot.
+
+    Le backend modélise les DEL, les yeux, les servomoteurs, les moteurs, une séquence de touches de la télécommande
+    et un champ de distance. Chaque appel au bus attend une latence configurable, avec une gigue aléatoire,
+    selon l'horloge du backend : avec une VirtualClock, la latence fait avancer le temps virtuel. Les appels faits
+    depuis un autre fil que le propriétaire de la VirtualClock (un DistanceSampler) n'attendent pas leur latence :
+    ce fil ne peut pas faire avancer le temps, et il attendrait en tenant le bus du Robot. Comme sur le GoPiGo3,
+    le bus est unique : deux appels ne se chevauchent jamais, même faits depuis des fils différents.
+
+    Chaque appel est enregistré avec son instant de fin, ce qui permet de mesurer les fronts des sorties.
+
+    Attributs:
+        __clock (Clock): L'horloge des latences, de la séquence de touches et des enregistrements.
+        __latency (float): La latence par défaut d'un appel au bus, en secondes.
+        __jitter (float): La gigue maximale ajoutée à chaque latence, en secondes.
+        __latencies (Dict[str, float]): Les latences propres à certains appels, par nom de méthode.
+        __key_times (List[float]): Les instants de changement de touche, depuis la création du backend.
+        __key_values (List[int]): Les touches en vigueur à partir de chaque instant.
+        __distance (Union[float, Callable[[float, int], float]]): Le champ de distance.
+        __calls (List[Tuple[float, str, tuple]]): Les appels enregistrés.
+        __bus_lock (threading.RLock): Le verrou du bus, tenu pendant la latence et l'opération de chaque appel.
+
+    Utilisation:
+        >>> backend = SimulatedBackend(latency=0.0005, jitter=0.0002, keys=[(1., Robot.KeyCodes.ONE), (1.2, Robot.KeyCodes.NONE)])
+        >>> robot = Robot(backend=backend)
+        >>> robot.turn_on_left_led()
+        >>> backend.leds
+        {'left': True, 'right': False}
+    """
+
+    DistanceField = Callable[[float, int], float]
+
+    class Remote:
+        """
+        Télécommande simulée : renvoie la touche en vigueur dans la séquence du backend.
+        """
+
+        def __init__(self, backend: 'SimulatedBackend', port: str) -> None:
+            self.__backend = backend
+            self.__port = port
+
+        def read(self) -> int:
+            """Lit la touche enfoncée."""
+            return self.__backend._bus('read', (self.__port,), self.__backend._key_at)
+
+    class Servo:
+        """
+        Servomoteur simulé : mémorise sa dernière position.
+        """
+
+        def __init__(self, backend: 'SimulatedBackend', port: str) -> None:
+            self.__backend = backend
+            self.__port = port
+
+        def rotate_servo(self, position: int) -> None:
+            """Tourne le servomoteur à une position."""
+            self.__backend._bus('rotate_servo', (self.__port, position), lambda: self.__backend._set_servo(self.__port, position))
+
+        def reset_servo(self) -> None:
+            """Ramène le servomoteur à sa position par défaut."""
+            self.__backend._bus('reset_servo', (self.__port,), lambda: self.__backend._set_servo(self.__port, SimulatedBackend.SERVO_RESET_POSITION))
+
+    class DistanceSensor:
+        """
+        Capteur de distance simulé : lit le champ de distance du backend.
+        """
+
+        def __init__(self, backend: 'SimulatedBackend', port: str) -> None:
+            self.__backend = backend
+            self.__port = port
+
+        def read_mm(self) -> int:
+            """Lit la distance, en millimètres."""
+            return self.__backend._bus('read_mm', (self.__port,), self.__backend._distance_now)
+
+    SERVO_RESET_POSITION: int = 90
+    RANGE_SERVO_PORT: str = 'SERVO2'
+
+    def __init__(
+            self,
+            clock: Optional[Clock] = None,
+            latency: float = 0.,
+            jitter: float = 0.,
+            latencies: Optional[Dict[str, float]] = None,
+            keys: Sequence[Tuple[float, int]] = (),
+            distance: Union[float, DistanceField] = 1000.,
+            turn_speed: Optional[float] = None,
+            missing: Iterable[str] = (),
+            seed: Optional[int] = None,
+            record_calls: bool = True
+            ) -> None:
+        """
+        Initialise le backend simulé.
+
+        Args:
+            clock (Clock, optionnel): L'horloge du backend. Par défaut, Clock.system().
+            latency (float): La latence de chaque appel au bus, en secondes. Par défaut à 0.
+            jitter (float): La gigue maximale ajoutée à chaque latence, tirée uniformément, en secondes. Par défaut à 0.
+            latencies (Dict[str, float], optionnel): Les latences propres à certains appels, par nom de méthode (par exemple 'read_mm').
+            keys (Sequence[Tuple[float, int]]): Les changements de touche de la télécommande : (instant depuis la création
+                du backend, code de touche ou Robot.KeyCodes). Chaque touche reste enfoncée jusqu'au changement suivant.
+            distance (Union[float, Callable[[float, int], float]]): La distance mesurée, en millimètres, constante ou fonction
+                de l'instant et de la position du servomoteur du télémètre. Par défaut à 1000.
+            turn_speed (float, optionnel): La vitesse de rotation de turn_degrees(), en degrés par seconde. Par défaut, None (instantané).
+            missing (Iterable[str]): Les ports dont l'initialisation échoue, pour simuler un robot incomplet.
+            seed (int, optionnel): La graine de la gigue.
+            record_calls (bool): Indique si les appels sont enregistrés. Par défaut à True.
+
+        Raises:
+            ValueError: Les latences, la gigue et la vitesse de rotation doivent être positives.
+
+        Utilisation:
+            >>> backend = SimulatedBackend(clock=VirtualClock(), latency=0.0005, jitter=0.0002, seed=1)
+        """
+        if latency < 0 or jitter < 0 or any(value < 0 for value in (latencies or {}).values()):
+            raise ValueError("latency and jitter must be positive")
+        if turn_speed is not None and turn_speed <= 0:
+            raise ValueError("turn_speed must be positive")
+        self.__clock = Clock.system() if clock is None else clock
+        self.__latency = latency
+        self.__jitter = jitter
+        self.__latencies = dict(latencies or {})
+        self.__random = random.Random(seed)
+        self.__start = self.__clock.now()
+        changes = sorted((time, getattr(key, 'value', key)) for time, key in keys)
+        self.__key_times: List[float] = [time for time, _ in changes]
+        self.__key_values: List[int] = [key for _, key in changes]
+        self.__forced_key: Optional[int] = None
+        self.__distance = distance
+        self.__turn_speed = turn_speed
+        self.__missing = frozenset(missing)
+        self.__record_calls = record_calls
+        self.__calls: List[Tuple[float, str, tuple]] = []
+        self.__bus_lock = threading.RLock()
+
+        self.__leds: Dict[str, bool] = {'left': False, 'right': False}
+        self.__eye_colors: Dict[str, Tuple[int, int, int]] = {'left': (0, 0, 255), 'right': (0, 0, 255)}
+        self.__eyes_open: Dict[str, bool] = {'left': False, 'right': False}
+        self.__servos: Dict[str, int] = {}
+        self.__motion: str = 'stop'
+        self.__heading: float = 0.
+        self.__turn: Optional[Tuple[float, float, float, float]] = None
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Obtient l'horloge du backend.
+
+        Returns:
+            Clock: L'horloge du backend.
+        """
+        return self.__clock
+
+    @property
+    def leds(self) -> Dict[str, bool]:
+        """
+        Obtient l'état des DEL.
+
+        Returns:
+            Dict[str, bool]: True pour chaque DEL allumée, par côté.
+        """
+        return dict(self.__leds)
+
+    @property
+    def eyes(self) -> Dict[str, Optional[Tuple[int, int, int]]]:
+        """
+        Obtient la couleur affichée par chaque œil.
+
+        Returns:
+            Dict[str, Optional[Tuple[int, int, int]]]: La couleur de chaque œil ouvert, None pour un œil fermé, par côté.
+        """
+        return {side: self.__eye_colors[side] if self.__eyes_open[side] else None for side in ('left', 'right')}
+
+    @property
+    def servos(self) -> Dict[str, int]:
+        """
+        Obtient la dernière position de chaque servomoteur.
+
+        Returns:
+            Dict[str, int]: La position, par port.
+        """
+        return dict(self.__servos)
+
+    @property
+    def motion(self) -> str:
+        """
+        Obtient le dernier mouvement commandé.
+
+        Returns:
+            str: 'stop', 'forward', 'backward', 'left', 'right' ou 'turn' pendant une rotation.
+        """
+        return self.__motion
+
+    @property
+    def heading(self) -> float:
+        """
+        Obtient le cumul des rotations effectuées par turn_degrees(), y compris la part effectuée d'une rotation en cours.
+
+        Returns:
+            float: Le cumul des rotations, en degrés.
+        """
+        self.__settle_turn()
+        if self.__turn is None:
+            return self.__heading
+        start, degrees, begin, duration = self.__turn
+        return start + degrees * min((self.__clock.now() - begin) / duration, 1.)
+
+    @property
+    def calls(self) -> List[Tuple[float, str, tuple]]:
+        """
+        Obtient les appels enregistrés.
+
+        Returns:
+            List[Tuple[float, str, tuple]]: Pour chaque appel, l'instant de fin, le nom de la méthode et ses arguments.
+        """
+        return list(self.__calls)
+
+    def clear_calls(self) -> None:
+        """
+        Efface les appels enregistrés.
+
+        Utilisation:
+            >>> backend.clear_calls()
+        """
+        self.__calls.clear()
+
+    def set_key(self, key: Optional[int]) -> None:
+        """
+        Force la touche lue par la télécommande, ou rend la main à la séquence de touches avec None.
+
+        Args:
+            key (Optional[int]): Le code de touche ou Robot.KeyCodes, None pour suivre la séquence.
+
+        Utilisation:
+            >>> backend.set_key(Robot.KeyCodes.OK)
+            >>> backend.set_key(None)
+        """
+        self.__forced_key = None if key is None else getattr(key, 'value', key)
+
+    def set_distance(self, distance: Union[float, DistanceField]) -> None:
+        """
+        Remplace le champ de distance.
+
+        Args:
+            distance (Union[float, Callable[[float, int], float]]): La distance constante, ou fonction de l'instant et de
+                la position du servomoteur du télémètre.
+
+        Utilisation:
+            >>> backend.set_distance(150.)
+        """
+        self.__distance = distance
+
+    def _bus(self, name: str, args: tuple, operation: Callable[[], object] = None) -> object:
+        """
+        Effectue un appel au bus : attend la latence, applique l'opération et enregistre l'appel. Le bus est tenu
+        pendant tout l'appel ; un appel fait depuis un autre fil attend que le bus soit libre.
+
+        Args:
+            name (str): Le nom de la méthode appelée.
+            args (tuple): Ses arguments.
+            operation (Callable[[], object], optionnel): L'effet de l'appel, dont le résultat est renvoyé.
+
+        Returns:
+            object: Le résultat de l'opération.
+        """
+        delay = self.__latencies.get(name, self.__latency)
+        if self.__jitter:
+            delay += self.__random.uniform(0., self.__jitter)
+        with self.__bus_lock:
+            if delay > 0 and self.__clock.drives_time():
+                self.__clock.sleep(delay)
+            result = operation() if operation is not None else None
+            if self.__record_calls:
+                self.__calls.append((self.__clock.now(), name, args))
+            return result
+
+    def _key_at(self) -> int:
+        """
+        Obtient la touche en vigueur à l'instant courant.
+
+        Returns:
+            int: Le code de touche.
+        """
+        if self.__forced_key is not None:
+            return self.__forced_key
+        index = bisect_right(self.__key_times, self.__clock.now() - self.__start) - 1
+        return self.__key_values[index] if index >= 0 else 0
+
+    def _distance_now(self) -> int:
+        """
+        Évalue le champ de distance à l'instant courant, pour la position courante du télémètre.
+
+        Returns:
+            int: La distance, en millimètres.
+        """
+        distance = self.__distance
+        if callable(distance):
+            distance = distance(self.__clock.now(), self.__servos.get(self.RANGE_SERVO_PORT, self.SERVO_RESET_POSITION))
+        return int(distance)
+
+    def _set_servo(self, port: str, position: int) -> None:
+        """
+        Mémorise la position d'un servomoteur.
+
+        Args:
+            port (str): Le port du servomoteur.
+            position (int): Sa position.
+        """
+        self.__servos[port] = position
+
+    def __init_device(self, name: str, port: str, device: type) -> object:
+        """
+        Initialise un périphérique, ou échoue si son port est déclaré absent.
+
+        Raises:
+            IOError: Le port est déclaré absent.
+        """
+        if port in self.__missing:
+            raise IOError(f"no device on port {port}")
+        return self._bus(name, (port,), lambda: device(self, port))
+
+    def init_remote(self, port: str) -> 'SimulatedBackend.Remote':
+        return self.__init_device('init_remote', port, SimulatedBackend.Remote)
+
+    def init_servo(self, port: str) -> 'SimulatedBackend.Servo':
+        return self.__init_device('init_servo', port, SimulatedBackend.Servo)
+
+    def init_distance_sensor(self, port: str) -> 'SimulatedBackend.DistanceSensor':
+        return self.__init_device('init_distance_sensor', port, SimulatedBackend.DistanceSensor)
+
+    def led_on(self, led: str) -> None:
+        self._bus('led_on', (led,), lambda: self.__leds.__setitem__(led, True))
+
+    def led_off(self, led: str) -> None:
+        self._bus('led_off', (led,), lambda: self.__leds.__setitem__(led, False))
+
+    def set_left_eye_color(self, color: Tuple[int, int, int]) -> None:
+        self._bus('set_left_eye_color', (color,), lambda: self.__eye_colors.__setitem__('left', color))
+
+    def set_right_eye_color(self, color: Tuple[int, int, int]) -> None:
+        self._bus('set_right_eye_color', (color,), lambda: self.__eye_colors.__setitem__('right', color))
+
+    def set_eye_color(self, color: Tuple[int, int, int]) -> None:
+        self._bus('set_eye_color', (color,), lambda: self.__eye_colors.update(left=color, right=color))
+
+    def open_left_eye(self) -> None:
+        self._bus('open_left_eye', (), lambda: self.__eyes_open.__setitem__('left', True))
+
+    def close_left_eye(self) -> None:
+        self._bus('close_left_eye', (), lambda: self.__eyes_open.__setitem__('left', False))
+
+    def open_right_eye(self) -> None:
+        self._bus('open_right_eye', (), lambda: self.__eyes_open.__setitem__('right', True))
+
+    def close_right_eye(self) -> None:
+        self._bus('close_right_eye', (), lambda: self.__eyes_open.__setitem__('right', False))
+
+    def open_eyes(self) -> None:
+        self._bus('open_eyes', (), lambda: self.__eyes_open.update(left=True, right=True))
+
+    def close_eyes(self) -> None:
+        self._bus('close_eyes', (), lambda: self.__eyes_open.update(left=False, right=False))
+
+    def forward(self) -> None:
+        self.__move('forward')
+
+    def backward(self) -> None:
+        self.__move('backward')
+
+    def left(self) -> None:
+        self.__move('left')
+
+    def right(self) -> None:
+        self.__move('right')
+
+    def stop(self) -> None:
+        self.__move('stop')
+
+    def __move(self, motion: str) -> None:
+        """
+        Commande un mouvement continu, qui interrompt une rotation en cours.
+
+        Args:
+            motion (str): Le mouvement commandé.
+        """
+        def operation() -> None:
+            self.__stop_turn()
+            self.__motion = motion
+        self._bus(motion, (), operation)
+
+    def __settle_turn(self) -> None:
+        """
+        Termine la rotation en cours si sa durée est écoulée.
+        """
+        if self.__turn is not None:
+            start, degrees, begin, duration = self.__turn
+            if self.__clock.now() - begin >= duration:
+                self.__heading = start + degrees
+                self.__turn = None
+                self.__motion = 'stop'
+
+    def __stop_turn(self) -> None:
+        """
+        Interrompt la rotation en cours, à l'angle atteint.
+        """
+        if self.__turn is not None:
+            self.__heading = self.heading
+            self.__turn = None
+
+    def turn_degrees(self, degrees: float, blocking: bool = True) -> Tuple[float, float]:
+        """
+        Fait pivoter le robot. La rotation dure abs(degrees) / turn_speed si turn_speed est défini ; l'appel bloque
+        pendant cette durée, sauf si blocking est False.
+
+        Les cibles renvoyées sont celles des encodeurs simulés, qui suivent l'angle de rotation cumulé.
+
+        Args:
+            degrees (float): L'angle de rotation, en degrés.
+            blocking (bool): Indique si l'appel attend la fin de la rotation. Par défaut à True.
+
+        Returns:
+            Tuple[float, float]: Les cibles des encodeurs gauche et droit.
+        """
+        def operation() -> Tuple[float, float]:
+            self.__stop_turn()
+            target = self.__heading + degrees
+            if self.__turn_speed is None:
+                self.__heading = target
+                self.__motion = 'stop'
+            else:
+                duration = abs(degrees) / self.__turn_speed
+                self.__turn = (self.__heading, degrees, self.__clock.now(), duration)
+                self.__motion = 'turn'
+                if blocking:
+                    self.__clock.sleep(duration)
+                    self.__settle_turn()
+            return target, -target
+        return self._bus('turn_degrees', (degrees,), operation)
+
+    def target_reached(self, left_target: float, right_target: float) -> bool:
+        """
+        Indique si les encodeurs simulés ont atteint leurs cibles. Une rotation interrompue n'atteint jamais sa cible.
+
+        Args:
+            left_target (float): La cible de l'encodeur gauche.
+            right_target (float): La cible de l'encodeur droit.
+
+        Returns:
+            bool: True si les deux cibles sont atteintes.
+        """
+        def operation() -> bool:
+            heading = self.heading
+            return heading == left_target and -heading == right_target
+        return self._bus('target_reached', (left_target, right_target), operation)
@@ -3,6 +3,10 @@ import random
 from typing import Callable, List, Optional, TYPE_CHECKING
 import time
 from Robot import Robot
+from Clock import Clock
+from LayoutRuntime import LayoutRuntime, RuntimeHost
+from Profiler import Profiler
+from time import perf_counter
 if TYPE_CHECKING:
     from Transition import Transition
     from Robot import Robot
@@ -22,7 +26,11 @@ class State:
         valid : Vérifie si l'état a des transitions valides.
         terminal : Indique si l'état est terminal.
         transiting : Liste les statuts de transition.
+        transitions : Obtient les transitions de l'état.
+        frozen : Indique si les transitions de l'état sont figées.
+        clock : Obtient l'horloge de l'état.
         add_transition : Ajoute une transition à l'état.
+        _bind_clock : Lie l'état et ses transitions à une horloge.
         _exec_entering_action : Exécute l'action associée à l'entrée dans l'état.
         _exec_in_state_action : Exécute l'action associée à la présence dans l'état.
         _exec_exiting_action : Exécute l'action associée à la sortie de l'état.
@@ -31,6 +39,8 @@ class State:
         _do_exiting_action : Définit l'action à exécuter à la sortie de l'état.
     """
 
+    __slots__ = ('parameters', '__transitions', '__frozen', '__event_index', '_clock')
+
     class Parameters:
         """Paramètres définissant le comportement d'un état dans une machine à états.
 
@@ -38,21 +48,27 @@ class State:
             terminal (bool) : Indicateur si l'état est terminal.
             do_in_state_action_when_entering (bool) : Indicateur si une action doit être exécutée en entrant dans l'état.
             do_in_state_action_when_exiting (bool) : Indicateur si une action doit être exécutée en sortant de l'état.
+            rate (Optional[float]) : La fréquence de suivi de la machine pendant qu'elle est dans l'état, en Hz.
 
         Méthodes :
             __init__ : Initialise les paramètres pour un état.
         """
 
-        def __init__(self, terminal: bool = False, do_in_state_action_when_entering: bool = False, do_in_state_action_when_exiting: bool = False):
+        __slots__ = ('terminal', 'do_in_state_action_when_entering', 'do_in_state_action_when_exiting', 'rate')
+
+        def __init__(self, terminal: bool = False, do_in_state_action_when_entering: bool = False, do_in_state_action_when_exiting: bool = False, rate: Optional[float] = None):
             """Initialise les paramètres pour un état.
 
             Args :
                 terminal (bool) : Si l'état est terminal. Par défaut à False.
                 do_in_state_action_when_entering (bool) : Si une action doit être exécutée à l'entrée. Par défaut à False.
                 do_in_state_action_when_exiting (bool) : Si une action doit être exécutée à la sortie. Par défaut à False.
+                rate (Optional[float]) : La fréquence de suivi dans l'état pour un RateScheduler, en Hz. Par défaut à None
+                    (celle de la machine).
 
             Raises :
                 TypeError : Si les paramètres ne sont pas des booléens.
+                ValueError : Si la fréquence n'est pas positive.
 
             Utilisation :
                 >>> State.Parameters(terminal=True, do_in_state_action_when_entering=True, do_in_state_action_when_exiting=True)
@@ -63,6 +79,9 @@ class State:
             self.terminal = terminal
             self.do_in_state_action_when_entering = do_in_state_action_when_entering
             self.do_in_state_action_when_exiting = do_in_state_action_when_exiting
+            if rate is not None and rate <= 0:
+                raise ValueError("rate must be positive")
+            self.rate = rate
 
     def __init__(self, parameters: Optional[Parameters] = None) -> None:
         """Initialise une instance de State.
@@ -78,6 +97,9 @@ class State:
         
         self.parameters : State.Parameters = parameters if parameters is not None else self.Parameters()
         self.__transitions = []
+        self.__frozen = False
+        self.__event_index = None
+        self._clock : Clock = Clock.system()
 
     @property
     def valid(self) -> bool:
@@ -107,6 +129,35 @@ class State:
         """
         return self.parameters.terminal
 
+    @property
+    def rate(self) -> Optional[float]:
+        """Obtient la fréquence de suivi déclarée pour l'état (voir RateScheduler).
+
+        Retourne :
+            Optional[float] : La fréquence, en Hz, None si l'état suit celle de la machine.
+
+        Utilisation :
+            >>> state.rate
+        """
+        return self.parameters.rate
+
+    @rate.setter
+    def rate(self, rate: Optional[float]) -> None:
+        """Déclare la fréquence de suivi de l'état.
+
+        Args :
+            rate (Optional[float]) : La fréquence, en Hz, None pour suivre celle de la machine.
+
+        Raises :
+            ValueError : Si la fréquence n'est pas positive.
+
+        Utilisation :
+            >>> state.rate = 50.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.parameters.rate = rate
+
     @property
     def transiting(self) -> bool:
         """Liste les statuts de transition.
@@ -122,6 +173,118 @@ class State:
                 return transition
         return None
 
+    def _transiting_on(self, sources: set) -> Optional['Transition']:
+        """Évalue uniquement les transitions concernées par les sources d'événements fournies.
+
+        Les transitions dont la condition ne déclare pas ses sources d'événements sont toujours évaluées.
+        L'ordre d'évaluation des transitions est conservé.
+
+        Args :
+            sources (set) : Les sources d'événements (Condition.EventSource) ayant publié depuis le dernier tick.
+
+        Retourne :
+            Optional[Transition] : La transition en cours, None autrement.
+
+        Utilisation :
+            >>> state._transiting_on({Condition.EventSource.REMOTE_KEY})
+        """
+        if self.__event_index is None:
+            polled = []
+            by_source = {}
+            for position, transition in enumerate(self.__transitions):
+                transition_sources = transition.event_sources
+                if transition_sources is None:
+                    polled.append(position)
+                else:
+                    for source in transition_sources:
+                        by_source.setdefault(source, []).append(position)
+            self.__event_index = (polled, by_source)
+        polled, by_source = self.__event_index
+        if sources:
+            positions = set(polled)
+            for source in sources:
+                positions.update(by_source.get(source, ()))
+            positions = sorted(positions)
+        else:
+            positions = polled
+        for position in positions:
+            transition = self.__transitions[position]
+            if transition.transiting:
+                return transition
+        return None
+
+    @property
+    def transitions(self) -> tuple:
+        """Obtient les transitions de l'état, dans leur ordre d'évaluation.
+
+        Retourne :
+            tuple : Les transitions de l'état.
+
+        Utilisation :
+            >>> state.transitions
+        """
+        return tuple(self.__transitions)
+
+    @property
+    def frozen(self) -> bool:
+        """Indique si les transitions de l'état sont figées (voir FiniteStateMachine.Layout.compile).
+
+        Retourne :
+            bool : True si aucune transition ne peut plus être ajoutée, False autrement.
+
+        Utilisation :
+            >>> state.frozen
+        """
+        return self.__frozen
+
+    def _freeze(self) -> None:
+        """Fige les transitions de l'état.
+
+        Utilisation :
+            >>> state._freeze()
+        """
+        self.__frozen = True
+
+    @property
+    def clock(self) -> Clock:
+        """Obtient l'horloge de l'état, liée par la machine à états finis qui le contient.
+
+        Retourne :
+            Clock : L'horloge de l'état. Par défaut, Clock.system().
+
+        Utilisation :
+            >>> state.clock
+        """
+        return self._clock
+
+    def _bind_clock(self, clock: Clock) -> None:
+        """Lie l'état et ses transitions à une horloge.
+
+        Args :
+            clock (Clock) : L'horloge à utiliser.
+
+        Utilisation :
+            >>> state._bind_clock(VirtualClock())
+        """
+        self._clock = clock
+        for transition in self.__transitions:
+            transition._bind_clock(clock)
+
+    def next_deadline(self, now: float) -> Optional[float]:
+        """Obtient la plus proche échéance parmi les transitions de l'état.
+
+        Args :
+            now (float) : L'instant courant.
+
+        Retourne :
+            Optional[float] : La plus proche échéance future, None si aucune transition n'est temporelle.
+
+        Utilisation :
+            >>> state.next_deadline(state.clock.now())
+        """
+        deadlines = [deadline for deadline in (transition.next_deadline(now) for transition in self.__transitions) if deadline is not None]
+        return min(deadlines) if deadlines else None
+
     def add_transition(self, transition: 'Transition'):
         """Ajoute une transition à l'état.
 
@@ -131,16 +294,20 @@ class State:
         Raises :
             TypeError : Si la transition n'est pas une instance de Transition.
             ValueError : Si la transition est déjà ajoutée.
+            ValueError : Si les transitions de l'état sont figées.
 
         Utilisation :
             >>> state.add_transition(transition)
         """
         from Transition import Transition
+        if self.__frozen:
+            raise ValueError("L'état est figé, ses transitions ne peuvent plus être modifiées.")
         if not isinstance(transition, Transition):
             raise TypeError("La transition doit être une instance de Transition.")
         if transition in self.__transitions:
             raise ValueError("La transition est déjà ajoutée.")
         self.__transitions.append(transition)
+        self.__event_index = None
 
     def _exec_entering_action(self) -> None:
         """
@@ -149,9 +316,14 @@ class State:
         Utilisation :
             >>> state._exec_entering_action()
         """
+        profiler = Profiler.active
+        if profiler is not None:
+            start = perf_counter()
         self._do_entering_action()
         if self.parameters.do_in_state_action_when_entering:
             self._exec_in_state_action()
+        if profiler is not None:
+            profiler._record(self, Profiler.Kind.ENTERING, start)
 
     def _exec_in_state_action(self) -> None:
         """
@@ -160,7 +332,13 @@ class State:
         Utilisation :
             >>> state._exec_in_state_action()
         """
+        profiler = Profiler.active
+        if profiler is None:
+            self._do_in_state_action()
+            return
+        start = perf_counter()
         self._do_in_state_action()
+        profiler._record(self, Profiler.Kind.IN_STATE, start)
 
     def _exec_exiting_action(self) -> None:
         """
@@ -169,9 +347,14 @@ class State:
         Utilisation :
             >>> state._exec_exiting_action()
         """
+        profiler = Profiler.active
+        if profiler is not None:
+            start = perf_counter()
         if self.parameters.do_in_state_action_when_exiting:
             self._exec_in_state_action()
         self._do_exiting_action()
+        if profiler is not None:
+            profiler._record(self, Profiler.Kind.EXITING, start)
         
 
     def _do_entering_action(self) -> None:
@@ -219,6 +402,8 @@ class ActionState(State):
         _do_exiting_action : Exécute l'action associée à la sortie de l'état.
     """
 
+    __slots__ = ('__entering_actions', '__in_state_actions', '__exiting_actions')
+
     Action = Callable[[], None]
 
     def __init__(self, parameters: Optional[State.Parameters] = None) -> None:
@@ -323,10 +508,13 @@ class MonitoredState(ActionState):
     """
     MonitoredState est une classe dérivée de ActionState qui permet de suivre les entrées et sorties de l'état.
 
+    Les données d'exécution (compteurs et valeur personnalisée) sont rangées dans un LayoutRuntime. Une fois l'état
+    compilé dans un layout, elles sont lues et écrites dans l'enregistrement de la machine en cours de suivi, ce qui
+    permet de partager le layout entre plusieurs machines.
+
     Attributs :
-        __counter_last_entry (float) : Le compteur de la dernière entrée dans l'état.
-        __counter_last_exit (float) : Le compteur de la dernière sortie de l'état.
-        __entry_count (int) : Le nombre d'entrées dans l'état.
+        __host (RuntimeHost | FiniteStateMachine.Layout) : Le porteur de l'enregistrement d'exécution de l'état.
+        __index (int) : L'indice de l'état dans cet enregistrement.
         custom_value (any) : Une valeur personnalisée pour l'état.
 
     Méthodes :
@@ -335,10 +523,15 @@ class MonitoredState(ActionState):
         last_exit_time : Obtient le compteur de la dernière sortie de l'état.
         reset_entry_count : Réinitialise le compteur d'entrées.
         reset_last_times : Réinitialise les compteurs de temps.
+        _add_custom_value_listener : Ajoute une fonction appelée à chaque modification de custom_value.
+        _add_entry_listener : Ajoute une fonction appelée à chaque modification de last_entry_time.
+        _remove_entry_listener : Retire une fonction appelée à chaque modification de last_entry_time.
         _exec_entering_action : Exécute l'action associée à l'entrée dans l'état.
         _exec_exiting_action : Exécute l'action associée à la sortie de l'état. 
     """
 
+    __slots__ = ('__host', '__index', '__custom_value_listeners', '__entry_listeners')
+
     def __init__(self, parameters: Optional[State.Parameters] = None) -> None:
         """Initialise une instance de State.
 
@@ -350,11 +543,75 @@ class MonitoredState(ActionState):
             >>> MonitoredState(State.Parameters())
         """
         super().__init__(parameters)
-        self.__counter_last_entry : complex = 0
-        self.__counter_last_exit : complex = 0
-        self.__entry_count : int = 0
+        self.__host = RuntimeHost()
+        self.__index : int = 0
+        self.__custom_value_listeners : List[Callable[[], None]] = []
+        self.__entry_listeners : List[Callable[[], None]] = []
         self.custom_value : any = None
 
+    @property
+    def custom_value(self) -> any:
+        """Obtient la valeur personnalisée de l'état.
+
+        Retourne :
+            any : La valeur personnalisée de l'état.
+
+        Utilisation :
+            >>> state.custom_value
+        """
+        return self.__host.runtime.custom_values[self.__index]
+
+    @custom_value.setter
+    def custom_value(self, value: any) -> None:
+        """Définit la valeur personnalisée de l'état et prévient les fonctions à l'écoute.
+
+        Args :
+            value (any) : La nouvelle valeur personnalisée.
+
+        Utilisation :
+            >>> state.custom_value = "found"
+        """
+        self.__host.runtime.custom_values[self.__index] = value
+        for listener in self.__custom_value_listeners:
+            listener()
+
+    def _add_custom_value_listener(self, listener: Callable[[], None]) -> None:
+        """Ajoute une fonction appelée à chaque modification de custom_value.
+
+        Args :
+            listener (Callable[[], None]) : La fonction à appeler.
+
+        Utilisation :
+            >>> state._add_custom_value_listener(lambda: fsm.post_event(Condition.EventSource.CUSTOM_VALUE))
+        """
+        if listener not in self.__custom_value_listeners:
+            self.__custom_value_listeners.append(listener)
+
+    def _add_entry_listener(self, listener: Callable[[], None]) -> None:
+        """Ajoute une fonction appelée à chaque modification de last_entry_time : à chaque entrée dans l'état,
+        avant les actions d'entrée, et à chaque appel à reset_last_times().
+
+        Args :
+            listener (Callable[[], None]) : La fonction à appeler.
+
+        Utilisation :
+            >>> state._add_entry_listener(condition.rearm)
+        """
+        if listener not in self.__entry_listeners:
+            self.__entry_listeners.append(listener)
+
+    def _remove_entry_listener(self, listener: Callable[[], None]) -> None:
+        """Retire une fonction appelée à chaque modification de last_entry_time. Sans effet si elle n'est pas abonnée.
+
+        Args :
+            listener (Callable[[], None]) : La fonction à retirer.
+
+        Utilisation :
+            >>> state._remove_entry_listener(condition.rearm)
+        """
+        if listener in self.__entry_listeners:
+            self.__entry_listeners.remove(listener)
+
     @property
     def entry_count(self) -> int:
         """Obtient le nombre d'entrées dans l'état.
@@ -365,7 +622,7 @@ class MonitoredState(ActionState):
         Utilisation :
             >>> state.entry_count
         """
-        return self.__entry_count
+        return self.__host.runtime.entry_counts[self.__index]
     
     @property
     def last_entry_time(self) -> float:
@@ -377,7 +634,7 @@ class MonitoredState(ActionState):
         Utilisation :
             >>> state.last_entry_time
         """
-        return self.__counter_last_entry
+        return self.__host.runtime.last_entry_times[self.__index]
     
     
     @property
@@ -390,8 +647,34 @@ class MonitoredState(ActionState):
         Utilisation :
             >>> state.last_exit_time
         """
-        return self.__counter_last_exit
+        return self.__host.runtime.last_exit_times[self.__index]
     
+    @property
+    def _runtime(self) -> 'LayoutRuntime':
+        """Obtient l'enregistrement d'exécution dans lequel l'état lit et écrit en ce moment.
+
+        Retourne :
+            LayoutRuntime : L'enregistrement actif, ou un DetachedRuntime hors du suivi d'un layout partagé.
+
+        Utilisation :
+            >>> runtime = state._runtime
+        """
+        return self.__host.runtime
+
+    def _last_entry_time_in(self, runtime: 'LayoutRuntime') -> float:
+        """Obtient l'instant de la dernière entrée dans l'état, dans un enregistrement donné.
+
+        Args :
+            runtime (LayoutRuntime) : L'enregistrement d'une machine.
+
+        Retourne :
+            float : L'instant de la dernière entrée dans l'état pour cette machine.
+
+        Utilisation :
+            >>> state._last_entry_time_in(fsm.runtime)
+        """
+        return runtime.last_entry_times[self.__index]
+
     def reset_entry_count(self) -> None:
         """
         Réinitialise le compteur d'entrées.
@@ -399,7 +682,7 @@ class MonitoredState(ActionState):
         Utilisation :
             >>> state.reset_entry_count()
         """
-        self.__entry_count = 0
+        self.__host.runtime.entry_counts[self.__index] = 0
 
     def reset_last_times(self) -> None:
         """
@@ -408,8 +691,11 @@ class MonitoredState(ActionState):
         Utilisation :
             >>> state.reset_last_times()
         """
-        self.__counter_last_entry = 0
-        self.__counter_last_exit = 0
+        runtime = self.__host.runtime
+        runtime.last_entry_times[self.__index] = 0
+        runtime.last_exit_times[self.__index] = 0
+        for listener in self.__entry_listeners:
+            listener()
 
     def _exec_entering_action(self) -> None:
         """
@@ -418,8 +704,11 @@ class MonitoredState(ActionState):
         Utilisation :
             >>> state._exec_entering_action()
         """
-        self.__counter_last_entry = time.perf_counter()
-        self.__entry_count += 1
+        runtime = self.__host.runtime
+        runtime.last_entry_times[self.__index] = self._clock.now()
+        runtime.entry_counts[self.__index] += 1
+        for listener in self.__entry_listeners:
+            listener()
         super()._exec_entering_action()
 
     def _exec_exiting_action(self) -> None:
@@ -430,24 +719,85 @@ class MonitoredState(ActionState):
             >>> state._exec_exiting_action()
         """
         super()._exec_exiting_action()
-        self.__counter_last_exit = time.perf_counter()
+        self.__host.runtime.last_exit_times[self.__index] = self._clock.now()
+
+    def _attach(self, layout: 'FiniteStateMachine.Layout', index: int) -> None:
+        """
+        Range les données d'exécution de l'état dans les enregistrements d'un layout compilé. Les valeurs courantes
+        sont recopiées dans l'enregistrement actif du layout.
+
+        Args :
+            layout (FiniteStateMachine.Layout) : Le layout compilé.
+            index (int) : L'indice de l'état dans le layout.
+
+        Raises :
+            ValueError : L'état appartient déjà à un autre layout compilé.
+
+        Utilisation :
+            >>> state._attach(layout, 3)
+        """
+        if not isinstance(self.__host, RuntimeHost):
+            if self.__host is layout:
+                return
+            raise ValueError("state already belongs to another compiled layout")
+        source = self.__host.runtime
+        target = layout.runtime
+        target.entry_counts[index] = source.entry_counts[self.__index]
+        target.last_entry_times[index] = source.last_entry_times[self.__index]
+        target.last_exit_times[index] = source.last_exit_times[self.__index]
+        target.custom_values[index] = source.custom_values[self.__index]
+        self.__host = layout
+        self.__index = index
         
 class TaskState(MonitoredState):
-    def __init__(self, parameters: Optional[State.Parameters] = None) -> None:
+    """
+    TaskState est un MonitoredState qui porte une machine à états finis imbriquée (sa tâche).
+
+    La tâche peut être donnée directement (task_value) ou par une fabrique (task_factory) : elle n'est alors
+    construite qu'au premier accès à task_value, en général à la première entrée dans l'état, ce qui évite de
+    construire au démarrage les tâches qui ne seront peut-être jamais lancées.
+
+    Attributs :
+        __task_value (FiniteStateMachine) : La tâche, None tant qu'elle n'est pas construite.
+        __task_factory (Callable[[], FiniteStateMachine]) : La fabrique de la tâche, None si aucune.
+    """
+
+    __slots__ = ('__task_value', '__task_factory')
+
+    def __init__(self, parameters: Optional[State.Parameters] = None, task_factory: Optional[Callable[[], 'FiniteStateMachine']] = None) -> None:
         """Initialise une instance de State.
 
         Args :
             parameters (Parameters) : Les paramètres de comportement de l'état. Par défaut à une instance vide de Parameters.
+            task_factory (Callable[[], FiniteStateMachine]) : La fabrique de la tâche, appelée au premier accès à task_value. Par défaut à None.
 
         Utilisation :
             >>> TaskState()
             >>> TaskState(State.Parameters())
+            >>> TaskState(task_factory=lambda: ManualControlFSM(robot=robot))
         """
         super().__init__(parameters)
         self.__task_value : 'FiniteStateMachine' = None
+        self.__task_factory : Optional[Callable[[], 'FiniteStateMachine']] = None
+        if task_factory is not None:
+            self.task_factory = task_factory
 
     @property
     def task_value(self) -> 'FiniteStateMachine':
+        """
+        Obtient la tâche, en la construisant avec task_factory au premier accès.
+
+        Returns:
+            FiniteStateMachine: La tâche, None si elle n'a été ni donnée ni fabriquée.
+
+        Raises:
+            TypeError: La fabrique ne renvoie pas une FiniteStateMachine.
+
+        Utilisation:
+            >>> task.task_value.track()
+        """
+        if self.__task_value is None and self.__task_factory is not None:
+            self.task_value = self.__task_factory()
         return self.__task_value
     
     @task_value.setter
@@ -457,7 +807,41 @@ class TaskState(MonitoredState):
             raise TypeError("task_value must be of type FiniteStateMachine")
         self.__task_value = value
 
+    @property
+    def task_factory(self) -> Optional[Callable[[], 'FiniteStateMachine']]:
+        """
+        Obtient la fabrique de la tâche.
+
+        Returns:
+            Callable[[], FiniteStateMachine]: La fabrique, None si aucune.
+
+        Utilisation:
+            >>> factory = task.task_factory
+        """
+        return self.__task_factory
+
+    @task_factory.setter
+    def task_factory(self, value: Callable[[], 'FiniteStateMachine']) -> None:
+        if not callable(value):
+            raise TypeError("task_factory must be callable")
+        self.__task_factory = value
+
+    @property
+    def task_built(self) -> bool:
+        """
+        Indique si la tâche a été donnée ou construite.
+
+        Returns:
+            bool: True si la tâche existe.
+
+        Utilisation:
+            >>> if task.task_built: ...
+        """
+        return self.__task_value is not None
+
 class RobotState(MonitoredState):
+    __slots__ = ('_robot',)
+
     def __init__(self, robot: 'Robot', parameters: Optional[State.Parameters] = None):
         from Robot import Robot
         if not isinstance(robot, Robot):
@@ -466,6 +850,8 @@ class RobotState(MonitoredState):
         self._robot: Robot = robot
 
 class ManualControlState(RobotState):
+    __slots__ = ('off', '__move_config', 'side', 'cycle_duration', 'percent_on', 'begin_on')
+
     from Robot import Robot
     def __init__(self, robot: 'Robot', move_configuration, parameters: Optional[State.Parameters] = None, side : 'Robot.Side' = None, cycle_duration : float = 1.0, percent_on: float = .5, begin_on : bool = True, off=False):
         self.off = off
@@ -499,6 +885,8 @@ class ManualControlState(RobotState):
         self._robot.move(Robot.MoveDirection.STOP)
 
 class WonderState(RobotState):
+    __slots__ = ('off', 'side', 'cycle_duration', 'percent_on', 'begin_on')
+
     from Robot import Robot
     def __init__(self, robot: 'Robot', parameters: Optional[State.Parameters] = None, side : 'Robot.Side' = None, cycle_duration : float = 1.0, percent_on: float = .5, begin_on : bool = True, off=False):
         self.off = off
@@ -535,6 +923,8 @@ class WonderState(RobotState):
         self._robot.move(Robot.MoveDirection.STOP)
 
 class RotateState(RobotState):
+    __slots__ = ('off', 'side', 'cycle_duration', 'percent_on', 'begin_on')
+
     from Robot import Robot
     def __init__(self, robot: 'Robot', side : 'Robot.Side' = None, cycle_duration : float = 1.0, percent_on: float = .5, begin_on : bool = True, off=False):
         self.off = off
@@ -546,7 +936,7 @@ class RotateState(RobotState):
     
     def _do_entering_action(self) -> None:
         super()._do_entering_action()
-        self.custom_value = [time.perf_counter(), 0, 0, False]
+        self.custom_value = [self._clock.now(), 0, 0, False]
         if self.off:
             self._robot.turn_off_left_led()
             self._robot.turn_off_right_led()
@@ -559,17 +949,20 @@ class RotateState(RobotState):
             self._robot.turn_off_right_led()
         self._robot.led_blinker.track()
         self._robot.eye_blinker.track()
-        if time.perf_counter() - self.custom_value[0]  < 2.0:
+        if self.custom_value == "found":
+            # The turn runs without blocking the loop; the transition waits for MotionCompleteCondition.
+            pass
+        elif self._clock.now() - self.custom_value[0]  < 2.0:
             self.custom_value[1] = self._robot.get_distance(35)
-        elif time.perf_counter() - self.custom_value[0] > 2.0 and  time.perf_counter() - self.custom_value[0] < 4.0:
+        elif self._clock.now() - self.custom_value[0] > 2.0 and  self._clock.now() - self.custom_value[0] < 4.0:
             self.custom_value[2] = self._robot.get_distance(-35)
         else:
             self._robot.reset_servos()
             if not self.custom_value[3]:
                 if self.custom_value[1] > self.custom_value[2]:
-                    self._robot.turn_degree(35)
+                    self._robot.turn_degree_async(35)
                 else:
-                    self._robot.turn_degree(-35)
+                    self._robot.turn_degree_async(-35)
             self.custom_value = "found"
         super()._do_in_state_action()
         
@@ -0,0 +1,100 @@
+from typing import Callable, List, Optional
+
+class Tick:
+    """
+    Délimite les ticks de suivi des machines à états finis.
+
+    Chaque appel à FiniteStateMachine.track() ouvre un tick. Les appels imbriqués (une machine suivie depuis
+    l'action d'un état d'une autre machine) appartiennent au tick le plus extérieur, ce qui permet de partager
+    des valeurs lues une seule fois par tick, comme l'échantillon de la télécommande du Robot.
+
+    Les ticks sont globaux au processus et supposent que les machines sont suivies depuis un seul fil d'exécution.
+    Des fonctions peuvent être appelées à l'ouverture de chaque tick le plus extérieur.
+
+    Méthodes:
+        begin() -> None:
+            Ouvre un tick, ou un tick imbriqué.
+
+        end() -> None:
+            Ferme le tick ouvert par le dernier appel à begin().
+
+        current() -> Optional[int]:
+            Obtient le numéro du tick en cours.
+
+        add_begin_hook(hook: Callable[[], None]) -> None:
+            Ajoute une fonction appelée à l'ouverture de chaque tick le plus extérieur.
+
+    Utilisation:
+        >>> Tick.begin()
+        >>> tick = Tick.current()
+        >>> Tick.end()
+    """
+
+    __depth: int = 0
+    __count: int = 0
+    __begin_hooks: List[Callable[[], None]] = []
+
+    @classmethod
+    def begin(cls) -> None:
+        """
+        Ouvre un tick. Seul le tick le plus extérieur reçoit un nouveau numéro et appelle les fonctions abonnées.
+
+        Utilisation:
+            >>> Tick.begin()
+        """
+        cls.__depth += 1
+        if cls.__depth == 1:
+            cls.__count += 1
+            try:
+                for hook in cls.__begin_hooks:
+                    hook()
+            except BaseException:
+                cls.__depth -= 1
+                raise
+
+    @classmethod
+    def end(cls) -> None:
+        """
+        Ferme le tick ouvert par le dernier appel à begin().
+
+        Raises:
+            ValueError: Aucun tick n'est ouvert.
+
+        Utilisation:
+            >>> Tick.end()
+        """
+        if cls.__depth == 0:
+            raise ValueError("no tick is open")
+        cls.__depth -= 1
+
+    @classmethod
+    def current(cls) -> Optional[int]:
+        """
+        Obtient le numéro du tick en cours.
+
+        Returns:
+            Optional[int]: Le numéro du tick le plus extérieur, None hors d'un tick.
+
+        Utilisation:
+            >>> tick = Tick.current()
+        """
+        return cls.__count if cls.__depth else None
+
+    @classmethod
+    def add_begin_hook(cls, hook: Callable[[], None]) -> None:
+        """
+        Ajoute une fonction appelée, sans argument, à l'ouverture de chaque tick le plus extérieur.
+
+        Args:
+            hook (Callable[[], None]): La fonction à appeler.
+
+        Raises:
+            TypeError: hook doit être appelable.
+
+        Utilisation:
+            >>> Tick.add_begin_hook(on_tick)
+        """
+        if not callable(hook):
+            raise TypeError("hook must be callable")
+        if hook not in cls.__begin_hooks:
+            cls.__begin_hooks.append(hook)
@@ -0,0 +1,281 @@
+import heapq
+from time import perf_counter
+from typing import Callable, List, Optional
+from Tick import Tick
+
+class TimerWheel:
+    """
+    Tas d'échéances partagé par les conditions temporelles.
+
+    Les conditions enregistrent leur échéance une seule fois, à l'entrée de l'état surveillé ou au changement de
+    leur durée, au lieu de relire l'horloge à chaque évaluation. La machine à états finis qui utilise la roue la
+    fait avancer au début de son suivi, une seule fois par tick le plus extérieur (voir advance_once() et Tick) ;
+    la roue lit alors l'horloge et prévient les minuteries expirées : le test d'une condition devient la lecture
+    d'un indicateur. Le temps est donc quantifié au tick, et une condition adossée à une roue n'est à jour que
+    pendant le suivi de sa machine ou après un appel explicite à advance().
+
+    Les minuteries annulées restent dans le tas jusqu'à leur échéance, ou jusqu'à ce que le tas soit compacté.
+
+    Attributs:
+        __clock (Callable[[], float]): L'horloge de la roue.
+        __now (float): L'instant de la dernière avance.
+        __heap (List[list]): Le tas des entrées [échéance, séquence, minuterie].
+        __sequence (int): Le compteur départageant les échéances égales.
+        __cancelled (int): Le nombre de minuteries annulées encore présentes dans le tas.
+        __tick (Optional[int]): Le numéro du dernier tick pendant lequel la roue a avancé.
+
+    Méthodes:
+        shared() -> TimerWheel:
+            Obtient la roue partagée par le processus.
+
+        schedule(deadline: float, callback: Optional[Callable[[], None]] = None) -> TimerWheel.Timer:
+            Enregistre une minuterie.
+
+        advance(now: float = None) -> int:
+            Avance la roue et prévient les minuteries expirées.
+
+        advance_once() -> None:
+            Avance la roue, au plus une fois par tick.
+
+        next_deadline(now: float = None) -> Optional[float]:
+            Obtient la prochaine échéance active.
+
+    Utilisation:
+        >>> wheel = TimerWheel.shared()
+        >>> timer = wheel.schedule(perf_counter() + 1., on_expired)
+        >>> deadline = wheel.next_deadline()
+        >>> timer.cancel()
+    """
+
+    class Timer:
+        """
+        Une minuterie enregistrée dans une TimerWheel.
+
+        Attributs:
+            __deadline (float): L'échéance de la minuterie.
+            __callback (Optional[Callable[[], None]]): La fonction appelée à l'expiration, s'il y en a une.
+            __active (bool): Indique si la minuterie n'a ni expiré ni été annulée.
+        """
+
+        def __init__(self, wheel: 'TimerWheel', deadline: float, callback: Optional[Callable[[], None]]) -> None:
+            """
+            Initialise la minuterie.
+
+            Args:
+                wheel (TimerWheel): La roue de la minuterie.
+                deadline (float): L'échéance de la minuterie.
+                callback (Optional[Callable[[], None]]): La fonction appelée à l'expiration, s'il y en a une.
+            """
+            self.__wheel = wheel
+            self.__deadline = deadline
+            self.__callback = callback
+            self.__active = True
+
+        @property
+        def deadline(self) -> float:
+            """
+            Obtient l'échéance de la minuterie.
+
+            Returns:
+                float: L'échéance.
+
+            Utilisation:
+                >>> deadline = timer.deadline
+            """
+            return self.__deadline
+
+        @property
+        def active(self) -> bool:
+            """
+            Indique si la minuterie attend encore son échéance.
+
+            Returns:
+                bool: True si la minuterie n'a ni expiré ni été annulée, False sinon.
+
+            Utilisation:
+                >>> active = timer.active
+            """
+            return self.__active
+
+        def cancel(self) -> None:
+            """
+            Annule la minuterie. Sans effet si elle a déjà expiré ou été annulée.
+
+            Utilisation:
+                >>> timer.cancel()
+            """
+            if self.__active:
+                self.__active = False
+                self.__wheel._cancelled()
+
+        def _expire(self) -> None:
+            """
+            Fait expirer la minuterie et appelle sa fonction.
+
+            Utilisation:
+                >>> timer._expire()
+            """
+            if self.__active:
+                self.__active = False
+                if self.__callback is not None:
+                    self.__callback()
+
+    __shared: Optional['TimerWheel'] = None
+    COMPACTION_THRESHOLD: int = 64
+
+    def __init__(self, clock: Callable[[], float] = perf_counter) -> None:
+        """
+        Initialise la roue. Elle n'avance que lorsque sa machine à états finis, ou son propriétaire, le demande.
+
+        Args:
+            clock (Callable[[], float]): L'horloge de la roue. Par défaut, perf_counter.
+
+        Raises:
+            TypeError: clock doit être appelable.
+
+        Utilisation:
+            >>> wheel = TimerWheel()
+        """
+        if not callable(clock):
+            raise TypeError("clock must be callable")
+        self.__clock = clock
+        self.__now: float = clock()
+        self.__heap: List[list] = []
+        self.__sequence: int = 0
+        self.__cancelled: int = 0
+        self.__tick: Optional[int] = None
+
+    @classmethod
+    def shared(cls) -> 'TimerWheel':
+        """
+        Obtient la roue partagée par le processus, créée au premier appel.
+
+        Returns:
+            TimerWheel: La roue partagée.
+
+        Utilisation:
+            >>> wheel = TimerWheel.shared()
+        """
+        if cls.__shared is None:
+            cls.__shared = cls()
+        return cls.__shared
+
+    @property
+    def now(self) -> float:
+        """
+        Obtient l'instant de la dernière avance de la roue.
+
+        Returns:
+            float: L'instant de la dernière avance.
+
+        Utilisation:
+            >>> now = wheel.now
+        """
+        return self.__now
+
+    def __len__(self) -> int:
+        """
+        Obtient le nombre de minuteries actives.
+
+        Returns:
+            int: Le nombre de minuteries actives.
+
+        Utilisation:
+            >>> count = len(wheel)
+        """
+        return len(self.__heap) - self.__cancelled
+
+    def schedule(self, deadline: float, callback: Optional[Callable[[], None]] = None) -> 'TimerWheel.Timer':
+        """
+        Enregistre une minuterie. Une échéance déjà atteinte à la dernière avance expire immédiatement.
+        Sans fonction, la minuterie ne sert qu'à réveiller la boucle de start() (voir next_deadline).
+
+        Args:
+            deadline (float): L'échéance, dans le temps de l'horloge de la roue.
+            callback (Callable[[], None], optionnel): La fonction appelée à l'expiration. Par défaut à None.
+
+        Returns:
+            TimerWheel.Timer: La minuterie, qui peut être annulée.
+
+        Utilisation:
+            >>> timer = wheel.schedule(perf_counter() + 1., on_expired)
+        """
+        timer = TimerWheel.Timer(self, deadline, callback)
+        if deadline <= self.__now:
+            timer._expire()
+        else:
+            self.__sequence += 1
+            heapq.heappush(self.__heap, [deadline, self.__sequence, timer])
+        return timer
+
+    def advance(self, now: float = None) -> int:
+        """
+        Avance la roue et fait expirer les minuteries dont l'échéance est atteinte.
+
+        Args:
+            now (float, optionnel): Le nouvel instant. Par défaut, l'instant de l'horloge de la roue.
+
+        Returns:
+            int: Le nombre de minuteries expirées.
+
+        Utilisation:
+            >>> wheel.advance()
+        """
+        now = self.__clock() if now is None else now
+        self.__now = now
+        heap = self.__heap
+        expired = 0
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)[2]
+            if timer.active:
+                timer._expire()
+                expired += 1
+            else:
+                self.__cancelled -= 1
+        return expired
+
+    def advance_once(self) -> None:
+        """
+        Avance la roue, sauf si elle a déjà avancé pendant le tick en cours : les machines imbriquées qui
+        partagent la roue ne relisent pas l'horloge. Hors d'un tick, la roue avance toujours.
+
+        Utilisation:
+            >>> wheel.advance_once()
+        """
+        tick = Tick.current()
+        if tick is None or tick != self.__tick:
+            self.__tick = tick
+            self.advance()
+
+    def next_deadline(self, now: float = None) -> Optional[float]:
+        """
+        Obtient la prochaine échéance active, pour dormir jusqu'à elle.
+
+        Args:
+            now (float, optionnel): L'instant courant, non utilisé par le tas. Accepté pour la symétrie avec
+                les conditions et les états.
+
+        Returns:
+            Optional[float]: La prochaine échéance, éventuellement déjà atteinte, None si aucune minuterie n'est active.
+
+        Utilisation:
+            >>> deadline = wheel.next_deadline()
+        """
+        heap = self.__heap
+        while heap and not heap[0][2].active:
+            heapq.heappop(heap)
+            self.__cancelled -= 1
+        return heap[0][0] if heap else None
+
+    def _cancelled(self) -> None:
+        """
+        Compte une minuterie annulée et compacte le tas lorsque les annulations dominent.
+
+        Utilisation:
+            >>> wheel._cancelled()
+        """
+        self.__cancelled += 1
+        if self.__cancelled > self.COMPACTION_THRESHOLD and self.__cancelled * 2 > len(self.__heap):
+            self.__heap = [entry for entry in self.__heap if entry[2].active]
+            heapq.heapify(self.__heap)
+            self.__cancelled = 0
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Callable, List, TYPE_CHECKING
+from typing import Callable, List, Optional, TYPE_CHECKING
 import time
+from Clock import Clock
+from Profiler import Profiler
+from time import perf_counter
 if TYPE_CHECKING:
     from State import State
     from Condition import Condition
@@ -23,8 +26,11 @@ class Transition:
     Méthodes :
         _do_transiting_action(): Définit l'action à exécuter pendant la transition
         _exec_transiting_action(): Exécute l'action de transition
+        _bind_clock(clock): Lie la transition à une horloge
     """
 
+    __slots__ = ('__next_state', '_clock')
+
     def __init__(self, next_state: 'State' = None) -> None:
         """
         Initialise une instance de Transition.
@@ -36,6 +42,32 @@ class Transition:
             >>> transition = Transition(next_state)
         """
         self.next_state = next_state
+        self._clock : Clock = Clock.system()
+
+    @property
+    def clock(self) -> Clock:
+        """
+        Obtient l'horloge de la transition, liée par la machine à états finis qui la contient.
+
+        Retourne :
+            Clock: L'horloge de la transition. Par défaut, Clock.system().
+
+        Utilisation :
+            >>> clock = transition.clock
+        """
+        return self._clock
+
+    def _bind_clock(self, clock: Clock) -> None:
+        """
+        Lie la transition à une horloge.
+
+        Args :
+            clock (Clock): L'horloge à utiliser.
+
+        Utilisation :
+            >>> transition._bind_clock(VirtualClock())
+        """
+        self._clock = clock
 
     @property
     def next_state(self) -> 'State':
@@ -101,6 +133,34 @@ class Transition:
         """
         pass
 
+    def next_deadline(self, now: float) -> Optional[float]:
+        """
+        Obtient le prochain instant auquel la transition peut devenir active d'elle-même.
+
+        Args :
+            now (float): L'instant courant.
+
+        Retourne :
+            Optional[float]: La prochaine échéance, None si la transition doit être sondée.
+
+        Utilisation :
+            >>> transition.next_deadline(transition.clock.now())
+        """
+        return None
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements (Condition.EventSource) dont dépend la transition.
+
+        Retourne :
+            Optional[frozenset]: Les sources d'événements, None si la transition doit être évaluée à chaque tick.
+
+        Utilisation :
+            >>> transition.event_sources
+        """
+        return None
+
     def _exec_transiting_action(self) -> None:
         """Exécute l'action de transition.
 
@@ -109,7 +169,13 @@ class Transition:
         Utilisation :
             >>> transition._exec_transiting_action()
         """
+        profiler = Profiler.active
+        if profiler is None:
+            self._do_transiting_action()
+            return
+        start = perf_counter()
         self._do_transiting_action()
+        profiler._record(self, Profiler.Kind.TRANSITING, start)
 
     def _do_transiting_action(self) -> None:
         """
@@ -139,6 +205,8 @@ class ConditionalTransition(Transition):
         valid (bool): Indique si la transition est valide.
         transiting (bool): Indique si la transition est en cours.
     """
+
+    __slots__ = ('__condition',)
     
     def __init__(self, next_state: 'State' = None, condition: 'Condition' = None) -> None:
         """
@@ -199,6 +267,7 @@ class ConditionalTransition(Transition):
         if not isinstance(condition, Condition):
             raise TypeError("condition doit être une instance de Condition.")
         self.__condition : 'Condition' = condition
+        condition._bind_clock(self._clock)
     
     @property
     def transiting(self) -> bool:
@@ -213,6 +282,48 @@ class ConditionalTransition(Transition):
         """
         return bool(self.__condition)
 
+    def _bind_clock(self, clock: Clock) -> None:
+        """
+        Lie la transition et sa condition à une horloge.
+
+        Args :
+            clock (Clock): L'horloge à utiliser.
+
+        Utilisation :
+            >>> transition._bind_clock(VirtualClock())
+        """
+        super()._bind_clock(clock)
+        if self.__condition is not None:
+            self.__condition._bind_clock(clock)
+
+    def next_deadline(self, now: float) -> Optional[float]:
+        """
+        Obtient la prochaine échéance de la condition de la transition.
+
+        Args :
+            now (float): L'instant courant.
+
+        Retourne :
+            Optional[float]: La prochaine échéance de la condition, None si elle n'est pas temporelle.
+
+        Utilisation :
+            >>> transition.next_deadline(transition.clock.now())
+        """
+        return self.__condition.next_deadline(now) if self.__condition is not None else None
+
+    @property
+    def event_sources(self) -> Optional[frozenset]:
+        """
+        Obtient les sources d'événements dont dépend la condition de la transition.
+
+        Retourne :
+            Optional[frozenset]: Les sources d'événements, None si la transition doit être évaluée à chaque tick.
+
+        Utilisation :
+            >>> transition.event_sources
+        """
+        return self.__condition.event_sources if self.__condition is not None else None
+
 class ActionTransition(ConditionalTransition):
     """
     Représente une transition avec une action à exécuter pendant la transition.
@@ -227,6 +338,8 @@ class ActionTransition(ConditionalTransition):
         add_transiting_action(action: Callable[[], None]): Ajoute une action à exécuter pendant la transition.
     """
 
+    __slots__ = ('__transiting_actions',)
+
     Action = Callable[[], None]
 
     def __init__(self, next_state: 'State' = None, condition: 'Condition' = None) -> None:
@@ -293,6 +406,8 @@ class MonitoredTransition(ActionTransition):
         reset_transit_count(): Réinitialise le nombre de fois que la transition a été effectuée.
         reset_last_transit_time(): Réinitialise le temps de la dernière transition.
     """
+
+    __slots__ = ('__transit_count', '__last_transit_time', 'custom_value')
     
     def __init__(self, next_state: 'State' = None, condition: 'Condition' = None) -> None:
         """
@@ -387,7 +502,7 @@ class MonitoredTransition(ActionTransition):
         Utilisation :
             >>> transition._exec_transiting_action()
         """
-        self.__last_transit_time = time.perf_counter()
+        self.__last_transit_time = self._clock.now()
         self.__transit_count += 1
         super()._exec_transiting_action()
         
@@ -0,0 +1,270 @@
+import struct
+import sys
+from array import array
+from typing import List, Tuple
+
+class TransitionTrace:
+    """
+    Historique circulaire de capacité fixe des transitions d'une machine à états finis.
+
+    Chaque transition est rangée dans quatre tableaux préalloués (instant, état de départ, état d'arrivée,
+    transition) : l'enregistrement n'alloue aucun objet, et les plus anciennes transitions sont écrasées une
+    fois la capacité atteinte. Les états et les transitions sont désignés par leur identifiant dans le layout
+    (voir FiniteStateMachine.trace) ; une transition forcée par transit_to() porte l'identifiant NO_TRANSITION.
+
+    Le fichier écrit par dump() contient un en-tête (MAGIC, version, nombre de transitions) suivi des quatre
+    tableaux, dans l'ordre chronologique et en petit-boutiste : instants en double, identifiants en entiers
+    signés de 32 bits.
+
+    Attributs:
+        NO_TRANSITION (int): L'identifiant d'une transition forcée par transit_to().
+        MAGIC (bytes): La signature des fichiers écrits par dump().
+        VERSION (int): La version du format de ces fichiers.
+        __capacity (int): Le nombre maximal de transitions conservées.
+        __times (array): L'instant de chaque transition.
+        __sources (array): L'identifiant de l'état de départ de chaque transition.
+        __targets (array): L'identifiant de l'état d'arrivée de chaque transition.
+        __transitions (array): L'identifiant de chaque transition.
+        __next (int): La position de la prochaine écriture.
+        __count (int): Le nombre de transitions conservées.
+        __total (int): Le nombre de transitions enregistrées depuis la création ou clear().
+
+    Méthodes:
+        record(time: float, source: int, target: int, transition: int) -> None:
+            Enregistre une transition.
+
+        last(count: int = None) -> List[Tuple[float, int, int, int]]:
+            Obtient les dernières transitions.
+
+        clear() -> None:
+            Efface l'historique.
+
+        dump(path: str) -> int:
+            Écrit l'historique dans un fichier binaire.
+
+        load(path: str) -> TransitionTrace:
+            Relit un historique écrit par dump().
+
+    Utilisation:
+        >>> fsm.trace = TransitionTrace(capacity=4096)
+        >>> fsm.start(time_budget=60.)
+        >>> for time, source, target, transition in fsm.trace.last(10): ...
+        >>> fsm.trace.dump("trace.bin")
+    """
+
+    NO_TRANSITION: int = -1
+    MAGIC: bytes = b'FSMT'
+    VERSION: int = 1
+    __HEADER = struct.Struct('<4sIQ')
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """
+        Initialise un historique vide.
+
+        Args:
+            capacity (int): Le nombre maximal de transitions conservées. Par défaut à 1024.
+
+        Raises:
+            ValueError: capacity doit être positive.
+
+        Utilisation:
+            >>> trace = TransitionTrace(capacity=4096)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.__capacity: int = capacity
+        self.__times: array = array('d', bytes(8 * capacity))
+        self.__sources: array = array('i', bytes(4 * capacity))
+        self.__targets: array = array('i', bytes(4 * capacity))
+        self.__transitions: array = array('i', bytes(4 * capacity))
+        self.__next: int = 0
+        self.__count: int = 0
+        self.__total: int = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        Obtient le nombre maximal de transitions conservées.
+
+        Returns:
+            int: La capacité de l'historique.
+
+        Utilisation:
+            >>> capacity = trace.capacity
+        """
+        return self.__capacity
+
+    @property
+    def total(self) -> int:
+        """
+        Obtient le nombre de transitions enregistrées, y compris celles qui ont été écrasées.
+
+        Returns:
+            int: Le nombre de transitions enregistrées.
+
+        Utilisation:
+            >>> dropped = trace.total - len(trace)
+        """
+        return self.__total
+
+    def __len__(self) -> int:
+        """
+        Obtient le nombre de transitions conservées.
+
+        Returns:
+            int: Le nombre de transitions conservées.
+
+        Utilisation:
+            >>> count = len(trace)
+        """
+        return self.__count
+
+    def record(self, time: float, source: int, target: int, transition: int) -> None:
+        """
+        Enregistre une transition, en écrasant la plus ancienne si l'historique est plein.
+
+        Args:
+            time (float): L'instant de la transition.
+            source (int): L'identifiant de l'état de départ.
+            target (int): L'identifiant de l'état d'arrivée.
+            transition (int): L'identifiant de la transition, NO_TRANSITION pour une transition forcée.
+
+        Utilisation:
+            >>> trace.record(clock.now(), 0, 1, 3)
+        """
+        position = self.__next
+        self.__times[position] = time
+        self.__sources[position] = source
+        self.__targets[position] = target
+        self.__transitions[position] = transition
+        position += 1
+        self.__next = 0 if position == self.__capacity else position
+        if self.__count < self.__capacity:
+            self.__count += 1
+        self.__total += 1
+
+    def __positions(self, count: int) -> range:
+        """
+        Obtient les positions des dernières transitions dans les tableaux, de la plus ancienne à la plus récente.
+
+        Args:
+            count (int): Le nombre de transitions, au plus le nombre de transitions conservées.
+
+        Returns:
+            range: Les positions, à réduire modulo la capacité.
+        """
+        start = self.__next - count
+        if start < 0:
+            start += self.__capacity
+        return range(start, start + count)
+
+    def last(self, count: int = None) -> List[Tuple[float, int, int, int]]:
+        """
+        Obtient les dernières transitions, de la plus ancienne à la plus récente.
+
+        Args:
+            count (int, optionnel): Le nombre de transitions. Par défaut, toutes les transitions conservées.
+
+        Returns:
+            List[Tuple[float, int, int, int]]: Pour chaque transition, l'instant et les identifiants de l'état de
+            départ, de l'état d'arrivée et de la transition.
+
+        Raises:
+            ValueError: count ne peut pas être négatif.
+
+        Utilisation:
+            >>> for time, source, target, transition in trace.last(10): ...
+        """
+        if count is None or count > self.__count:
+            count = self.__count
+        if count < 0:
+            raise ValueError("count cannot be negative")
+        capacity = self.__capacity
+        entries = []
+        for position in self.__positions(count):
+            position %= capacity
+            entries.append((self.__times[position], self.__sources[position], self.__targets[position], self.__transitions[position]))
+        return entries
+
+    def clear(self) -> None:
+        """
+        Efface l'historique, sans libérer ses tableaux.
+
+        Utilisation:
+            >>> trace.clear()
+        """
+        self.__next = 0
+        self.__count = 0
+        self.__total = 0
+
+    def __chronological(self, column: array) -> array:
+        """
+        Copie une colonne dans l'ordre chronologique.
+
+        Args:
+            column (array): La colonne.
+
+        Returns:
+            array: Les valeurs conservées, de la plus ancienne à la plus récente.
+        """
+        if self.__count < self.__capacity:
+            return column[:self.__count]
+        return column[self.__next:] + column[:self.__next]
+
+    def dump(self, path: str) -> int:
+        """
+        Écrit l'historique dans un fichier binaire, dans l'ordre chronologique.
+
+        Args:
+            path (str): Le chemin du fichier.
+
+        Returns:
+            int: Le nombre de transitions écrites.
+
+        Utilisation:
+            >>> trace.dump("trace.bin")
+        """
+        with open(path, 'wb') as file:
+            file.write(TransitionTrace.__HEADER.pack(TransitionTrace.MAGIC, TransitionTrace.VERSION, self.__count))
+            for column in (self.__times, self.__sources, self.__targets, self.__transitions):
+                values = self.__chronological(column)
+                if sys.byteorder == 'big':
+                    values.byteswap()
+                values.tofile(file)
+        return self.__count
+
+    @staticmethod
+    def load(path: str) -> 'TransitionTrace':
+        """
+        Relit un historique écrit par dump(). Sa capacité est le nombre de transitions du fichier.
+
+        Args:
+            path (str): Le chemin du fichier.
+
+        Returns:
+            TransitionTrace: L'historique.
+
+        Raises:
+            ValueError: Le fichier n'est pas un historique de transitions.
+
+        Utilisation:
+            >>> trace = TransitionTrace.load("trace.bin")
+        """
+        with open(path, 'rb') as file:
+            header = file.read(TransitionTrace.__HEADER.size)
+            if len(header) != TransitionTrace.__HEADER.size:
+                raise ValueError("file is not a transition trace")
+            magic, version, count = TransitionTrace.__HEADER.unpack(header)
+            if magic != TransitionTrace.MAGIC or version != TransitionTrace.VERSION:
+                raise ValueError("file is not a transition trace")
+            columns = []
+            for typecode in ('d', 'i', 'i', 'i'):
+                column = array(typecode)
+                column.fromfile(file, count)
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                columns.append(column)
+        trace = TransitionTrace(max(count, 1))
+        for time, source, target, transition in zip(*columns):
+            trace.record(time, source, target, transition)
+        return trace
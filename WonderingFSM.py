@@ -1,5 +1,5 @@
 from Robot import Robot
-from Condition import DistanceSensorCondition, ManualControlCondition, StateEntryDurationCondition, StateValueCondition
+from Condition import AllConditions, DistanceSensorCondition, ManualControlCondition, MotionCompleteCondition, StateEntryDurationCondition, StateValueCondition
 from State import ManualControlState, RotateState, WonderState
 from FiniteStateMachine import FiniteStateMachine
 from Transition import ConditionalTransition
@@ -14,8 +14,12 @@ if TYPE_CHECKING:
 
 
 class WonderingFSM(FiniteStateMachine):
-    def __init__(self, robot : 'Robot') -> None:
+    # Oldest distance sample the obstacle check trusts, in seconds; an older one counts as an obstacle.
+    DISTANCE_SAMPLE_MAX_AGE = 0.25
+
+    def __init__(self, robot : 'Robot', max_sample_age : float = DISTANCE_SAMPLE_MAX_AGE) -> None:
         self.__robot = robot
+        clock = robot.clock
         
         self.state_wonder = WonderState(robot=self.__robot, side = self.__robot.eye_blinker.Side.BOTH, cycle_duration=.0, percent_on=.0, begin_on=False, off=True)
 
@@ -42,9 +46,10 @@ class WonderingFSM(FiniteStateMachine):
         self.__connect(state_right, Robot.KeyCodes.RIGHT)
 
         self.state_wonder.add_transition(ConditionalTransition(next_state=self.state_wonder, condition=StateEntryDurationCondition(duration=2.0, monitored_state=self.state_wonder)))
-        self.state_wonder.add_transition(ConditionalTransition(next_state=self.state_rotate, condition=DistanceSensorCondition(self.__robot)))
         self.state_stop.add_transition(ConditionalTransition(next_state=self.state_wonder, condition=StateEntryDurationCondition(duration=2.0, monitored_state=self.state_stop)))
-        self.state_rotate.add_transition(ConditionalTransition(next_state=self.state_wonder, condition=StateValueCondition(expected_value="found", monitored_state=self.state_rotate)))
+        rotate_done = AllConditions()
+        rotate_done.add_conditions([StateValueCondition(expected_value="found", monitored_state=self.state_rotate), MotionCompleteCondition(self.__robot)])
+        self.state_rotate.add_transition(ConditionalTransition(next_state=self.state_wonder, condition=rotate_done))
 
         layout = FiniteStateMachine.Layout()
         layout.add_states([
@@ -55,17 +60,26 @@ class WonderingFSM(FiniteStateMachine):
             state_backward,
             state_left,
             state_right])
+        # One obstacle check for every moving state, evaluated before their own transitions.
+        layout.add_state_group("moving", [self.state_wonder, state_forward, state_backward, state_left, state_right])
+        layout.add_global_transition(ConditionalTransition(next_state=self.state_rotate, condition=DistanceSensorCondition(self.__robot, max_sample_age=max_sample_age)), priority=10, group="moving")
         
         layout.initial_state = self.state_stop
+        layout.compile()
 
-        super().__init__(layout)
+        super().__init__(layout, clock=clock)
     
     def __create_state(self, direction : 'Robot.MoveDirection', side = None, cycle_duration = 1.0, percent_on = .5, begin_on = True, off = False) -> ManualControlState:
         return ManualControlState(robot=self.__robot, move_configuration=direction, side = side, cycle_duration  = cycle_duration, percent_on = percent_on, begin_on = begin_on, off = off)
     
     def __connect(self, state : ManualControlState, key : 'Robot.KeyCodes') -> None:
-        self.state_stop.add_transition(ConditionalTransition(next_state=state, condition=ManualControlCondition(self.__robot, key)))
-        self.state_wonder.add_transition(ConditionalTransition(next_state=state, condition=ManualControlCondition(self.__robot, key)))
-        state.add_transition(ConditionalTransition(next_state=self.state_stop, condition=ManualControlCondition(self.__robot, key, inverse=True)))
-        state.add_transition(ConditionalTransition(next_state=self.state_rotate, condition=DistanceSensorCondition(self.__robot)))
+        self.state_stop.add_transition(ConditionalTransition(next_state=state, condition=self.__key_condition(key)))
+        self.state_wonder.add_transition(ConditionalTransition(next_state=state, condition=self.__key_condition(key)))
+        state.add_transition(ConditionalTransition(next_state=self.state_stop, condition=self.__key_condition(key, inverse=True)))
+
+    def __key_condition(self, key : 'Robot.KeyCodes', inverse : bool = False) -> ManualControlCondition:
+        # Conditions on the same key share one remote read per tick.
+        condition = ManualControlCondition(self.__robot, key, inverse=inverse)
+        condition.tick_cached = True
+        return condition
 
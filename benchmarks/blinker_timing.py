@@ -0,0 +1,235 @@
+"""
+Mesure la précision temporelle des clignotants : écart de rapport cyclique, dérive de la période et gigue des
+fronts, selon la période de la boucle de suivi, la latence du bus et la charge de la boucle.
+
+Chaque scénario fait fonctionner un robot simulé (SimulatedBackend) sur une horloge virtuelle et relève les
+instants des commandes d'allumage et d'extinction d'une sortie dans les appels enregistrés par le backend
+(SimulatedBackend.calls) : ce sont les fronts réellement envoyés au matériel, latence du bus comprise. La boucle
+appelle la fonction de suivi du scénario, consomme la charge simulée, puis dort jusqu'à la période suivante.
+
+Scénarios:
+    - LedBlinker seul, pour plusieurs périodes de boucle, latences et charges.
+    - C64 au repos dans l'état home (une lecture de la télécommande par tick) avec un LedBlinker.
+    - C64 dans la tâche WonderingFSM (œil gauche clignotant), avec des obstacles qui déclenchent des rotations.
+
+Les scénarios C64 utilisent toujours Blinker, le moteur des clignotants de C64 ; --blinker ne concerne que les
+scénarios LedBlinker seuls.
+
+Pour chaque scénario, le rapport donne le nombre de cycles mesurés, la période moyenne et son écart à
+cycle_duration, la dérive cumulée du dernier front montant par rapport à la grille idéale, l'écart moyen du
+rapport cyclique à percent_on (en points de pourcentage) et la gigue des périodes (écart-type et écart maximal).
+
+Utilisation:
+    python -m benchmarks.blinker_timing
+    python -m benchmarks.blinker_timing --duration 120 --cycle 0.5 --percent-on 0.3 --blinker phase --output blink.json
+"""
+import argparse
+import json
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Blinker import Blinker, PhaseBlinker, SideBlinker
+from C64 import C64
+from Clock import VirtualClock
+from Robot import Robot
+from SimulatedBackend import SimulatedBackend
+
+Scenario = Callable[[], Tuple[VirtualClock, SimulatedBackend, Callable[[], Any], Tuple[str, str, tuple], float, float]]
+
+
+def edges_of(calls: List[Tuple[float, str, tuple]], channel: Tuple[str, str, tuple]) -> List[Tuple[float, bool]]:
+    """
+    Extrait les fronts d'une sortie des appels enregistrés par le backend.
+
+    Args:
+        calls (List[Tuple[float, str, tuple]]): Les appels enregistrés : instant, nom de la méthode et arguments.
+        channel (Tuple[str, str, tuple]): Les noms des commandes d'allumage et d'extinction, et leurs arguments.
+
+    Returns:
+        List[Tuple[float, bool]]: Les fronts : instant et état de la sortie après le front.
+    """
+    on_name, off_name, arguments = channel
+    edges: List[Tuple[float, bool]] = []
+    for time, name, args in calls:
+        if args != arguments or name not in (on_name, off_name):
+            continue
+        level = name == on_name
+        if not edges or edges[-1][1] != level:
+            edges.append((time, level))
+    return edges
+
+
+def timing_of(edges: List[Tuple[float, bool]], cycle_duration: float, percent_on: float) -> Optional[Dict[str, float]]:
+    """
+    Calcule les écarts de période, de dérive, de rapport cyclique et la gigue d'une suite de fronts.
+
+    Args:
+        edges (List[Tuple[float, bool]]): Les fronts.
+        cycle_duration (float): La période demandée, en secondes.
+        percent_on (float): Le rapport cyclique demandé, entre 0 et 1.
+
+    Returns:
+        Optional[Dict[str, float]]: Les mesures, en millisecondes et en points de pourcentage, ou None s'il y a
+        moins de deux cycles complets.
+    """
+    rising = [index for index, (_, level) in enumerate(edges) if level]
+    periods: List[float] = []
+    duties: List[float] = []
+    for first, second in zip(rising, rising[1:]):
+        period = edges[second][0] - edges[first][0]
+        periods.append(period)
+        if second - first > 1:
+            duties.append((edges[first + 1][0] - edges[first][0]) / period)
+    if len(periods) < 2:
+        return None
+    deviations = [period - cycle_duration for period in periods]
+    return {
+        'cycles': len(periods),
+        'period_ms': statistics.fmean(periods) * 1e3,
+        'period_error_ms': statistics.fmean(deviations) * 1e3,
+        'drift_ms': (edges[rising[-1]][0] - edges[rising[0]][0] - len(periods) * cycle_duration) * 1e3,
+        'duty_error_pct': (statistics.fmean(duties) - percent_on) * 100 if duties else float('nan'),
+        'jitter_std_ms': statistics.pstdev(periods) * 1e3,
+        'jitter_max_ms': max(abs(deviation) for deviation in deviations) * 1e3
+    }
+
+
+def led_scenario(blinker_class: type, cycle_duration: float, percent_on: float, latency: float, jitter: float) -> Scenario:
+    """
+    Construit le scénario d'un LedBlinker seul sur un robot simulé.
+
+    Args:
+        blinker_class (type): Le moteur des clignotants, Blinker ou PhaseBlinker.
+        cycle_duration (float): La période demandée, en secondes.
+        percent_on (float): Le rapport cyclique demandé.
+        latency (float): La latence de chaque appel au bus, en secondes.
+        jitter (float): La gigue maximale de la latence, en secondes.
+
+    Returns:
+        Scenario: La fonction qui prépare le scénario.
+    """
+    def build():
+        clock = VirtualClock()
+        backend = SimulatedBackend(clock=clock, latency=latency, jitter=jitter, seed=1)
+        robot = Robot(blinker_class=blinker_class, clock=clock, backend=backend)
+        robot.led_blinker.blink(SideBlinker.Side.LEFT, cycle_duration=cycle_duration, percent_on=percent_on, begin_on=True)
+        return clock, backend, robot.led_blinker.track, ('led_on', 'led_off', ('left',)), cycle_duration, percent_on
+    return build
+
+
+def c64_idle_scenario(cycle_duration: float, percent_on: float, latency: float, jitter: float) -> Scenario:
+    """
+    Construit le scénario d'un C64 au repos dans l'état home, suivi avec un LedBlinker.
+
+    Args:
+        cycle_duration (float): La période demandée, en secondes.
+        percent_on (float): Le rapport cyclique demandé.
+        latency (float): La latence de chaque appel au bus, en secondes.
+        jitter (float): La gigue maximale de la latence, en secondes.
+
+    Returns:
+        Scenario: La fonction qui prépare le scénario.
+    """
+    def build():
+        clock = VirtualClock()
+        backend = SimulatedBackend(clock=clock, latency=latency, jitter=jitter, seed=1)
+        c64 = C64(clock=clock, backend=backend)
+        c64.robot.led_blinker.blink(SideBlinker.Side.LEFT, cycle_duration=cycle_duration, percent_on=percent_on, begin_on=True)
+        c64.transit_to(c64.layout.states[7])
+
+        def step() -> None:
+            c64.track()
+            c64.robot.led_blinker.track()
+        return clock, backend, step, ('led_on', 'led_off', ('left',)), cycle_duration, percent_on
+    return build
+
+
+def wondering_scenario(latency: float, jitter: float) -> Scenario:
+    """
+    Construit le scénario d'un C64 dans la tâche WonderingFSM, dont l'œil gauche clignote (période 1 s, 50 %),
+    avec un obstacle une seconde sur quatre.
+
+    Args:
+        latency (float): La latence de chaque appel au bus, en secondes.
+        jitter (float): La gigue maximale de la latence, en secondes.
+
+    Returns:
+        Scenario: La fonction qui prépare le scénario.
+    """
+    def build():
+        clock = VirtualClock()
+        backend = SimulatedBackend(clock=clock, latency=latency, jitter=jitter, seed=1, turn_speed=360.,
+                                   distance=lambda time, servo: 150. if time % 4. < 1. else 1000.)
+        c64 = C64(clock=clock, backend=backend)
+        c64.transit_to(c64.layout.states[9])
+        return clock, backend, c64.track, ('open_left_eye', 'close_left_eye', ()), 1., .5
+    return build
+
+
+def run(scenario: Scenario, duration: float, poll_period: float, load: float) -> Optional[Dict[str, float]]:
+    """
+    Fait fonctionner un scénario et mesure les fronts de sa sortie.
+
+    Args:
+        scenario (Scenario): La fonction qui prépare le scénario.
+        duration (float): La durée simulée, en secondes.
+        poll_period (float): La période de la boucle, en secondes.
+        load (float): Le temps simulé consommé par chaque itération en plus du suivi, en secondes.
+
+    Returns:
+        Optional[Dict[str, float]]: Les mesures (voir timing_of()).
+    """
+    clock, backend, step, channel, cycle_duration, percent_on = scenario()
+    backend.clear_calls()
+    end = clock.now() + duration
+    while clock.now() < end:
+        start = clock.now()
+        step()
+        if load > 0:
+            clock.advance(load)
+        clock.sleep(max(poll_period - (clock.now() - start), 0.))
+    return timing_of(edges_of(backend.calls, channel), cycle_duration, percent_on)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=60.)
+    parser.add_argument('--cycle', type=float, default=1.)
+    parser.add_argument('--percent-on', type=float, default=.5)
+    parser.add_argument('--blinker', choices=('state', 'phase'), default='state')
+    parser.add_argument('--output', type=str, default=None)
+    args = parser.parse_args()
+
+    blinker_class = PhaseBlinker if args.blinker == 'phase' else Blinker
+    # (nom, scénario, période de boucle, charge)
+    scenarios: List[Tuple[str, Scenario, float, float]] = []
+    for poll_period in (0.001, 0.01, 0.02, 0.05):
+        scenarios.append((f"led poll={poll_period * 1e3:g}ms", led_scenario(blinker_class, args.cycle, args.percent_on, 0., 0.), poll_period, 0.))
+    for latency, jitter in ((0.0005, 0.0002), (0.002, 0.001)):
+        scenarios.append((f"led poll=20ms bus={latency * 1e3:g}ms", led_scenario(blinker_class, args.cycle, args.percent_on, latency, jitter), 0.02, 0.))
+    for load in (0.01, 0.03):
+        scenarios.append((f"led poll=20ms load={load * 1e3:g}ms", led_scenario(blinker_class, args.cycle, args.percent_on, 0.0005, 0.0002), 0.02, load))
+    scenarios.append(("C64 idle + led poll=20ms", c64_idle_scenario(args.cycle, args.percent_on, 0.0005, 0.0002), 0.02, 0.))
+    scenarios.append(("C64 wondering eye poll=20ms", wondering_scenario(0.0005, 0.0002), 0.02, 0.))
+
+    report: Dict[str, Any] = {'duration': args.duration, 'cycle': args.cycle, 'percent_on': args.percent_on,
+                              'blinker': args.blinker, 'scenarios': {}}
+    width = max(len(name) for name, *_ in scenarios)
+    print(f"{'scenario':<{width}} {'cycles':>6} {'period ms':>10} {'error ms':>9} {'drift ms':>9} {'duty err %':>10} {'jitter ms':>10} {'max ms':>8}")
+    for name, scenario, poll_period, load in scenarios:
+        result = run(scenario, args.duration, poll_period, load)
+        report['scenarios'][name] = result
+        if result is None:
+            print(f"{name:<{width}} {'not enough edges':>6}")
+            continue
+        print(f"{name:<{width}} {result['cycles']:>6} {result['period_ms']:>10.2f} {result['period_error_ms']:>9.2f} {result['drift_ms']:>9.1f} "
+              f"{result['duty_error_pct']:>10.2f} {result['jitter_std_ms']:>10.2f} {result['jitter_max_ms']:>8.2f}")
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare le suivi interprété et le suivi compilé (FiniteStateMachine.Layout.compile) en ticks par seconde,
+sur les layouts de Blinker et de C64.
+
+Utilisation:
+    python -m benchmarks.compiled_layout
+    python -m benchmarks.compiled_layout --ticks 200000 --repeat 5
+"""
+import argparse
+from time import perf_counter
+from typing import Callable, Dict
+
+from Blinker import Blinker
+from C64 import C64
+from FiniteStateMachine import FiniteStateMachine
+from SimulatedBackend import SimulatedBackend
+from State import MonitoredState
+
+
+def ticks_per_second(track: Callable[[], bool], ticks: int, repeat: int) -> float:
+    """
+    Mesure le meilleur débit de track() sur plusieurs répétitions.
+
+    Args:
+        track (Callable[[], bool]): La fonction de suivi à mesurer.
+        ticks (int): Le nombre de ticks par répétition.
+        repeat (int): Le nombre de répétitions.
+
+    Returns:
+        float: Le nombre de ticks par seconde de la meilleure répétition.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(ticks):
+            track()
+        best = min(best, perf_counter() - start)
+    return ticks / best
+
+
+def blinker_fsm() -> FiniteStateMachine:
+    """
+    Construit un Blinker sans matériel, en clignotement continu.
+
+    Returns:
+        FiniteStateMachine: Le Blinker prêt à être suivi.
+    """
+    blinker = Blinker(MonitoredState, MonitoredState)
+    blinker.blink(cycle_duration=0.01, percent_on=0.5, begin_on=True)
+    return blinker
+
+
+def c64_fsm() -> FiniteStateMachine:
+    """
+    Construit un C64 sur un backend simulé, placé dans l'état home, avec une télécommande au repos.
+
+    Returns:
+        FiniteStateMachine: Le C64 prêt à être suivi.
+    """
+    c64 = C64(backend=SimulatedBackend(record_calls=False))
+    home = c64.layout.states[7]
+    c64.transit_to(home)
+    return c64
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--ticks', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    scenarios: Dict[str, Callable[[], FiniteStateMachine]] = {'Blinker': blinker_fsm, 'C64 (home)': c64_fsm}
+    print(f"{'layout':<12} {'interpreted':>14} {'compiled':>14} {'gain':>7}")
+    for name, factory in scenarios.items():
+        interpreted = ticks_per_second(factory()._track_interpreted, args.ticks, args.repeat)
+        compiled = ticks_per_second(factory()._track_compiled, args.ticks, args.repeat)
+        print(f"{name:<12} {interpreted:>12.0f}/s {compiled:>12.0f}/s {compiled / interpreted:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
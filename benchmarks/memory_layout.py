@@ -0,0 +1,215 @@
+"""
+Mesure l'empreinte mémoire des états, transitions et conditions, en octets par objet et par machine à états
+finis (Blinker et C64), ainsi que la vitesse d'accès à leurs attributs.
+
+Le rapport peut être comparé à une référence : --baseline relit un rapport JSON écrit par --output, et --ref
+mesure une autre version du dépôt (par exemple le commit qui précède l'ajout des __slots__), extraite avec
+git archive dans un répertoire temporaire et mesurée par ce même script dans un nouvel interpréteur. Les
+colonnes de la référence et l'écart relatif s'affichent alors à côté des mesures courantes.
+
+Utilisation:
+    python -m benchmarks.memory_layout
+    python -m benchmarks.memory_layout --instances 2000 --accesses 2000000
+    python -m benchmarks.memory_layout --output memory.json
+    python -m benchmarks.memory_layout --baseline memory.json
+    python -m benchmarks.memory_layout --ref HEAD~1
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from timeit import timeit
+from typing import Any, Callable, Dict, Optional
+
+from Blinker import Blinker
+from C64 import C64
+from Clock import VirtualClock
+from Condition import StateEntryDurationCondition
+from SimulatedBackend import SimulatedBackend
+from State import MonitoredState
+from Transition import ConditionalTransition
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def object_size(instance: object) -> int:
+    """
+    Mesure la taille d'un objet, y compris son dictionnaire d'attributs s'il en a un.
+
+    Args:
+        instance (object): L'objet à mesurer.
+
+    Returns:
+        int: La taille, en octets.
+    """
+    size = sys.getsizeof(instance)
+    if hasattr(instance, '__dict__'):
+        size += sys.getsizeof(instance.__dict__)
+    return size
+
+
+def bytes_per_instance(factory: Callable[[], object], instances: int) -> float:
+    """
+    Mesure la mémoire allouée par instance en construisant plusieurs instances.
+
+    Args:
+        factory (Callable[[], object]): La fonction qui construit une instance.
+        instances (int): Le nombre d'instances à construire.
+
+    Returns:
+        float: Le nombre moyen d'octets alloués par instance.
+    """
+    factory()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [factory() for _ in range(instances)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / instances
+
+
+def blinker_fsm() -> Blinker:
+    """
+    Construit un Blinker sans matériel.
+
+    Returns:
+        Blinker: Le Blinker.
+    """
+    return Blinker(MonitoredState, MonitoredState)
+
+
+def c64_fsm() -> C64:
+    """
+    Construit un C64 sur un backend simulé, avec ses Blinker et son WonderingFSM.
+
+    Returns:
+        C64: Le C64.
+    """
+    clock = VirtualClock()
+    return C64(clock=clock, backend=SimulatedBackend(clock=clock, record_calls=False))
+
+
+def measure(instances: int, accesses: int) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Mesure la taille des objets, la mémoire par machine et le temps d'accès aux attributs.
+
+    Args:
+        instances (int): Le nombre de Blinker construits (un dixième pour C64).
+        accesses (int): Le nombre d'accès par mesure de temps.
+
+    Returns:
+        Dict[str, Dict[str, Optional[float]]]: Les mesures par section ('objects' en octets, 'fsms' en octets par
+        instance, 'accesses' en nanosecondes), None pour un attribut absent de la version mesurée.
+    """
+    state = MonitoredState()
+    condition = StateEntryDurationCondition(1., state)
+    transition = ConditionalTransition(state, condition)
+    report: Dict[str, Dict[str, Optional[float]]] = {'objects': {}, 'fsms': {}, 'accesses': {}}
+    for name, instance in {'MonitoredState': state, 'ConditionalTransition': transition, 'StateEntryDurationCondition': condition}.items():
+        report['objects'][name] = object_size(instance)
+    for name, factory in {'Blinker': blinker_fsm, 'C64 (with robot)': c64_fsm}.items():
+        count = instances if name == 'Blinker' else max(instances // 10, 1)
+        report['fsms'][name] = round(bytes_per_instance(factory, count))
+    namespace = {'state': state, 'transition': transition, 'condition': condition}
+    for statement in ('transition.next_state', 'transition.condition', 'condition.duration', 'condition.clock',
+                      'state.terminal', 'bool(condition)'):
+        try:
+            seconds = min(timeit(statement, globals=namespace, number=accesses) for _ in range(3))
+            report['accesses'][statement] = round(seconds / accesses * 1e9, 1)
+        except AttributeError:
+            report['accesses'][statement] = None
+    return report
+
+
+def measure_ref(ref: str, instances: int, accesses: int) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Mesure une autre version du dépôt : son arbre est extrait avec git archive dans un répertoire temporaire,
+    puis ce script le mesure dans un nouvel interpréteur dont les imports pointent sur cet arbre.
+
+    Args:
+        ref (str): La version à mesurer (commit, branche ou étiquette).
+        instances (int): Le nombre de Blinker construits.
+        accesses (int): Le nombre d'accès par mesure de temps.
+
+    Returns:
+        Dict[str, Dict[str, Optional[float]]]: Les mesures de la version (voir measure()).
+
+    Raises:
+        RuntimeError: L'extraction ou la mesure de la version échoue.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        archive = subprocess.run(['git', 'archive', '--format=tar', ref], cwd=ROOT, capture_output=True)
+        if archive.returncode != 0:
+            raise RuntimeError(f"git archive {ref} failed: {archive.stderr.decode().strip()}")
+        subprocess.run(['tar', '-x', '-C', directory], input=archive.stdout, check=True)
+        output = os.path.join(directory, 'memory.json')
+        environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [directory, os.environ.get('PYTHONPATH')])))
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--instances', str(instances), '--accesses', str(accesses),
+                                 '--output', output, '--quiet'], cwd=directory, env=environment, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"measuring {ref} failed: {result.stderr.strip().splitlines()[-1]}")
+        with open(output) as file:
+            return json.load(file)
+
+
+def print_report(report: Dict[str, Dict[str, Optional[float]]], baseline: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Affiche les mesures, avec celles de la référence et l'écart relatif s'il y en a une.
+
+    Args:
+        report (Dict[str, Dict[str, Optional[float]]]): Les mesures courantes.
+        baseline (Optional[Dict[str, Any]]): Les mesures de référence. Par défaut à None.
+    """
+    def cell(value: Optional[float]) -> str:
+        return f"{'-' if value is None else f'{value:g}':>10}"
+
+    for section, title in (('objects', 'object (bytes)'), ('fsms', 'fsm (bytes/instance)'), ('accesses', 'attribute access (ns)')):
+        header = f"{title:<28} {'current':>10}"
+        if baseline is not None:
+            header += f" {'baseline':>10} {'change':>8}"
+        print(header)
+        for name, value in report[section].items():
+            line = f"{name:<28}{cell(value)}"
+            if baseline is not None:
+                reference = baseline.get(section, {}).get(name)
+                change = f"{(value - reference) / reference * 100:+.0f}%" if value is not None and reference else '-'
+                line += f"{cell(reference)} {change:>8}"
+            print(line)
+        print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--instances', type=int, default=500)
+    parser.add_argument('--accesses', type=int, default=1000000)
+    parser.add_argument('--output', type=str, default=None, help="écrit le rapport JSON, à relire avec --baseline")
+    parser.add_argument('--baseline', type=str, default=None, help="compare à un rapport JSON écrit par --output")
+    parser.add_argument('--ref', type=str, default=None, help="compare à une autre version du dépôt (git archive)")
+    parser.add_argument('--quiet', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    elif args.ref is not None:
+        baseline = measure_ref(args.ref, args.instances, args.accesses)
+
+    report = measure(args.instances, args.accesses)
+    if not args.quiet:
+        print_report(report, baseline)
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
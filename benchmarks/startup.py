@@ -0,0 +1,161 @@
+"""
+Mesure le temps de démarrage : temps d'import de chaque module, temps de construction de chaque machine à états
+finis et délai jusqu'à la fin du premier track(), sur le matériel simulé (SimulatedBackend).
+
+Chaque import est mesuré dans un nouvel interpréteur avec python -X importtime : le rapport donne, pour chaque
+module, son temps d'import cumulé et les modules du dépôt qu'il charge, ce qui fait apparaître les imports
+circulaires ou différés qui changent d'une version à l'autre. Le rapport JSON (--output) est trié pour être
+comparé avec diff entre deux versions.
+
+Utilisation:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 10 --latency 0.001 --output startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = sorted(name[:-3] for name in os.listdir(ROOT) if name.endswith('.py') and name[0].isupper())
+
+
+def import_time(module: str, repeat: int) -> Dict[str, Any]:
+    """
+    Mesure le temps d'import d'un module dans un nouvel interpréteur, avec python -X importtime.
+
+    Args:
+        module (str): Le nom du module.
+        repeat (int): Le nombre de mesures, dont la meilleure est conservée.
+
+    Returns:
+        Dict[str, Any]: Les temps d'import cumulé et propre du module, en microsecondes, et les modules du dépôt
+        qu'il charge, dans l'ordre de leur chargement.
+
+    Raises:
+        RuntimeError: L'import du module échoue.
+    """
+    best: Tuple[int, int] = None
+    loaded: List[str] = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1]}")
+        loaded = []
+        timing = None
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            self_us, cumulative_us, name = (field.strip() for field in line[len('import time:'):].split('|'))
+            if not self_us.isdigit():
+                continue
+            if name in MODULES:
+                loaded.append(name)
+            if name == module:
+                timing = (int(cumulative_us), int(self_us))
+        if timing is not None and (best is None or timing[0] < best[0]):
+            best = timing
+    return {'cumulative_us': best[0], 'self_us': best[1], 'loads': loaded}
+
+
+def constructors(latency: float) -> Dict[str, Callable[[], Any]]:
+    """
+    Obtient les constructeurs des machines à états finis mesurées, sur un robot simulé construit normalement
+    ou avec fast_start.
+
+    Args:
+        latency (float): La latence de chaque appel au bus simulé, en secondes.
+
+    Returns:
+        Dict[str, Callable[[], Any]]: Pour chaque machine, une fonction qui la construit (robot compris).
+    """
+    from Blinker import Blinker
+    from C64 import C64
+    from LedBlinker import LedBlinker
+    from ManualControl import ManualControlFSM
+    from Robot import Robot
+    from SimulatedBackend import SimulatedBackend
+    from State import MonitoredState
+    from WonderingFSM import WonderingFSM
+
+    def backend() -> SimulatedBackend:
+        return SimulatedBackend(latency=latency, record_calls=False)
+
+    factories: Dict[str, Callable[[], Any]] = {'Blinker': lambda: Blinker(MonitoredState, MonitoredState)}
+    for fast_start in (False, True):
+        suffix = ' (fast start)' if fast_start else ''
+        factories.update({
+            'LedBlinker' + suffix: lambda fast_start=fast_start: LedBlinker(Robot(backend=backend(), fast_start=fast_start)),
+            'ManualControlFSM' + suffix: lambda fast_start=fast_start: ManualControlFSM(Robot(backend=backend(), fast_start=fast_start)),
+            'WonderingFSM' + suffix: lambda fast_start=fast_start: WonderingFSM(Robot(backend=backend(), fast_start=fast_start)),
+            'C64' + suffix: lambda fast_start=fast_start: C64(backend=backend(), fast_start=fast_start)
+        })
+    return factories
+
+
+def startup_time(factory: Callable[[], Any], repeat: int) -> Tuple[float, float]:
+    """
+    Mesure le temps de construction d'une machine et le délai jusqu'à la fin de son premier track().
+
+    Args:
+        factory (Callable[[], Any]): La fonction qui construit la machine.
+        repeat (int): Le nombre de mesures, dont la meilleure est conservée.
+
+    Returns:
+        Tuple[float, float]: Les meilleurs temps de construction et jusqu'au premier track(), en secondes.
+    """
+    construction = first_track = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        fsm = factory()
+        built = perf_counter()
+        fsm.track()
+        end = perf_counter()
+        construction = min(construction, built - start)
+        first_track = min(first_track, end - start)
+    return construction, first_track
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.)
+    parser.add_argument('--output', type=str, default=None)
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        'python': platform.python_version(),
+        'latency': args.latency,
+        'imports': {},
+        'construction_ms': {},
+        'first_track_ms': {}
+    }
+
+    print(f"{'import':<24} {'cumulative ms':>14} {'self ms':>9}  loads")
+    for module in MODULES:
+        timing = import_time(module, args.repeat)
+        report['imports'][module] = timing
+        loads = [name for name in timing['loads'] if name != module]
+        print(f"{module:<24} {timing['cumulative_us'] / 1e3:>14.2f} {timing['self_us'] / 1e3:>9.2f}  {', '.join(loads)}")
+
+    print()
+    print(f"{'fsm':<28} {'construction ms':>16} {'first track ms':>15}")
+    for name, factory in constructors(args.latency).items():
+        construction, first_track = startup_time(factory, args.repeat)
+        report['construction_ms'][name] = round(construction * 1e3, 3)
+        report['first_track_ms'][name] = round(first_track * 1e3, 3)
+        print(f"{name:<28} {construction * 1e3:>16.3f} {first_track * 1e3:>15.3f}")
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+"""
+Mesure le débit et la latence de FiniteStateMachine.track() sur des layouts synthétiques de 10 à 100 000 états,
+pour plusieurs nombres de transitions par état et plusieurs types de conditions, ainsi que sur les layouts réels
+de Blinker et de C64.
+
+Un layout synthétique est un anneau d'états : chaque état porte fanout - 1 transitions dont la condition est
+toujours fausse (évaluées à chaque tick) puis une transition vers l'état suivant dont la condition devient vraie
+selon le type choisi. Le temps de chaque tick est mesuré séparément ; une horloge virtuelle avance d'une
+milliseconde entre deux ticks, hors mesure, pour les conditions temporelles.
+
+Pour chaque scénario, le rapport donne les ticks par seconde, les latences p50, p99 et p99.9, et deux mesures
+d'allocation : le pic d'octets alloués pendant un tick (tracemalloc, sur une passe séparée plus courte) et la
+variation nette du nombre de blocs alloués par tick (sys.getallocatedblocks), qui signale une fuite.
+
+Utilisation:
+    python -m benchmarks.tick_throughput
+    python -m benchmarks.tick_throughput --sizes 10 1000 100000 --fanouts 1 4 16 --conditions always duration
+    python -m benchmarks.tick_throughput --ticks 200000 --output ticks.json
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from array import array
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Blinker import Blinker
+from C64 import C64
+from Clock import VirtualClock
+from Condition import AllConditions, AlwaysTrueCondition, AnyConditions, Condition, StateEntryDurationCondition, StateValueCondition
+from FiniteStateMachine import FiniteStateMachine
+from SimulatedBackend import SimulatedBackend
+from State import MonitoredState
+from Transition import ConditionalTransition
+
+CONDITIONS = ('always', 'state_value', 'duration', 'all_tree')
+TICK_STEP = 0.001
+
+
+def condition_of(kind: str, state: MonitoredState, firing: bool) -> Condition:
+    """
+    Construit la condition d'une transition synthétique.
+
+    Args:
+        kind (str): Le type de condition : 'always', 'state_value', 'duration' ou 'all_tree'.
+        state (MonitoredState): L'état qui porte la transition.
+        firing (bool): True pour la transition vers l'état suivant, False pour une transition jamais franchie.
+
+    Returns:
+        Condition: La condition.
+    """
+    if kind == 'always':
+        return AlwaysTrueCondition(inverse=not firing)
+    if kind == 'state_value':
+        return StateValueCondition(expected_value=firing, monitored_state=state)
+    if kind == 'duration':
+        # Franchie après cinq ticks dans l'état ; jamais pour les autres transitions.
+        return StateEntryDurationCondition(duration=5 * TICK_STEP if firing else 1e9, monitored_state=state)
+    if kind == 'all_tree':
+        tree = AllConditions(inverse=not firing)
+        tree.add_condition(StateValueCondition(expected_value=True, monitored_state=state))
+        branch = AnyConditions()
+        branch.add_condition(AlwaysTrueCondition(inverse=True))
+        branch.add_condition(StateValueCondition(expected_value=True, monitored_state=state))
+        tree.add_condition(branch)
+        return tree
+    raise ValueError(f"unknown condition type {kind}")
+
+
+def synthetic_fsm(size: int, fanout: int, kind: str, compile: bool = True) -> Tuple[FiniteStateMachine, VirtualClock]:
+    """
+    Construit une machine à états finis en anneau.
+
+    Args:
+        size (int): Le nombre d'états.
+        fanout (int): Le nombre de transitions par état.
+        kind (str): Le type de condition des transitions.
+        compile (bool): Indique si le layout est compilé. Par défaut à True.
+
+    Returns:
+        Tuple[FiniteStateMachine, VirtualClock]: La machine et son horloge.
+    """
+    clock = VirtualClock()
+    states = [MonitoredState() for _ in range(size)]
+    for index, state in enumerate(states):
+        state.custom_value = True
+        for _ in range(fanout - 1):
+            state.add_transition(ConditionalTransition(next_state=states[(index + 2) % size], condition=condition_of(kind, state, False)))
+        state.add_transition(ConditionalTransition(next_state=states[(index + 1) % size], condition=condition_of(kind, state, True)))
+    layout = FiniteStateMachine.Layout()
+    layout.add_states(states)
+    layout.initial_state = states[0]
+    if compile:
+        layout.compile()
+    fsm = FiniteStateMachine(layout=layout, clock=clock, timer_wheel=clock.timer_wheel)
+    fsm._prepare_run()
+    return fsm, clock
+
+
+def blinker_fsm() -> Tuple[FiniteStateMachine, Optional[VirtualClock]]:
+    """
+    Construit un Blinker sans matériel, en clignotement continu.
+
+    Returns:
+        Tuple[FiniteStateMachine, Optional[VirtualClock]]: Le Blinker et son horloge virtuelle.
+    """
+    clock = VirtualClock()
+    blinker = Blinker(MonitoredState, MonitoredState, clock=clock)
+    blinker.blink(cycle_duration=0.01, percent_on=0.5, begin_on=True)
+    return blinker, clock
+
+
+def c64_fsm() -> Tuple[FiniteStateMachine, Optional[VirtualClock]]:
+    """
+    Construit un C64 sur un backend simulé, placé dans l'état home, avec une télécommande au repos.
+
+    Returns:
+        Tuple[FiniteStateMachine, Optional[VirtualClock]]: Le C64 et son horloge virtuelle.
+    """
+    clock = VirtualClock()
+    c64 = C64(clock=clock, backend=SimulatedBackend(clock=clock, record_calls=False))
+    c64.transit_to(c64.layout.states[7])
+    return c64, clock
+
+
+def percentile(durations: List[int], fraction: float) -> float:
+    """
+    Obtient un centile d'une liste triée de durées.
+
+    Args:
+        durations (List[int]): Les durées triées, en nanosecondes.
+        fraction (float): Le centile, entre 0 et 1.
+
+    Returns:
+        float: La durée, en microsecondes.
+    """
+    return durations[min(int(fraction * len(durations)), len(durations) - 1)] / 1e3
+
+
+def measure(factory: Callable[[], Tuple[FiniteStateMachine, Optional[VirtualClock]]], ticks: int, allocation_ticks: int) -> Dict[str, float]:
+    """
+    Mesure le débit, la latence et les allocations de track() sur une machine.
+
+    Args:
+        factory (Callable[[], Tuple[FiniteStateMachine, Optional[VirtualClock]]]): La fonction qui construit la machine et son horloge.
+        ticks (int): Le nombre de ticks mesurés.
+        allocation_ticks (int): Le nombre de ticks de la passe de mesure des allocations.
+
+    Returns:
+        Dict[str, float]: Les ticks par seconde, les latences p50, p99 et p99.9 en microsecondes, le pic d'octets
+        alloués par tick et la variation nette de blocs par tick.
+    """
+    fsm, clock = factory()
+    track = fsm.track
+    # Un tableau d'entiers bruts : stocker une durée n'alloue pas d'objet.
+    durations = array('q', bytes(8 * ticks))
+    for _ in range(min(ticks, 1000)):
+        track()
+        if clock is not None:
+            clock.advance(TICK_STEP)
+    blocks = sys.getallocatedblocks()
+    for tick in range(ticks):
+        start = perf_counter_ns()
+        track()
+        durations[tick] = perf_counter_ns() - start
+        if clock is not None:
+            clock.advance(TICK_STEP)
+    blocks = sys.getallocatedblocks() - blocks
+    total = sum(durations)
+    durations = sorted(durations)
+
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(allocation_ticks):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        track()
+        peaks += tracemalloc.get_traced_memory()[1] - before
+        if clock is not None:
+            clock.advance(TICK_STEP)
+    tracemalloc.stop()
+
+    return {
+        'ticks_per_second': ticks / (total / 1e9),
+        'p50_us': percentile(durations, 0.5),
+        'p99_us': percentile(durations, 0.99),
+        'p999_us': percentile(durations, 0.999),
+        'peak_bytes_per_tick': peaks / allocation_ticks,
+        'net_blocks_per_tick': blocks / ticks
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument('--fanouts', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--conditions', nargs='+', choices=CONDITIONS, default=list(CONDITIONS))
+    parser.add_argument('--ticks', type=int, default=50000)
+    parser.add_argument('--allocation-ticks', type=int, default=2000)
+    parser.add_argument('--interpreted', action='store_true', help="ne compile pas les layouts synthétiques")
+    parser.add_argument('--output', type=str, default=None)
+    args = parser.parse_args()
+
+    scenarios: Dict[str, Callable[[], Tuple[FiniteStateMachine, Optional[VirtualClock]]]] = {}
+    for kind in args.conditions:
+        for fanout in args.fanouts:
+            for size in args.sizes:
+                scenarios[f"{kind}/fanout={fanout}/states={size}"] = \
+                    lambda size=size, fanout=fanout, kind=kind: synthetic_fsm(size, fanout, kind, not args.interpreted)
+    scenarios['Blinker'] = blinker_fsm
+    scenarios['C64 (home)'] = c64_fsm
+
+    report: Dict[str, Any] = {'python': sys.version.split()[0], 'ticks': args.ticks, 'scenarios': {}}
+    width = max(len(name) for name in scenarios)
+    print(f"{'scenario':<{width}} {'ticks/s':>11} {'p50 us':>8} {'p99 us':>8} {'p99.9 us':>9} {'peak B/tick':>12} {'blocks/tick':>12}")
+    for name, factory in scenarios.items():
+        result = measure(factory, args.ticks, args.allocation_ticks)
+        report['scenarios'][name] = result
+        print(f"{name:<{width}} {result['ticks_per_second']:>11.0f} {result['p50_us']:>8.2f} {result['p99_us']:>8.2f} "
+              f"{result['p999_us']:>9.2f} {result['peak_bytes_per_tick']:>12.1f} {result['net_blocks_per_tick']:>12.4f}")
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from Clock import VirtualClock
+from Condition import StateEntryDurationCondition, StateValueCondition
+from FiniteStateMachine import FiniteStateMachine
+from State import MonitoredState
+from Transition import ConditionalTransition
+
+
+def blink_layout(duration: float = 0.5) -> FiniteStateMachine.Layout:
+    off = MonitoredState()
+    on = MonitoredState()
+    off.add_transition(ConditionalTransition(on, StateEntryDurationCondition(duration, off)))
+    on.add_transition(ConditionalTransition(off, StateEntryDurationCondition(duration, on)))
+    layout = FiniteStateMachine.Layout()
+    layout.add_states([off, on])
+    layout.initial_state = off
+    layout.compile()
+    return layout
+
+
+@unittest.skipUnless(np is not None, "BatchEngine requires numpy")
+class BatchEngineTest(unittest.TestCase):
+
+    def test_instances_blink_together(self):
+        from BatchEngine import BatchEngine
+        clock = VirtualClock()
+        engine = BatchEngine(blink_layout(), size=5, clock=clock)
+        engine.reset()
+        clock.advance(0.4)
+        self.assertEqual(engine.step(), 0)
+        clock.advance(0.1)
+        self.assertEqual(engine.step(), 5)
+        self.assertEqual(engine.occupancy().tolist(), [0, 5])
+
+    def test_entries_are_stamped_at_the_step_instant(self):
+        from BatchEngine import BatchEngine
+        clock = VirtualClock()
+        engine = BatchEngine(blink_layout(), size=3, clock=clock)
+        engine.reset()
+        clock.advance_to(100.)
+        self.assertEqual(engine.step(), 3)
+        self.assertEqual(engine.last_entry_times[:, 1].tolist(), [100.] * 3)
+        self.assertEqual(engine.last_exit_times[:, 0].tolist(), [100.] * 3)
+        clock.advance(0.5)
+        self.assertEqual(engine.step(), 3)
+
+    def test_sequence_expected_value_is_compared_per_instance(self):
+        from BatchEngine import BatchEngine
+        waiting = MonitoredState()
+        done = MonitoredState()
+        waiting.custom_value = [0, 90]
+        waiting.add_transition(ConditionalTransition(done, StateValueCondition([90, 180], waiting)))
+        done.add_transition(ConditionalTransition(waiting, StateEntryDurationCondition(1e9, done)))
+        layout = FiniteStateMachine.Layout()
+        layout.add_states([waiting, done])
+        layout.initial_state = waiting
+        layout.compile()
+        engine = BatchEngine(layout, size=4, clock=VirtualClock())
+        engine.reset()
+        self.assertEqual(engine.step(), 0)
+        engine.custom_values[1, 0] = [90, 180]
+        engine.custom_values[3, 0] = [90, 180]
+        self.assertEqual(engine.step(), 2)
+        self.assertEqual(engine.current_indices.tolist(), [0, 1, 0, 1])
+
+    def test_layout_runtime_is_restored_after_a_step(self):
+        from BatchEngine import BatchEngine
+        clock = VirtualClock()
+        layout = blink_layout()
+        runtime = layout.runtime
+        engine = BatchEngine(layout, size=2, clock=clock)
+        engine.reset()
+        clock.advance(0.5)
+        engine.step()
+        self.assertIs(layout.runtime, runtime)
+
+
+if __name__ == '__main__':
+    unittest.main()
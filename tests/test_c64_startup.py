@@ -0,0 +1,67 @@
+import threading
+import unittest
+
+from C64 import C64
+from Clock import VirtualClock
+from SimulatedBackend import SimulatedBackend
+
+
+def build(fast_start: bool, latency: float = 0.01):
+    result = {}
+
+    def construct():
+        # The thread that creates the VirtualClock owns it: its bus latencies advance virtual time.
+        clock = VirtualClock()
+        backend = SimulatedBackend(clock=clock, latency=latency)
+        result.update(clock=clock, backend=backend)
+        result['c64'] = C64(clock=clock, backend=backend, fast_start=fast_start)
+
+    # A hang fails the test instead of blocking the suite.
+    worker = threading.Thread(target=construct, daemon=True)
+    worker.start()
+    worker.join(timeout=10.)
+    return result.get('c64'), result.get('clock'), result.get('backend')
+
+
+class C64StartupTest(unittest.TestCase):
+
+    def test_fast_start_on_a_virtual_clock_with_bus_latency(self):
+        c64, clock, backend = build(fast_start=True)
+        self.assertIsNotNone(c64, "C64(fast_start=True) did not return")
+        self.assertTrue(c64.robot.has_integrity)
+        self.assertIn('peripherals', c64.robot.startup_timings)
+        self.assertIsNone(c64.robot._Robot__led_blinker)
+        self.assertIsNone(c64.robot._Robot__eye_blinker)
+        self.assertFalse(c64.layout.states[8].task_built)
+        self.assertFalse(c64.layout.states[9].task_built)
+
+    def test_fast_start_builds_the_eye_blinker_on_shut_down(self):
+        c64, clock, backend = build(fast_start=True)
+        self.assertIsNotNone(c64)
+        shut_down_robot = c64.layout.states[5]
+        c64.transit_to(shut_down_robot)
+        self.assertIsNotNone(c64.robot._Robot__eye_blinker)
+        c64.track()
+        self.assertIs(c64.current_applicative_state, shut_down_robot)
+        self.assertIsNone(c64.robot._Robot__led_blinker)
+
+    def test_probes_are_serialised_on_the_bus(self):
+        c64, clock, backend = build(fast_start=True)
+        self.assertIsNotNone(c64)
+        probes = [time for time, name, _ in backend.calls if name.startswith('init_')]
+        self.assertEqual(len(probes), 4)
+        self.assertEqual(probes, sorted(probes))
+        # Each probe waits its own latency: 4 probes and the 2 servo resets never overlap.
+        self.assertGreaterEqual(clock.now(), 6 * 0.01 - 1e-9)
+
+    def test_fast_start_matches_the_regular_start(self):
+        fast, _, fast_backend = build(fast_start=True)
+        regular, _, regular_backend = build(fast_start=False)
+        self.assertIsNotNone(fast)
+        self.assertIsNotNone(regular)
+        self.assertEqual(fast.robot.has_integrity, regular.robot.has_integrity)
+        self.assertEqual(fast_backend.servos, regular_backend.servos)
+
+
+if __name__ == '__main__':
+    unittest.main()